@@ -0,0 +1,113 @@
+# ==========================================================
+# All-pairs association engine (chi-square / Cramér's V)
+# ==========================================================
+#
+# Every categorical column is factorized once (see crosstabs.py); each
+# column pair is then a bincount over combined integer codes followed by
+# a vectorized chi-square against the outer-product expectation. Pairs
+# are split into chunks and scored in a process pool, with the code
+# matrix shipped to each worker once through the pool initializer.
+# Workers are forked so that calling this from a top-level script (like
+# eda_mentalhealth.py) does not re-run the script in every worker.
+
+import itertools
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+from scipy.stats import chi2
+
+from crosstabs import factorize_columns
+
+_codes = None
+_sizes = None
+
+
+def _init_worker(codes, sizes):
+    global _codes, _sizes
+    _codes = codes
+    _sizes = sizes
+
+
+def _score_pair(a, b):
+    """Chi-square statistic, dof and Cramér's V for columns a, b of _codes"""
+    ca, cb = _codes[a], _codes[b]
+    valid = (ca >= 0) & (cb >= 0)
+    observed = np.bincount(
+        ca[valid] * _sizes[b] + cb[valid],
+        minlength=_sizes[a] * _sizes[b]
+    ).reshape(_sizes[a], _sizes[b]).astype(float)
+
+    observed = observed[observed.sum(axis=1) > 0][:, observed.sum(axis=0) > 0]
+    n = observed.sum()
+    r, c = observed.shape
+    if n == 0 or r < 2 or c < 2:
+        return 0.0, 0, 0.0
+
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / n
+    stat = float(((observed - expected) ** 2 / expected).sum())
+    cramers_v = float(np.sqrt(stat / n / min(r - 1, c - 1)))
+    return stat, (r - 1) * (c - 1), cramers_v
+
+
+def _score_chunk(pairs):
+    return [(a, b) + _score_pair(a, b) for a, b in pairs]
+
+
+def is_categorical_column(series):
+    """String (object or pandas 3 StringDtype) or categorical column"""
+    dtype = series.dtype
+    return pd.api.types.is_string_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype)
+
+
+def association_matrix(df, columns=None, n_jobs=-1, chunk_size=64):
+    """
+    Score every pair of categorical columns.
+
+    Returns (ranking, matrix): ranking is one row per pair with chi2,
+    dof, p_value and cramers_v sorted by cramers_v; matrix is the
+    symmetric Cramér's V matrix for the heatmap.
+    """
+    if columns is None:
+        columns = [c for c in df.columns if is_categorical_column(df[c])]
+    if not columns:
+        raise ValueError("association_matrix needs at least one string or categorical column")
+
+    factorized = factorize_columns(df, columns)
+    codes = np.stack([factorized[c][0] for c in columns]).astype(np.int64)
+    sizes = np.array([len(factorized[c][1]) for c in columns], dtype=np.int64)
+
+    pairs = list(itertools.combinations(range(len(columns)), 2))
+    chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+    workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+
+    can_fork = "fork" in mp.get_all_start_methods()
+    if workers == 1 or len(chunks) <= 1 or not can_fork:
+        _init_worker(codes, sizes)
+        scored = [row for chunk in chunks for row in _score_chunk(chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 mp_context=mp.get_context("fork"),
+                                 initializer=_init_worker,
+                                 initargs=(codes, sizes)) as pool:
+            scored = [row for rows in pool.map(_score_chunk, chunks) for row in rows]
+
+    ranking = pd.DataFrame(scored, columns=["a", "b", "chi2", "dof", "cramers_v"])
+    ranking["feature_1"] = [columns[i] for i in ranking["a"]]
+    ranking["feature_2"] = [columns[i] for i in ranking["b"]]
+    ranking["p_value"] = chi2.sf(ranking["chi2"], ranking["dof"].clip(lower=1))
+    ranking.loc[ranking["dof"] == 0, "p_value"] = 1.0
+
+    matrix = np.eye(len(columns))
+    matrix[ranking["a"], ranking["b"]] = ranking["cramers_v"]
+    matrix[ranking["b"], ranking["a"]] = ranking["cramers_v"]
+    matrix = pd.DataFrame(matrix, index=columns, columns=columns)
+
+    ranking = (
+        ranking[["feature_1", "feature_2", "chi2", "dof", "p_value", "cramers_v"]]
+        .sort_values("cramers_v", ascending=False)
+        .reset_index(drop=True)
+    )
+    return ranking, matrix
@@ -0,0 +1,68 @@
+# ==========================================================
+# Single-pass crosstab engine for the EDA
+# ==========================================================
+#
+# pd.crosstab re-factorizes both columns on every call. Here every
+# categorical column is factorized once into integer codes, and all
+# requested (row, column) contingency tables are counted with one
+# np.bincount over the combined codes, each pair shifted into its own
+# block of bins.
+
+import pandas as pd
+import numpy as np
+
+
+def factorize_columns(df, columns):
+    """Factorize each column once -> {col: (codes, sorted categories)}"""
+    factorized = {}
+    for col in columns:
+        codes, uniques = pd.factorize(df[col], sort=True)
+        factorized[col] = (codes, uniques)
+    return factorized
+
+
+def contingency_tables(df, pairs, normalize=None):
+    """
+    Compute every (row_col, col_col) contingency table in a single pass.
+
+    Duplicate pairs are counted once. Returns {(row_col, col_col): DataFrame}
+    shaped like pd.crosstab(df[row_col], df[col_col], normalize=normalize),
+    where normalize is None or "index".
+    """
+    pairs = list(dict.fromkeys(tuple(p) for p in pairs))
+    columns = list(dict.fromkeys(c for pair in pairs for c in pair))
+    factorized = factorize_columns(df, columns)
+
+    # Lay out one block of bins per pair, plus a trailing bin for missing values
+    offsets = []
+    total_bins = 0
+    for row_col, col_col in pairs:
+        offsets.append(total_bins)
+        total_bins += len(factorized[row_col][1]) * len(factorized[col_col][1])
+    missing_bin = total_bins
+
+    combined = np.empty((len(pairs), len(df)), dtype=np.int64)
+    for i, (row_col, col_col) in enumerate(pairs):
+        row_codes, _ = factorized[row_col]
+        col_codes, col_uniques = factorized[col_col]
+        combined[i] = offsets[i] + row_codes * len(col_uniques) + col_codes
+        combined[i][(row_codes < 0) | (col_codes < 0)] = missing_bin
+
+    counts = np.bincount(combined.ravel(), minlength=total_bins + 1)
+
+    tables = {}
+    for i, (row_col, col_col) in enumerate(pairs):
+        row_uniques = factorized[row_col][1]
+        col_uniques = factorized[col_col][1]
+        block = counts[offsets[i]:offsets[i] + len(row_uniques) * len(col_uniques)]
+        table = pd.DataFrame(
+            block.reshape(len(row_uniques), len(col_uniques)),
+            index=pd.Index(row_uniques, name=row_col),
+            columns=pd.Index(col_uniques, name=col_col),
+        )
+        # pd.crosstab only keeps categories seen alongside a non-missing partner
+        table = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+        if normalize == "index":
+            table = table.div(table.sum(axis=1), axis=0)
+        tables[(row_col, col_col)] = table
+    return tables
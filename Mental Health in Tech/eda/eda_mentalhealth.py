@@ -0,0 +1,313 @@
+# ==========================================================
+# FULL EDA: Mental Health in Tech Workplace
+# Author: Senior Data Scientist
+# ==========================================================
+
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from survey_store import DATASET_PATH, WAVE_COLUMN, clean_survey, read_survey
+from crosstabs import contingency_tables
+from associations import association_matrix, is_categorical_column
+
+# ----------------------------------------------------------
+# Configuration
+# ----------------------------------------------------------
+plt.style.use("seaborn-v0_8")
+sns.set_palette("Set2")
+pd.set_option("display.max_columns", None)
+
+# ----------------------------------------------------------
+# Load Dataset
+# ----------------------------------------------------------
+# Prefer the cleaned multi-wave Parquet dataset (see survey_store.py);
+# fall back to cleaning the single raw survey.csv export.
+SURVEY_WAVES = None  # e.g. ["2014", "2016"]; None reads every wave
+
+if os.path.exists(DATASET_PATH):
+    df = read_survey(waves=SURVEY_WAVES)
+    from_parquet = True
+else:
+    df = pd.read_csv("survey.csv")
+    print("Initial Shape:", df.shape)
+    df = clean_survey(df)
+    from_parquet = False
+
+print("Cleaned Shape:", df.shape)
+
+# ----------------------------------------------------------
+# Contingency Tables (all charts, computed in one pass)
+# ----------------------------------------------------------
+key_features = [
+    "family_history",
+    "work_interfere",
+    "benefits",
+    "care_options",
+    "anonymity",
+    "mental_health_consequence"
+]
+
+crosstab_pairs = [
+    ("family_history", "treatment"),
+    ("no_employees", "treatment"),
+    ("benefits", "seek_help"),
+    ("anonymity", "mental_health_consequence"),
+    ("tech_company", "treatment"),
+    ("remote_work", "work_interfere"),
+] + [(feature, "treatment") for feature in key_features]
+
+tables = contingency_tables(df, crosstab_pairs, normalize="index")
+
+# ==========================================================
+# 1. TREATMENT PREVALENCE
+# ==========================================================
+plt.figure(figsize=(8, 6))
+ax = sns.countplot(x="treatment", data=df, hue="treatment", palette="Set2", legend=False)
+plt.title("Have Employees Sought Mental Health Treatment?", fontsize=16, fontweight='bold')
+plt.xlabel("Treatment Sought", fontsize=14)
+plt.ylabel("Number of Employees", fontsize=14)
+
+# Add value labels on bars
+for p in ax.patches:
+    ax.annotate(f'{int(p.get_height())}', 
+                (p.get_x() + p.get_width() / 2., p.get_height()), 
+                ha='center', va='bottom', fontsize=12, fontweight='bold')
+
+plt.grid(axis='y', alpha=0.3)
+plt.tight_layout()
+plt.savefig('treatment_prevalence.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 2. FAMILY HISTORY vs TREATMENT
+# ==========================================================
+plt.figure(figsize=(10, 6))
+tables[("family_history", "treatment")].plot(kind="bar", stacked=True, ax=plt.gca(), colormap="Set2")
+plt.title("Family History vs Treatment Seeking", fontsize=16, fontweight='bold')
+plt.ylabel("Percentage of Employees", fontsize=14)
+plt.xlabel("Family History of Mental Health Issues", fontsize=14)
+plt.legend(title="Treatment Sought", bbox_to_anchor=(1.05, 1), loc='upper left')
+plt.xticks(rotation=0, ha='center')
+plt.grid(axis='y', alpha=0.3)
+plt.tight_layout()
+plt.savefig('family_history_treatment.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 3. WORK INTERFERENCE DUE TO MENTAL HEALTH
+# ==========================================================
+plt.figure(figsize=(10, 8))
+ax = sns.countplot(
+    y="work_interfere",
+    data=df,
+    order=df["work_interfere"].value_counts().index,
+    hue="work_interfere",
+    palette="Set2",
+    legend=False
+)
+plt.title("Mental Health Interference with Work", fontsize=16, fontweight='bold')
+plt.xlabel("Number of Employees", fontsize=14)
+plt.ylabel("Level of Interference", fontsize=14)
+
+# Add value labels
+for p in ax.patches:
+    width = p.get_width()
+    plt.text(width + 5, p.get_y() + p.get_height()/2, f'{int(width)}', 
+             ha='left', va='center', fontsize=12, fontweight='bold')
+
+plt.grid(axis='x', alpha=0.3)
+plt.tight_layout()
+plt.savefig('work_interference.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 4. COMPANY SIZE vs TREATMENT
+# ==========================================================
+plt.figure(figsize=(14, 8))
+tables[("no_employees", "treatment")].plot(kind="bar", stacked=True, ax=plt.gca(), colormap="Set2")
+plt.title("Company Size vs Mental Health Treatment Seeking", fontsize=16, fontweight='bold')
+plt.ylabel("Percentage of Employees", fontsize=14)
+plt.xlabel("Company Size (Number of Employees)", fontsize=14)
+plt.legend(title="Treatment Sought", bbox_to_anchor=(1.05, 1), loc='upper left')
+plt.xticks(rotation=45, ha='right', fontsize=12)
+plt.grid(axis='y', alpha=0.3)
+plt.tight_layout()
+plt.savefig('company_size_treatment.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 5. EMPLOYER BENEFITS vs SEEKING HELP
+# ==========================================================
+plt.figure(figsize=(12, 8))
+tables[("benefits", "seek_help")].plot(kind="bar", stacked=True, ax=plt.gca(), colormap="Set2")
+plt.title("Employer Benefits vs Seeking Help for Mental Health", fontsize=16, fontweight='bold')
+plt.ylabel("Percentage of Employees", fontsize=14)
+plt.xlabel("Employer Mental Health Benefits", fontsize=14)
+plt.legend(title="Seeking Help", bbox_to_anchor=(1.05, 1), loc='upper left')
+plt.xticks(rotation=45, ha='right', fontsize=12)
+plt.grid(axis='y', alpha=0.3)
+plt.tight_layout()
+plt.savefig('benefits_seek_help.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 6. ANONYMITY vs FEAR OF CONSEQUENCES
+# ==========================================================
+plt.figure(figsize=(12, 8))
+tables[("anonymity", "mental_health_consequence")].plot(kind="bar", stacked=True, ax=plt.gca(), colormap="Set2")
+plt.title("Workplace Anonymity vs Fear of Mental Health Consequences", fontsize=16, fontweight='bold')
+plt.ylabel("Percentage of Employees", fontsize=14)
+plt.xlabel("Perceived Anonymity at Work", fontsize=14)
+plt.legend(title="Fear of Consequences", bbox_to_anchor=(1.05, 1), loc='upper left')
+plt.xticks(rotation=45, ha='right', fontsize=12)
+plt.grid(axis='y', alpha=0.3)
+plt.tight_layout()
+plt.savefig('anonymity_consequence.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 7. TECH COMPANY vs NON-TECH COMPANY
+# ==========================================================
+plt.figure(figsize=(10, 6))
+tables[("tech_company", "treatment")].plot(kind="bar", stacked=True, ax=plt.gca(), colormap="Set2")
+plt.title("Tech vs Non-Tech Companies: Mental Health Treatment", fontsize=16, fontweight='bold')
+plt.ylabel("Percentage of Employees", fontsize=14)
+plt.xlabel("Company Type", fontsize=14)
+plt.legend(title="Treatment Sought", bbox_to_anchor=(1.05, 1), loc='upper left')
+plt.xticks(rotation=0, ha='center', fontsize=12)
+plt.grid(axis='y', alpha=0.3)
+plt.tight_layout()
+plt.savefig('tech_company_treatment.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 8. REMOTE WORK vs WORK INTERFERENCE
+# ==========================================================
+plt.figure(figsize=(12, 8))
+tables[("remote_work", "work_interfere")].plot(kind="bar", stacked=True, ax=plt.gca(), colormap="Set2")
+plt.title("Remote Work vs Mental Health Interference", fontsize=16, fontweight='bold')
+plt.ylabel("Percentage of Employees", fontsize=14)
+plt.xlabel("Remote Work Arrangement", fontsize=14)
+plt.legend(title="Interference Level", bbox_to_anchor=(1.05, 1), loc='upper left')
+plt.xticks(rotation=45, ha='right', fontsize=12)
+plt.grid(axis='y', alpha=0.3)
+plt.tight_layout()
+plt.savefig('remote_work_interference.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 9. DISCUSSION COMFORT: COWORKERS & SUPERVISOR
+# ==========================================================
+fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+
+sns.countplot(x="coworkers", data=df, ax=axes[0], hue="coworkers", palette="Set2", legend=False)
+axes[0].set_title("Comfort Discussing Mental Health with Coworkers", fontsize=14, fontweight='bold')
+axes[0].set_xlabel("Comfort Level", fontsize=12)
+axes[0].set_ylabel("Number of Employees", fontsize=12)
+axes[0].tick_params(axis='x', rotation=45, labelsize=10)
+
+sns.countplot(x="supervisor", data=df, ax=axes[1], hue="supervisor", palette="Set2", legend=False)
+axes[1].set_title("Comfort Discussing Mental Health with Supervisor", fontsize=14, fontweight='bold')
+axes[1].set_xlabel("Comfort Level", fontsize=12)
+axes[1].set_ylabel("Number of Employees", fontsize=12)
+axes[1].tick_params(axis='x', rotation=45, labelsize=10)
+
+plt.suptitle("Comfort Levels for Mental Health Discussions at Work", fontsize=16, fontweight='bold')
+plt.tight_layout()
+plt.savefig('discussion_comfort.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 10. MENTAL vs PHYSICAL HEALTH SERIOUSNESS
+# ==========================================================
+plt.figure(figsize=(12, 8))
+ax = sns.countplot(x="mental_vs_physical", data=df, hue="mental_vs_physical", palette="Set2", legend=False)
+plt.title("Is Mental Health Taken as Seriously as Physical Health?", fontsize=16, fontweight='bold')
+plt.xlabel("Employee Response", fontsize=14)
+plt.ylabel("Number of Employees", fontsize=14)
+plt.xticks(rotation=45, ha='right', fontsize=12)
+
+# Add value labels
+for p in ax.patches:
+    ax.annotate(f'{int(p.get_height())}', 
+                (p.get_x() + p.get_width() / 2., p.get_height()), 
+                ha='center', va='bottom', fontsize=12, fontweight='bold')
+
+plt.grid(axis='y', alpha=0.3)
+plt.tight_layout()
+plt.savefig('mental_vs_physical.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 11. OBSERVED NEGATIVE CONSEQUENCES
+# ==========================================================
+plt.figure(figsize=(10, 6))
+ax = sns.countplot(x="obs_consequence", data=df, hue="obs_consequence", palette="Set2", legend=False)
+plt.title("Observed Negative Consequences of Mental Health Disclosure", fontsize=16, fontweight='bold')
+plt.xlabel("Observed Consequences", fontsize=14)
+plt.ylabel("Number of Employees", fontsize=14)
+
+# Add value labels
+for p in ax.patches:
+    ax.annotate(f'{int(p.get_height())}', 
+                (p.get_x() + p.get_width() / 2., p.get_height()), 
+                ha='center', va='bottom', fontsize=12, fontweight='bold')
+
+plt.grid(axis='y', alpha=0.3)
+plt.tight_layout()
+plt.savefig('observed_consequences.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# 12. STRONGEST EDA-LEVEL PREDICTORS OF TREATMENT
+# ==========================================================
+for feature in key_features:
+    plt.figure(figsize=(10, 6))
+    tables[(feature, "treatment")].plot(kind="bar", stacked=True, ax=plt.gca(), colormap="Set2")
+    plt.title(f"{feature.replace('_', ' ').title()} vs Treatment Seeking", fontsize=14, fontweight='bold')
+    plt.ylabel("Percentage of Employees", fontsize=12)
+    plt.xlabel(f"{feature.replace('_', ' ').title()}", fontsize=12)
+    plt.legend(title="Treatment Sought", bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.xticks(rotation=45, ha='right', fontsize=10)
+    plt.grid(axis='y', alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(f'{feature}_treatment.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+# ==========================================================
+# 13. ASSOCIATION MATRIX ACROSS ALL SURVEY COLUMNS
+# ==========================================================
+categorical_cols = [
+    col for col in df.columns
+    if col != WAVE_COLUMN and is_categorical_column(df[col])
+]
+ranking, cramers_v = association_matrix(df, categorical_cols)
+
+print("\nStrongest Predictors of Treatment (Cramér's V):")
+treatment_pairs = ranking[(ranking["feature_1"] == "treatment") | (ranking["feature_2"] == "treatment")]
+print(treatment_pairs.head(10).to_string(index=False))
+ranking.to_csv("association_ranking.csv", index=False)
+
+plt.figure(figsize=(16, 14))
+sns.heatmap(cramers_v, cmap="YlOrRd", vmin=0, vmax=1, square=True, linewidths=.5)
+plt.title("Cramér's V Association Between Survey Responses", fontsize=16, fontweight='bold')
+plt.xticks(rotation=45, ha='right', fontsize=10)
+plt.yticks(fontsize=10)
+plt.tight_layout()
+plt.savefig('association_heatmap.png', dpi=300, bbox_inches='tight')
+plt.close()
+
+# ==========================================================
+# Save Cleaned Dataset
+# ==========================================================
+if from_parquet:
+    print("EDA Complete | Cleaned data read from", DATASET_PATH)
+else:
+    df.to_csv("cleaned_mental_health_survey.csv", index=False)
+    print("EDA Complete | Cleaned data saved")
@@ -0,0 +1,272 @@
+# ============================================
+# Mental Health Treatment Prediction - Benchmark Suite
+# ============================================
+#
+# Times every stage of the training pipeline (clean the raw survey
+# export, then train_and_save_model.py's load, encode, fit, save) and
+# app-style inference on synthetic survey data with the same schema as
+# survey.csv, and records the peak RSS after each stage. The synthetic
+# CSVs are written by a separate process first, and each dataset size
+# is then measured in a fresh process, so the RSS figures cover only
+# the pipeline and do not leak between sizes.
+#
+# Usage:
+#   python benchmark.py --sizes 1000 100000 --output bench.json
+#   python benchmark.py --compare bench_old.json --output bench_new.json
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import multiprocessing as mp
+from datetime import datetime
+
+import pandas as pd
+import numpy as np
+import sklearn
+
+from train_and_save_model import load_data, encode_data, train_model, save_artifacts, features, target
+from survey_store import clean_survey, is_text_column
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+BATCH_SIZES = [1, 100, 10_000]
+
+# Column -> category frequencies used when the real cleaned survey is not available
+SCHEMA = {
+    "Gender": {"Male": 972, "Female": 240, "Other": 38},
+    "Country": {"United States": 745, "United Kingdom": 184, "Canada": 72, "Germany": 45, "Netherlands": 27, "Ireland": 27, "Other": 150},
+    "state": {"Unknown": 513, "CA": 138, "WA": 70, "NY": 57, "TN": 45, "TX": 44, "Other": 383},
+    "self_employed": {"No": 1090, "Yes": 142, "Unknown": 18},
+    "family_history": {"No": 762, "Yes": 488},
+    "treatment": {"Yes": 631, "No": 619},
+    "work_interfere": {"Sometimes": 464, "Unknown": 262, "Never": 211, "Rarely": 173, "Often": 140},
+    "no_employees": {"6-25": 289, "26-100": 288, "More than 1000": 281, "100-500": 175, "1-5": 158, "500-1000": 59},
+    "remote_work": {"No": 880, "Yes": 370},
+    "tech_company": {"Yes": 1025, "No": 225},
+    "benefits": {"Yes": 472, "Don't know": 407, "No": 371},
+    "care_options": {"No": 499, "Yes": 439, "Not sure": 312},
+    "wellness_program": {"No": 837, "Yes": 227, "Don't know": 186},
+    "seek_help": {"No": 641, "Don't know": 363, "Yes": 246},
+    "anonymity": {"Don't know": 814, "Yes": 372, "No": 64},
+    "leave": {"Don't know": 561, "Somewhat easy": 264, "Very easy": 203, "Somewhat difficult": 125, "Very difficult": 97},
+    "mental_health_consequence": {"No": 487, "Maybe": 475, "Yes": 288},
+    "phys_health_consequence": {"No": 920, "Maybe": 272, "Yes": 58},
+    "coworkers": {"Some of them": 770, "No": 258, "Yes": 222},
+    "supervisor": {"Yes": 511, "No": 390, "Some of them": 349},
+    "mental_health_interview": {"No": 1002, "Maybe": 207, "Yes": 41},
+    "phys_health_interview": {"Maybe": 555, "No": 495, "Yes": 200},
+    "mental_vs_physical": {"Don't know": 573, "Yes": 339, "No": 338},
+    "obs_consequence": {"No": 1070, "Yes": 180},
+}
+
+COLUMNS = [
+    "Age", "Gender", "Country", "state", "self_employed", "family_history",
+    "treatment", "work_interfere", "no_employees", "remote_work", "tech_company",
+    "benefits", "care_options", "wellness_program", "seek_help", "anonymity",
+    "leave", "mental_health_consequence", "phys_health_consequence", "coworkers",
+    "supervisor", "mental_health_interview", "phys_health_interview",
+    "mental_vs_physical", "obs_consequence",
+]
+
+
+# -------------------------------
+# Synthetic Data
+# -------------------------------
+def column_frequencies(reference=None):
+    """Category frequencies from the real survey if given, else the built-in SCHEMA"""
+    if reference and os.path.exists(reference):
+        df = pd.read_csv(reference)
+        return {col: df[col].value_counts().to_dict() for col in SCHEMA if col in df.columns}
+    return SCHEMA
+
+
+def generate_survey(n_rows, frequencies, seed=42):
+    """Sample n_rows independent survey responses with the cleaned-survey schema"""
+    rng = np.random.default_rng(seed)
+    data = {"Age": rng.integers(18, 66, size=n_rows)}
+    for col, counts in frequencies.items():
+        values = np.array(list(counts.keys()), dtype=object)
+        probs = np.array(list(counts.values()), dtype=float)
+        data[col] = values[rng.choice(len(values), size=n_rows, p=probs / probs.sum())]
+    return pd.DataFrame(data)[COLUMNS]
+
+
+def raw_survey(df, seed=42):
+    """Undo the cleaning on a generated survey so clean_survey has real work to do"""
+    rng = np.random.default_rng(seed)
+    raw = df.copy()
+    for col in raw.columns:
+        if is_text_column(raw[col]):
+            raw[col] = raw[col].where(raw[col] != "Unknown", None)
+    spellings = {"Male": ["Male", "male", "M", "Man", "cis male"],
+                 "Female": ["Female", "female", "F", "Woman", "cis female"],
+                 "Other": ["non-binary", "Genderqueer", "Agender"]}
+    raw["Gender"] = [spellings[g][i % len(spellings[g])]
+                     for g, i in zip(raw["Gender"], rng.integers(0, 5, size=len(raw)))]
+    out_of_range = rng.random(len(raw)) < 0.01
+    raw.loc[out_of_range, "Age"] = rng.choice([-1, 5, 99, 329], size=int(out_of_range.sum()))
+    raw.insert(0, "Timestamp", "2014-08-27 11:29:31")
+    raw["comments"] = None
+    return raw
+
+
+def write_inputs(n_rows, frequencies, workdir):
+    """Write the raw survey and the inference batch CSVs; run in its own process"""
+    raw_path = os.path.join(workdir, f"survey_{n_rows}.csv")
+    raw_survey(generate_survey(n_rows, frequencies)).to_csv(raw_path, index=False)
+    inputs_path = os.path.join(workdir, "inference_inputs.csv")
+    generate_survey(max(BATCH_SIZES), frequencies, seed=7)[features].to_csv(inputs_path, index=False)
+    return raw_path, inputs_path
+
+
+# -------------------------------
+# Timing Helpers
+# -------------------------------
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def predict_batch(model, encoders, batch):
+    """Encode raw inputs exactly like app/app.py and predict"""
+    encoded = pd.DataFrame(
+        {col: encoders[col].transform(batch[col]) for col in features},
+        columns=features
+    )
+    return model.predict(encoded)
+
+
+# -------------------------------
+# One Benchmark Run
+# -------------------------------
+def bench_size(n_rows, raw_path, inputs_path, workdir):
+    """Run every stage for one dataset size on pre-written CSVs; executed in a fresh process"""
+    clean_path = os.path.join(workdir, f"cleaned_{n_rows}.csv")
+    stages, stage_rss = {}, {}
+    baseline_rss = peak_rss_mb()
+
+    def clean():
+        clean_survey(pd.read_csv(raw_path)).to_csv(clean_path, index=False)
+
+    _, stages["clean"] = timed(clean)
+    stage_rss["clean"] = peak_rss_mb()
+    df, stages["load"] = timed(load_data, clean_path)
+    stage_rss["load"] = peak_rss_mb()
+    (df, encoders), stages["encode"] = timed(encode_data, df)
+    stage_rss["encode"] = peak_rss_mb()
+    X = df.drop(target, axis=1)
+    y = df[target]
+    model, stages["fit"] = timed(train_model, X, y)
+    stage_rss["fit"] = peak_rss_mb()
+    _, stages["save"] = timed(
+        save_artifacts, model, encoders,
+        os.path.join(workdir, "model.pkl"), os.path.join(workdir, "encoders.pkl")
+    )
+    stage_rss["save"] = peak_rss_mb()
+
+    inference = {}
+    inputs = pd.read_csv(inputs_path)
+    for batch_size in BATCH_SIZES:
+        batch = inputs.iloc[:batch_size]
+        repeats = max(1, 1000 // batch_size)
+        _, elapsed = timed(lambda: [predict_batch(model, encoders, batch) for _ in range(repeats)])
+        per_batch = elapsed / repeats
+        inference[str(batch_size)] = {
+            "seconds_per_batch": per_batch,
+            "rows_per_second": batch_size / per_batch,
+        }
+
+    os.remove(clean_path)
+    return {
+        "rows": n_rows,
+        "stages_seconds": stages,
+        "inference": inference,
+        "baseline_rss_mb": baseline_rss,
+        "stages_peak_rss_mb": stage_rss,    # high-water mark once each stage finished
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_benchmarks(sizes, reference=None):
+    frequencies = column_frequencies(reference)
+    ctx = mp.get_context("spawn")
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in sizes:
+            print(f"Benchmarking {n_rows:,} rows...")
+            with ctx.Pool(1) as pool:
+                raw_path, inputs_path = pool.apply(write_inputs, (n_rows, frequencies, workdir))
+            with ctx.Pool(1) as pool:
+                results[str(n_rows)] = pool.apply(bench_size, (n_rows, raw_path, inputs_path, workdir))
+            os.remove(raw_path)
+            stages = results[str(n_rows)]["stages_seconds"]
+            print("  " + ", ".join(f"{k}={v:.3f}s" for k, v in stages.items())
+                  + f", peak RSS={results[str(n_rows)]['peak_rss_mb']:.1f} MB"
+                  + f" (imports {results[str(n_rows)]['baseline_rss_mb']:.1f} MB)")
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "sklearn": sklearn.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, tolerance=0.2):
+    """Print stages that got slower than the baseline by more than tolerance"""
+    regressions = []
+    for size, run in current["results"].items():
+        base = baseline["results"].get(size)
+        if not base:
+            continue
+        for stage, seconds in run["stages_seconds"].items():
+            old = base["stages_seconds"].get(stage)
+            if old and seconds > old * (1 + tolerance):
+                regressions.append(f"{size} rows / {stage}: {old:.3f}s -> {seconds:.3f}s")
+        for batch_size, stats in run["inference"].items():
+            old = base["inference"].get(batch_size, {}).get("seconds_per_batch")
+            if old and stats["seconds_per_batch"] > old * (1 + tolerance):
+                regressions.append(f"{size} rows / predict batch {batch_size}: "
+                                   f"{old * 1000:.2f}ms -> {stats['seconds_per_batch'] * 1000:.2f}ms")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the mental-health model pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--reference", default="cleaned_mental_health_survey.csv",
+                        help="real survey used for category frequencies, if present")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="previous results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.reference)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            print("\n".join(f"  {r}" for r in regressions))
+            sys.exit(1)
+        print("\nNo regressions against", args.compare)
@@ -0,0 +1,223 @@
+# ============================================
+# Mental Health Treatment Prediction - Model Selection
+# ============================================
+#
+# Stratified k-fold CV over a grid (or random) search of the two
+# candidate models from ml_treatment_prediction.py. Every
+# (model, params, fold) job runs in a process pool and its scores are
+# cached on disk, keyed by a hash of the encoded data plus the params,
+# so re-running with a wider grid only fits the new combinations.
+#
+# Usage:
+#   python model_selection.py --search grid --folds 5 --n-jobs -1
+#   python model_selection.py --search random --n-iter 20
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+
+from sklearn.model_selection import StratifiedKFold, ParameterGrid, ParameterSampler
+from sklearn.metrics import accuracy_score
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+
+from train_and_save_model import load_data, encode_data, target
+
+# -------------------------------
+# Search Spaces
+# -------------------------------
+MODELS = {
+    "logistic_regression": LogisticRegression,
+    "random_forest": RandomForestClassifier,
+}
+
+PARAM_GRIDS = {
+    "logistic_regression": {
+        "C": [0.01, 0.1, 1.0, 10.0],
+        "max_iter": [1000],
+    },
+    "random_forest": {
+        "n_estimators": [100, 200, 400],
+        "max_depth": [4, 8, 12, None],
+        "min_samples_leaf": [1, 5],
+        "random_state": [42],
+    },
+}
+
+CACHE_DIR = ".cv_cache"
+
+
+# -------------------------------
+# Fold Cache
+# -------------------------------
+def data_hash(X, y):
+    """Hash the encoded feature matrix and target"""
+    digest = hashlib.sha256()
+    digest.update(",".join(X.columns).encode())
+    digest.update(np.ascontiguousarray(X.to_numpy()).tobytes())
+    digest.update(np.ascontiguousarray(y.to_numpy()).tobytes())
+    return digest.hexdigest()
+
+
+def cache_key(dhash, model_name, params, n_folds, fold):
+    payload = json.dumps(
+        {"data": dhash, "model": model_name, "params": params,
+         "n_folds": n_folds, "fold": fold},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def read_cache(cache_dir, key):
+    path = os.path.join(cache_dir, f"{key}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_cache(cache_dir, key, result):
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = os.path.join(cache_dir, f"{key}.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(result, f)
+    os.replace(tmp, os.path.join(cache_dir, f"{key}.json"))
+
+
+# -------------------------------
+# Single CV Job
+# -------------------------------
+def run_fold(model_name, params, X_train, y_train, X_test, y_test):
+    """Fit one model on one fold and time fit/predict"""
+    model = MODELS[model_name](**params)
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    preds = model.predict(X_test)
+    predict_time = time.perf_counter() - start
+
+    return {
+        "accuracy": float(accuracy_score(y_test, preds)),
+        "fit_time": fit_time,
+        "predict_latency_ms": predict_time / len(X_test) * 1000,
+    }
+
+
+def candidates(search, n_iter, random_state):
+    """Yield (model_name, params) pairs for the chosen search strategy"""
+    for model_name, grid in PARAM_GRIDS.items():
+        if search == "random":
+            sampler = ParameterSampler(grid, n_iter=n_iter, random_state=random_state)
+        else:
+            sampler = ParameterGrid(grid)
+        seen = set()
+        for params in sampler:
+            key = json.dumps(params, sort_keys=True, default=str)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield model_name, dict(params)
+
+
+# -------------------------------
+# Search Harness
+# -------------------------------
+def run_search(X, y, search="grid", n_iter=10, n_folds=5, n_jobs=-1,
+               cache_dir=CACHE_DIR, random_state=42):
+    """Run stratified k-fold CV for every candidate and return the leaderboard"""
+    folds = list(StratifiedKFold(n_splits=n_folds, shuffle=True,
+                                 random_state=random_state).split(X, y))
+    dhash = data_hash(X, y)
+
+    results = []
+    pending = []
+    for model_name, params in candidates(search, n_iter, random_state):
+        for fold, (train_idx, test_idx) in enumerate(folds):
+            key = cache_key(dhash, model_name, params, n_folds, fold)
+            cached = read_cache(cache_dir, key)
+            if cached is not None:
+                results.append(cached)
+            else:
+                pending.append((key, model_name, params, fold, train_idx, test_idx))
+
+    print(f"CV jobs: {len(results) + len(pending)} total, "
+          f"{len(results)} cached, {len(pending)} to run")
+
+    if pending:
+        workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(
+                    run_fold, model_name, params,
+                    X.iloc[train_idx], y.iloc[train_idx],
+                    X.iloc[test_idx], y.iloc[test_idx]
+                ): (key, model_name, params, fold)
+                for key, model_name, params, fold, train_idx, test_idx in pending
+            }
+            for future, (key, model_name, params, fold) in futures.items():
+                result = future.result()
+                result.update({"model": model_name, "params": params, "fold": fold})
+                write_cache(cache_dir, key, result)
+                results.append(result)
+
+    return leaderboard(results)
+
+
+def leaderboard(results):
+    """Aggregate fold results into one row per (model, params)"""
+    df = pd.DataFrame(results)
+    df["params"] = df["params"].apply(lambda p: json.dumps(p, sort_keys=True, default=str))
+    board = (
+        df.groupby(["model", "params"])
+        .agg(
+            mean_accuracy=("accuracy", "mean"),
+            std_accuracy=("accuracy", "std"),
+            mean_fit_time=("fit_time", "mean"),
+            predict_latency_ms=("predict_latency_ms", "mean"),
+            folds=("fold", "count"),
+        )
+        .sort_values(["mean_accuracy", "mean_fit_time"], ascending=[False, True])
+        .reset_index()
+    )
+    return board
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CV model selection for treatment prediction")
+    parser.add_argument("--data", help="cleaned CSV to use instead of the Parquet survey dataset")
+    parser.add_argument("--waves", nargs="+", help="survey waves to include (default: all)")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--n-iter", type=int, default=10, help="candidates per model for random search")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--output", default="leaderboard.csv")
+    args = parser.parse_args()
+
+    df, _ = encode_data(load_data(args.data, args.waves))
+    X = df.drop(target, axis=1)
+    y = df[target]
+
+    board = run_search(
+        X, y,
+        search=args.search,
+        n_iter=args.n_iter,
+        n_folds=args.folds,
+        n_jobs=args.n_jobs,
+        cache_dir=args.cache_dir,
+    )
+
+    pd.set_option("display.max_colwidth", None)
+    print("\n--- Leaderboard ---")
+    print(board.to_string(index=False))
+    board.to_csv(args.output, index=False)
+    print(f"\nLeaderboard saved to {args.output}")
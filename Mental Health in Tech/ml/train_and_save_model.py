@@ -0,0 +1,91 @@
+import pandas as pd
+import pickle
+import os
+import sys
+
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from survey_store import read_survey
+
+features = [
+    "Gender",
+    "family_history",
+    "work_interfere",
+    "benefits",
+    "care_options",
+    "seek_help",
+    "anonymity",
+    "mental_health_consequence",
+    "coworkers",
+    "supervisor"
+]
+
+target = "treatment"
+
+
+def load_data(path=None, waves=None):
+    """
+    Load only the model columns of the cleaned survey.
+
+    Reads the partitioned Parquet dataset (optionally limited to some
+    waves) unless an explicit CSV path is given.
+    """
+    if path is not None:
+        return pd.read_csv(path, usecols=features + [target])[features + [target]]
+    df = read_survey(
+        columns=features + [target],
+        waves=waves,
+        fallback_csv="cleaned_mental_health_survey.csv"
+    )
+    return df[features + [target]]
+
+
+def encode_data(df):
+    """Label-encode every column, returning the encoded frame and its encoders"""
+    df = df.copy()
+    encoders = {}
+    for col in df.columns:
+        encoder = LabelEncoder()
+        df[col] = encoder.fit_transform(df[col])
+        encoders[col] = encoder
+    return df, encoders
+
+
+def train_model(X, y):
+    """Fit the final Random Forest"""
+    model = RandomForestClassifier(
+        n_estimators=200,
+        max_depth=8,
+        random_state=42
+    )
+    model.fit(X, y)
+    return model
+
+
+def save_artifacts(model, encoders, model_path="model.pkl", encoders_path="encoders.pkl"):
+    """Pickle the model and encoders for the Streamlit app"""
+    pickle.dump(model, open(model_path, "wb"))
+    pickle.dump(encoders, open(encoders_path, "wb"))
+
+
+if __name__ == "__main__":
+    # Load cleaned data
+    df = load_data()
+
+    # Encode categorical data
+    df, encoders = encode_data(df)
+
+    X = df.drop(target, axis=1)
+    y = df[target]
+
+    # Train model
+    model = train_model(X, y)
+
+    # Save model & encoders
+    save_artifacts(model, encoders)
+
+    print("✅ Model and encoders saved successfully")
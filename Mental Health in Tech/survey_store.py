@@ -0,0 +1,161 @@
+# ==========================================================
+# Multi-wave survey store: ingestion + Parquet reads
+# ==========================================================
+#
+# Each yearly survey export (a "wave") is cleaned the same way the EDA
+# always cleaned survey.csv, tagged with its wave id, converted to
+# pandas categoricals and written to a Parquet dataset partitioned by
+# wave (data/survey_parquet/wave=2014/...). Downstream scripts read it
+# back with read_survey(), which projects only the requested columns
+# and prunes partitions by wave instead of re-parsing CSV text.
+#
+# Usage:
+#   python survey_store.py data/survey.csv:2014 data/survey_2016.csv:2016
+
+import argparse
+import os
+
+import pandas as pd
+import numpy as np
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(PROJECT_DIR, "data", "survey_parquet")
+WAVE_COLUMN = "wave"
+
+
+# ----------------------------------------------------------
+# Cleaning (shared with eda_mentalhealth.py)
+# ----------------------------------------------------------
+def clean_gender(g):
+    g = str(g).lower()
+    if g in ["male", "m", "man", "cis male", "male-ish"]:
+        return "Male"
+    elif g in ["female", "f", "woman", "cis female", "female-ish"]:
+        return "Female"
+    else:
+        return "Other"
+
+
+def is_text_column(series):
+    """Object or string column (pandas 3 infers StringDtype instead of object)"""
+    dtype = series.dtype
+    return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+
+def clean_survey(df):
+    """Drop free-text columns, filter ages, normalize gender and fill missing values"""
+    df = df.drop(columns=["comments", "Timestamp"], errors="ignore")
+    df = df[(df["Age"] >= 18) & (df["Age"] <= 65)].copy()
+    df["Gender"] = df["Gender"].apply(clean_gender)
+
+    for col in df.columns:
+        if is_text_column(df[col]):
+            df[col] = df[col].fillna("Unknown")
+        elif df[col].dtype in ['int64', 'float64']:
+            df[col] = df[col].fillna(df[col].median())
+    return df
+
+
+def to_categoricals(df):
+    """Store repeated survey answers as categoricals and Age as a small int"""
+    for col in df.columns:
+        if is_text_column(df[col]):
+            df[col] = df[col].astype("category")
+    if "Age" in df.columns:
+        df["Age"] = df["Age"].astype(np.int16)
+    return df
+
+
+# ----------------------------------------------------------
+# Ingestion
+# ----------------------------------------------------------
+def ingest_waves(sources, output_dir=DATASET_PATH):
+    """
+    Clean every {wave_id: csv_path} source and write them to the partitioned dataset.
+
+    Re-ingesting a wave replaces its partition; other waves are left alone.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    frames = []
+    for wave, path in sources.items():
+        raw = pd.read_csv(path)
+        df = clean_survey(raw)
+        df[WAVE_COLUMN] = str(wave)
+        print(f"Wave {wave}: {len(raw)} raw rows -> {len(df)} cleaned rows")
+        frames.append(df)
+
+    # Concatenate before categorizing so all waves share one category set
+    df = to_categoricals(pd.concat(frames, ignore_index=True))
+    df[WAVE_COLUMN] = df[WAVE_COLUMN].astype(str)
+
+    pq.write_to_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        root_path=output_dir,
+        partition_cols=[WAVE_COLUMN],
+        existing_data_behavior="delete_matching",
+    )
+    return df
+
+
+# ----------------------------------------------------------
+# Reads
+# ----------------------------------------------------------
+def _read_fallback_csv(fallback_csv, columns, waves):
+    if not waves:
+        return pd.read_csv(fallback_csv, usecols=columns)
+    header = pd.read_csv(fallback_csv, nrows=0).columns
+    if WAVE_COLUMN not in header:
+        raise ValueError(f"{fallback_csv} has no {WAVE_COLUMN!r} column to select waves "
+                         f"{', '.join(map(str, waves))}; run survey_store.py first")
+    usecols = None if columns is None else list(dict.fromkeys(list(columns) + [WAVE_COLUMN]))
+    df = pd.read_csv(fallback_csv, usecols=usecols, dtype={WAVE_COLUMN: str})
+    df = df[df[WAVE_COLUMN].isin([str(w) for w in waves])]
+    if columns is not None and WAVE_COLUMN not in columns:
+        df = df.drop(columns=WAVE_COLUMN)
+    return df.reset_index(drop=True)
+
+
+def read_survey(columns=None, waves=None, path=DATASET_PATH, fallback_csv=None):
+    """
+    Read the cleaned survey with column projection and wave filtering.
+
+    Falls back to a single cleaned CSV when the Parquet dataset has not
+    been built yet. The CSV can only be filtered by wave if it has a wave
+    column; otherwise asking for waves raises ValueError instead of
+    silently returning every row.
+    """
+    if not os.path.exists(path):
+        if fallback_csv is None:
+            raise FileNotFoundError(f"No survey dataset at {path}; run survey_store.py first")
+        return to_categoricals(_read_fallback_csv(fallback_csv, columns, waves))
+
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    filters = [(WAVE_COLUMN, "in", [str(w) for w in waves])] if waves else None
+    df = pd.read_parquet(
+        path,
+        columns=columns,
+        filters=filters,
+        partitioning=ds.partitioning(pa.schema([(WAVE_COLUMN, pa.string())]), flavor="hive"),
+    )
+    return to_categoricals(df)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest survey waves into the Parquet dataset")
+    parser.add_argument("sources", nargs="+", help="csv_path:wave_id pairs, e.g. data/survey.csv:2014")
+    parser.add_argument("--output", default=DATASET_PATH)
+    args = parser.parse_args()
+
+    sources = {}
+    for source in args.sources:
+        path, _, wave = source.rpartition(":")
+        if not path or not wave:
+            parser.error(f"expected csv_path:wave_id, got {source!r}")
+        sources[wave] = path
+
+    df = ingest_waves(sources, args.output)
+    print(f"✅ {len(df)} rows across {df[WAVE_COLUMN].nunique()} waves written to {args.output}")
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from survey_store import PROJECT_DIR, WAVE_COLUMN, ingest_waves, read_survey
+
+SURVEY_CSV = os.path.join(PROJECT_DIR, "data", "survey.csv")
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("survey_parquet"))
+    ingest_waves({"2014": SURVEY_CSV}, path)
+    return path
+
+
+def test_stored_answers_are_categorical_without_nan(dataset):
+    df = read_survey(path=dataset)
+    answers = [col for col in df.columns if col not in ("Age", WAVE_COLUMN)]
+
+    assert answers
+    for col in answers:
+        assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+        assert not df[col].isna().any(), col
+    assert (df["state"] == "Unknown").any()
+    assert df["Age"].dtype == "int16"
+
+
+def test_wave_filter(dataset):
+    assert len(read_survey(columns=["treatment"], waves=["2014"], path=dataset)) > 0
+    assert len(read_survey(columns=["treatment"], waves=["2099"], path=dataset)) == 0
+
+
+def test_fallback_csv_wave_filter(tmp_path):
+    missing = str(tmp_path / "no_dataset")
+    csv = os.path.join(PROJECT_DIR, "data", "cleaned_mental_health_survey.csv")
+    assert len(read_survey(columns=["treatment"], path=missing, fallback_csv=csv)) > 0
+    with pytest.raises(ValueError):
+        read_survey(columns=["treatment"], waves=["2016"], path=missing, fallback_csv=csv)
+
+    tagged = tmp_path / "tagged.csv"
+    pd.DataFrame({"treatment": ["Yes", "No", "Yes"], WAVE_COLUMN: [2014, 2016, 2016]}).to_csv(tagged, index=False)
+    df = read_survey(columns=["treatment"], waves=["2016"], path=missing, fallback_csv=str(tagged))
+    assert list(df.columns) == ["treatment"]
+    assert len(df) == 2
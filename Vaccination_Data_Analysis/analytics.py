@@ -0,0 +1,207 @@
+# analytics.py - Vectorized analysis engines behind the /api/analytics endpoints
+# ==============================================================================
+#
+# Each engine takes the raw rows fetched by the API (lists of dicts from
+# execute_query) and does the heavy lifting in pandas/NumPy, so one pass
+# over the fact rows replaces per-row correlated SQL.
+
+import numpy as np
+import pandas as pd
+
+# ==============================================
+# VACCINE INTRODUCTION IMPACT
+# ==============================================
+
+# Engine input -> query registered in query_registry.py
+INTRODUCTION_QUERIES = {
+    'introductions': 'analytics.introduction.introductions',
+    'pairs': 'analytics.introduction.pairs',
+    'cases': 'analytics.introduction.cases',
+}
+
+MAX_WINDOW = 20              # years compared on each side of an introduction
+
+
+def introduction_impact(introductions, pairs, cases, window=5):
+    """
+    Average reported cases in the `window` years before and after each
+    vaccine introduction, for every (country, vaccine, disease).
+
+    Yearly case sums/counts are laid out as a dense (country x disease,
+    year) grid and prefix-summed along the year axis, so both windows of
+    every introduction are two vectorized lookups instead of a correlated
+    subquery per row. Averages are per report, like AVG(reported_cases).
+    window must be between 1 and MAX_WINDOW.
+    """
+    if not 1 <= window <= MAX_WINDOW:
+        raise ValueError(f"window must be between 1 and {MAX_WINDOW}, got {window}")
+    columns = ['country_name', 'who_region', 'vaccine_description', 'disease_description',
+               'intro_year', 'avg_cases_before', 'avg_cases_after', 'reduction_percentage']
+    intros = pd.DataFrame(introductions)
+    pairs = pd.DataFrame(pairs)
+    cases = pd.DataFrame(cases)
+    if intros.empty or pairs.empty or cases.empty:
+        return pd.DataFrame(columns=columns)
+
+    events = intros.merge(pairs, on='vaccine_id')
+    events['intro_year'] = events['intro_year'].astype(int)
+
+    # Dense grid over (country, disease) keys; year axis padded by the window
+    keys = pd.MultiIndex.from_frame(cases[['country_id', 'disease_id']].drop_duplicates())
+    key_idx = keys.get_indexer(pd.MultiIndex.from_frame(cases[['country_id', 'disease_id']]))
+    first_year = int(min(cases['year'].min(), events['intro_year'].min())) - window
+    last_year = int(max(cases['year'].max(), events['intro_year'].max())) + window
+    width = last_year - first_year + 1
+
+    year_idx = cases['year'].to_numpy(dtype=np.int64) - first_year
+    case_sums = np.zeros((len(keys), width))
+    report_counts = np.zeros((len(keys), width))
+    np.add.at(case_sums, (key_idx, year_idx), pd.to_numeric(cases['cases']).fillna(0).to_numpy(dtype=float))
+    np.add.at(report_counts, (key_idx, year_idx), pd.to_numeric(cases['reports']).to_numpy(dtype=float))
+
+    # cum[:, i] holds the total over grid years [0, i)
+    cum_sums = np.zeros((len(keys), width + 1))
+    cum_counts = np.zeros((len(keys), width + 1))
+    np.cumsum(case_sums, axis=1, out=cum_sums[:, 1:])
+    np.cumsum(report_counts, axis=1, out=cum_counts[:, 1:])
+
+    event_keys = keys.get_indexer(pd.MultiIndex.from_frame(events[['country_id', 'disease_id']]))
+    matched = event_keys >= 0
+    events = events[matched]
+    event_keys = event_keys[matched]
+    intro_idx = events['intro_year'].to_numpy(dtype=np.int64) - first_year
+
+    def window_mean(start, stop):
+        # Mean over grid years [start, stop)
+        total = cum_sums[event_keys, stop] - cum_sums[event_keys, start]
+        count = cum_counts[event_keys, stop] - cum_counts[event_keys, start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(count > 0, total / count, np.nan)
+
+    before = window_mean(intro_idx - window, intro_idx)
+    after = window_mean(intro_idx + 1, intro_idx + window + 1)
+
+    keep = before > 0
+    result = events.loc[keep, columns[:5]].copy()
+    result['avg_cases_before'] = before[keep]
+    result['avg_cases_after'] = after[keep]
+    result['reduction_percentage'] = (before[keep] - after[keep]) / before[keep] * 100
+    return result.sort_values('reduction_percentage', ascending=False,
+                              na_position='last').reset_index(drop=True)
+
+
+# ==============================================
+# COVERAGE / OUTCOME CORRELATIONS
+# ==============================================
+
+# Engine input -> query registered in query_registry.py (the fact
+# queries take min_year)
+CORRELATION_QUERIES = {
+    'coverage': 'analytics.correlation_matrix.coverage',
+    'incidence': 'analytics.correlation_matrix.incidence',
+    'cases': 'analytics.correlation_matrix.cases',
+    'countries': 'analytics.correlation_matrix.countries',
+    'vaccines': 'dim.vaccines',
+    'diseases': 'dim.diseases',
+}
+
+
+def _panel(rows, column, index):
+    """Pivot (country_id, year, <column>, value) rows onto a shared (country, year) index"""
+    frame = pd.DataFrame(rows, columns=['country_id', 'year', column, 'value'])
+    frame['value'] = pd.to_numeric(frame['value'], errors='coerce').astype(float)
+    wide = frame.pivot_table(index=['country_id', 'year'], columns=column,
+                             values='value', aggfunc='first')
+    return wide.reindex(index)
+
+
+def _pairwise_pearson(X, Y):
+    """
+    Pearson r between every column of X and every column of Y using only
+    the rows where both are present. X is (n, p), Y is (n, q) with NaN for
+    missing; returns (r, n_obs), each (p, q).
+    """
+    mx, my = ~np.isnan(X), ~np.isnan(Y)
+    X0, Y0 = np.where(mx, X, 0.0), np.where(my, Y, 0.0)
+    mx, my = mx.astype(float), my.astype(float)
+
+    n = mx.T @ my
+    sx, sy = X0.T @ my, mx.T @ Y0
+    sxx, syy = (X0 ** 2).T @ my, mx.T @ (Y0 ** 2)
+    sxy = X0.T @ Y0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx ** 2) * (n * syy - sy ** 2)
+        r = np.where((n > 2) & (var > 0), cov / np.sqrt(np.clip(var, 0, None)), np.nan)
+    return np.clip(r, -1.0, 1.0), n.astype(int)
+
+
+def _pairwise_spearman(X, Y):
+    """Spearman rho, ranking each pair over its own complete rows like pandas does"""
+    rho = np.full((X.shape[1], Y.shape[1]), np.nan)
+    for j in range(X.shape[1]):
+        rows = ~np.isnan(X[:, j])
+        if rows.sum() < 3:
+            continue
+        y = Y[rows]
+        # Broadcast x into every outcome column, blanked where that outcome is missing,
+        # so one rank() call per side ranks all q pairs at once
+        x = np.where(np.isnan(y), np.nan, X[rows, j][:, None])
+        x_rank = pd.DataFrame(x).rank().to_numpy()
+        y_rank = pd.DataFrame(y).rank().to_numpy()
+        rho[j] = np.diagonal(_pairwise_pearson(x_rank, y_rank)[0])
+    return rho
+
+
+def correlation_matrix(rows, by_region=False, min_obs=3):
+    """
+    Pearson and Spearman correlation of coverage for every antigen against
+    incidence and reported cases for every disease, over country-years.
+
+    rows holds the CORRELATION_QUERIES results. The panel is pivoted once
+    into (country-year x antigen) and (country-year x disease) matrices and
+    all pairs are computed with matrix products; with by_region every WHO
+    region gets its own block as well as the global one.
+    """
+    coverage = pd.DataFrame(rows['coverage'], columns=['country_id', 'year', 'vaccine_id', 'value'])
+    if coverage.empty:
+        return []
+    index = pd.MultiIndex.from_frame(coverage[['country_id', 'year']].drop_duplicates()
+                                     .sort_values(['country_id', 'year']))
+    cov = _panel(rows['coverage'], 'vaccine_id', index)
+    outcomes = {name: _panel(rows[name], 'disease_id', index) for name in ('incidence', 'cases')}
+
+    vaccines = {r['vaccine_id']: r for r in rows['vaccines']}
+    diseases = {r['disease_id']: r for r in rows['diseases']}
+    regions = {r['country_id']: r['who_region'] for r in rows['countries']}
+    row_region = np.array([regions.get(cid) for cid in index.get_level_values('country_id')],
+                          dtype=object)
+
+    groups = [('Global', np.ones(len(index), dtype=bool))]
+    if by_region:
+        groups += [(region, row_region == region)
+                   for region in sorted({r for r in regions.values() if r})]
+
+    records = []
+    for region, mask in groups:
+        X = cov.to_numpy(dtype=float)[mask]
+        for metric, outcome in outcomes.items():
+            Y = outcome.to_numpy(dtype=float)[mask]
+            pearson, n_obs = _pairwise_pearson(X, Y)
+            spearman = _pairwise_spearman(X, Y)
+            for i, j in zip(*np.nonzero(n_obs >= min_obs)):
+                vaccine = vaccines.get(cov.columns[i], {})
+                disease = diseases.get(outcome.columns[j], {})
+                records.append({
+                    'region': region,
+                    'metric': metric,
+                    'vaccine_code': vaccine.get('vaccine_code'),
+                    'vaccine_description': vaccine.get('vaccine_description'),
+                    'disease_code': disease.get('disease_code'),
+                    'disease_description': disease.get('disease_description'),
+                    'observations': int(n_obs[i, j]),
+                    'pearson': None if np.isnan(pearson[i, j]) else float(pearson[i, j]),
+                    'spearman': None if np.isnan(spearman[i, j]) else float(spearman[i, j]),
+                })
+    return records
@@ -0,0 +1,304 @@
+# cube.py - In-memory OLAP cube over the coverage facts
+# =====================================================
+#
+# The coverage endpoints all slice the same space: country x year x
+# vaccine, rolled up by WHO region. CoverageCube loads that space once
+# (one GROUP BY query) into dense NumPy arrays indexed by integer
+# country/year/vaccine codes, so the dashboard's trend, ranking, regional
+# and insight figures become array slices and reductions instead of SQL
+# round trips. Aggregates follow SQL semantics: AVG/MIN/MAX skip NULL
+# coverage, SUM skips NULL measures, and groups without values give None.
+#
+# Usage:
+#   DB_BACKEND=sqlite DB_PATH=vaccination.db python cube.py   # build + memory report
+
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+CUBE_QUERY = """
+    SELECT
+        country_id,
+        year,
+        vaccine_id,
+        COUNT(*) as row_count,
+        SUM(coverage_percentage) as coverage_sum,
+        COUNT(coverage_percentage) as coverage_count,
+        MIN(coverage_percentage) as coverage_min,
+        MAX(coverage_percentage) as coverage_max,
+        SUM(doses_administered) as doses,
+        COUNT(doses_administered) as doses_count,
+        SUM(target_number) as target,
+        COUNT(target_number) as target_count,
+        SUM(target_number - doses_administered) as unvaccinated,
+        COUNT(target_number - doses_administered) as unvaccinated_count
+    FROM fact_coverage
+    GROUP BY country_id, year, vaccine_id
+"""
+
+COUNTRY_QUERY = "SELECT country_id, country_name, who_region FROM dim_countries"
+
+# cube array -> (source column, dtype, fill value for empty cells)
+MEASURES = {
+    'row_count': ('row_count', np.int32, 0),
+    'coverage_sum': ('coverage_sum', np.float64, 0.0),
+    'coverage_count': ('coverage_count', np.int32, 0),
+    'coverage_min': ('coverage_min', np.float64, np.inf),
+    'coverage_max': ('coverage_max', np.float64, -np.inf),
+    'doses': ('doses', np.float64, 0.0),
+    'doses_count': ('doses_count', np.int32, 0),
+    'target': ('target', np.float64, 0.0),
+    'target_count': ('target_count', np.int32, 0),
+    'unvaccinated': ('unvaccinated', np.float64, 0.0),
+    'unvaccinated_count': ('unvaccinated_count', np.int32, 0),
+}
+
+
+def _codes(values):
+    """Sorted distinct values and each value's integer code"""
+    labels, codes = np.unique(values, return_inverse=True)
+    return labels, codes
+
+
+def _mean(total, count):
+    return float(total / count) if count else None
+
+
+def _total(total, count):
+    """SUM(): None when every value was NULL, otherwise an int for integral sums"""
+    if not count:
+        return None
+    total = float(total)
+    return int(round(total)) if total.is_integer() else total
+
+
+def _extreme(value):
+    value = float(value)
+    return None if np.isinf(value) else value
+
+
+class CubeData:
+    """One immutable build of the cube; rebuilds swap in a new instance"""
+
+    def __init__(self, rows, countries):
+        self.built_at = datetime.now().isoformat()
+        country_ids = np.array([r['country_id'] for r in rows], dtype=np.int64)
+        years = np.array([r['year'] for r in rows], dtype=np.int64)
+        vaccine_ids = np.array([r['vaccine_id'] for r in rows], dtype=np.int64)
+
+        self.country_ids, c = _codes(country_ids)
+        self.years, y = _codes(years)
+        self.vaccine_ids, v = _codes(vaccine_ids)
+        shape = (len(self.country_ids), len(self.years), len(self.vaccine_ids))
+
+        self.arrays = {}
+        for name, (column, dtype, fill) in MEASURES.items():
+            values = np.array([fill if r[column] is None else float(r[column]) for r in rows], dtype=dtype)
+            array = np.full(shape, fill, dtype=dtype)
+            array[c, y, v] = values
+            self.arrays[name] = array
+
+        # Region mapping: country code -> region code; countries missing
+        # from dim_countries are excluded from the joined queries, like the SQL
+        dims = {int(r['country_id']): r for r in countries}
+        known = [dims.get(int(cid)) for cid in self.country_ids]
+        self.known = np.array([d is not None for d in known], dtype=bool)
+        self.country_names = np.array([d['country_name'] if d else None for d in known], dtype=object)
+        region_names = [d['who_region'] if d else None for d in known]
+        self.regions = sorted({r for r in region_names if r is not None}) + \
+            ([None] if any(d is not None and d['who_region'] is None for d in known) else [])
+        self.region_of = np.array([self.regions.index(r) if d is not None else -1
+                                   for r, d in zip(region_names, known)], dtype=np.int32)
+        self.country_regions = np.array(region_names, dtype=object)
+        # Alphabetical rank, the tie-breaker for rankings
+        self.name_rank = np.argsort(np.argsort([str(n) for n in self.country_names], kind='stable'))
+
+    def year_mask(self, min_year):
+        return self.years >= min_year
+
+    def by_country(self, min_year):
+        """Per-country aggregates over years >= min_year (all vaccines)"""
+        window = self.year_mask(min_year)
+        a = {name: array[:, window, :] for name, array in self.arrays.items()}
+        return {
+            'rows': a['row_count'].sum(axis=(1, 2)),
+            'coverage_sum': a['coverage_sum'].sum(axis=(1, 2)),
+            'coverage_count': a['coverage_count'].sum(axis=(1, 2)),
+            'coverage_min': a['coverage_min'].min(axis=(1, 2), initial=np.inf),
+            'coverage_max': a['coverage_max'].max(axis=(1, 2), initial=-np.inf),
+            'doses': a['doses'].sum(axis=(1, 2)),
+            'doses_count': a['doses_count'].sum(axis=(1, 2)),
+            'target': a['target'].sum(axis=(1, 2)),
+            'target_count': a['target_count'].sum(axis=(1, 2)),
+            'unvaccinated': a['unvaccinated'].sum(axis=(1, 2)),
+            'unvaccinated_count': a['unvaccinated_count'].sum(axis=(1, 2)),
+        }
+
+    def country_averages(self, min_year):
+        """(per-country aggregates, average coverage with NaN where undefined)"""
+        per_country = self.by_country(min_year)
+        count = per_country['coverage_count']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            average = np.where(count > 0, per_country['coverage_sum'] / count, np.nan)
+        average[~self.known] = np.nan
+        return per_country, average
+
+    def by_region(self, min_year):
+        """Per-region aggregates over years >= min_year; index matches self.regions"""
+        per_country = self.by_country(min_year)
+        n = len(self.regions)
+        members = (self.region_of >= 0) & (per_country['rows'] > 0)
+        region = self.region_of[members]
+
+        def rollup(values, reducer=np.add, fill=0):
+            out = np.full(n, fill, dtype=np.float64)
+            reducer.at(out, region, values[members])
+            return out
+
+        return {
+            'countries': np.bincount(region, minlength=n),
+            'coverage_sum': rollup(per_country['coverage_sum']),
+            'coverage_count': rollup(per_country['coverage_count']),
+            'coverage_min': rollup(per_country['coverage_min'], np.minimum, np.inf),
+            'coverage_max': rollup(per_country['coverage_max'], np.maximum, -np.inf),
+            'doses': rollup(per_country['doses']),
+            'doses_count': rollup(per_country['doses_count']),
+        }
+
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays.values()) + sum(
+            array.nbytes for array in (self.country_ids, self.years, self.vaccine_ids,
+                                       self.known, self.region_of))
+
+
+class CoverageCube:
+    """Thread-safe holder for the current CubeData with a rebuild hook"""
+
+    def __init__(self, execute_query):
+        self.execute_query = execute_query
+        self._data = None
+        self._lock = threading.Lock()
+        self.build_ms = None
+
+    def rebuild(self):
+        """Reload the cube from the warehouse; keeps the old cube if the query fails"""
+        with self._lock:
+            started = time.perf_counter()
+            rows = self.execute_query(CUBE_QUERY)
+            countries = self.execute_query(COUNTRY_QUERY)
+            if rows is None or countries is None:
+                return False
+            self._data = CubeData(rows, countries)
+            self.build_ms = round((time.perf_counter() - started) * 1000, 2)
+            return True
+
+    def data(self):
+        """Current cube, built on first use; None if it cannot be built"""
+        if self._data is None:
+            self.rebuild()
+        return self._data
+
+    # ------------------------------------------
+    # Dashboard queries
+    # ------------------------------------------
+
+    def global_trends(self, min_year=2015):
+        cube = self.data()
+        window = cube.year_mask(min_year)
+        a = {name: array[:, window, :] for name, array in cube.arrays.items()}
+        coverage_sum = a['coverage_sum'].sum(axis=(0, 2))
+        coverage_count = a['coverage_count'].sum(axis=(0, 2))
+        countries = (a['row_count'].sum(axis=2) > 0).sum(axis=0)
+        doses = a['doses'].sum(axis=(0, 2))
+        doses_count = a['doses_count'].sum(axis=(0, 2))
+        return [
+            {'year': int(year), 'avg_coverage': _mean(coverage_sum[i], coverage_count[i]),
+             'countries': int(countries[i]), 'total_doses': _total(doses[i], doses_count[i])}
+            for i, year in enumerate(cube.years[window])
+            if countries[i] > 0
+        ]
+
+    def top_countries(self, min_year, limit=10):
+        cube = self.data()
+        per_country, average = cube.country_averages(min_year)
+        # Countries without any coverage value rank last, as NULL averages do in SQL
+        candidates = np.flatnonzero(cube.known & (per_country['rows'] > 0))
+        order = candidates[np.lexsort((cube.name_rank[candidates], -average[candidates]))][:max(limit, 0)]
+        return [
+            {'country_name': cube.country_names[i], 'who_region': cube.country_regions[i],
+             'avg_coverage': None if np.isnan(average[i]) else float(average[i]),
+             'total_doses': _total(per_country['doses'][i], per_country['doses_count'][i])}
+            for i in order
+        ]
+
+    def low_coverage_countries(self, min_year, threshold):
+        cube = self.data()
+        per_country, average = cube.country_averages(min_year)
+        candidates = np.flatnonzero(~np.isnan(average) & (average < threshold))
+        order = candidates[np.lexsort((cube.name_rank[candidates], average[candidates]))]
+        return [
+            {'country_name': cube.country_names[i], 'who_region': cube.country_regions[i],
+             'avg_coverage': float(average[i]),
+             'target_population': _total(per_country['target'][i], per_country['target_count'][i]),
+             'unvaccinated_population': _total(per_country['unvaccinated'][i],
+                                               per_country['unvaccinated_count'][i])}
+            for i in order
+        ]
+
+    def regional_analysis(self, min_year=2020):
+        cube = self.data()
+        regions = cube.by_region(min_year)
+        results = [
+            {'who_region': region, 'countries': int(regions['countries'][i]),
+             'avg_coverage': _mean(regions['coverage_sum'][i], regions['coverage_count'][i]),
+             'min_coverage': _extreme(regions['coverage_min'][i]),
+             'max_coverage': _extreme(regions['coverage_max'][i]),
+             'total_doses': _total(regions['doses'][i], regions['doses_count'][i])}
+            for i, region in enumerate(cube.regions)
+            if regions['countries'][i] > 0
+        ]
+        results.sort(key=lambda r: -1 if r['avg_coverage'] is None else r['avg_coverage'], reverse=True)
+        return results
+
+    def regional_disparity(self, min_year=2020):
+        averages = [r['avg_coverage'] for r in self.regional_analysis(min_year)
+                    if r['avg_coverage'] is not None]
+        return max(averages) - min(averages) if averages else None
+
+    def memory_report(self):
+        cube = self._data
+        if cube is None:
+            return {'built': False}
+        return {
+            'built': True,
+            'built_at': cube.built_at,
+            'build_ms': self.build_ms,
+            'shape': {'countries': len(cube.country_ids), 'years': len(cube.years),
+                      'vaccines': len(cube.vaccine_ids)},
+            'regions': len(cube.regions),
+            'filled_cells': int(np.count_nonzero(cube.arrays['row_count'])),
+            'arrays': {name: array.nbytes for name, array in cube.arrays.items()},
+            'total_bytes': cube.nbytes(),
+        }
+
+
+if __name__ == '__main__':
+    import json
+    from db_backends import connect
+
+    connection = connect()
+    cursor = connection.cursor()
+
+    def execute_query(query, params=None):
+        cursor.execute(query, params or ())
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    cube = CoverageCube(execute_query)
+    cube.rebuild()
+    report = cube.memory_report()
+    print(json.dumps(report, indent=2))
+    print(f"\nCube: {report['total_bytes'] / 1e6:.1f} MB, built in {report['build_ms']:.0f} ms")
+    connection.close()
@@ -0,0 +1,244 @@
+# data_profiler.py - Single-scan data-quality profile of the fact tables
+# ======================================================================
+#
+# For each fact table one aggregate query computes, in a single pass:
+# per-column null counts, distinct counts and min/max, out-of-range
+# counts for the measures, orphan keys against every dimension, rows
+# whose denormalized year disagrees with dim_time, and duplicate natural
+# keys. Profiles are cached per table and only re-scanned when that
+# table's (row count, max id, value checksum) fingerprint changes, so a
+# reload that touches one table re-profiles only that table and a re-ETL
+# that only revises values is still noticed.
+
+import threading
+import time
+from datetime import datetime
+
+# Dimension each foreign key must resolve to
+REFERENCES = {
+    'country_id': ('dim_countries', 'country_id'),
+    'vaccine_id': ('dim_vaccines', 'vaccine_id'),
+    'disease_id': ('dim_diseases', 'disease_id'),
+    'time_id': ('dim_time', 'time_id'),
+}
+
+PROFILE_SPEC = {
+    'fact_coverage': {
+        'dataset': 'Coverage',
+        'id': 'coverage_id',
+        'columns': ['country_id', 'vaccine_id', 'time_id', 'year', 'coverage_category',
+                    'target_number', 'doses_administered', 'coverage_percentage'],
+        'ranges': {'coverage_percentage': (0, 100), 'target_number': (0, None),
+                   'doses_administered': (0, None)},
+        'natural_key': ['country_id', 'vaccine_id', 'year', 'coverage_category'],
+        'text': ['coverage_category'],
+    },
+    'fact_incidence': {
+        'dataset': 'Incidence',
+        'id': 'incidence_id',
+        'columns': ['country_id', 'disease_id', 'time_id', 'year', 'denominator', 'incidence_rate'],
+        'ranges': {'incidence_rate': (0, None)},
+        'natural_key': ['country_id', 'disease_id', 'year', 'denominator'],
+        'text': ['denominator'],
+    },
+    'fact_cases': {
+        'dataset': 'Cases',
+        'id': 'case_id',
+        'columns': ['country_id', 'disease_id', 'time_id', 'year', 'reported_cases'],
+        'ranges': {'reported_cases': (0, None)},
+        'natural_key': ['country_id', 'disease_id', 'year'],
+        'text': [],
+    },
+    'fact_vaccine_introduction': {
+        'dataset': 'Vaccine Introduction',
+        'id': 'intro_id',
+        'columns': ['country_id', 'vaccine_id', 'time_id', 'year', 'intro_status'],
+        'ranges': {},
+        'natural_key': ['country_id', 'vaccine_id', 'year'],
+        'text': ['intro_status'],
+    },
+    'fact_vaccine_schedule': {
+        'dataset': 'Vaccine Schedule',
+        'id': 'schedule_id',
+        'columns': ['country_id', 'vaccine_id', 'time_id', 'year', 'schedule_round',
+                    'target_population', 'geo_area', 'age_administered'],
+        'ranges': {},
+        'natural_key': ['country_id', 'vaccine_id', 'year', 'schedule_round',
+                        'target_population', 'geo_area'],
+        'text': ['schedule_round', 'target_population', 'geo_area', 'age_administered'],
+    },
+}
+
+
+def profile_query(table, spec):
+    """The one-pass aggregate query for a fact table"""
+    select = ["COUNT(*) as row_count"]
+    joins = []
+    for column in spec['columns']:
+        select += [
+            f"SUM(CASE WHEN f.{column} IS NULL THEN 1 ELSE 0 END) as null__{column}",
+            f"COUNT(DISTINCT f.{column}) as distinct__{column}",
+            f"MIN(f.{column}) as min__{column}",
+            f"MAX(f.{column}) as max__{column}",
+        ]
+    for column, (low, high) in spec['ranges'].items():
+        checks = [f"f.{column} < {low}" if low is not None else None,
+                  f"f.{column} > {high}" if high is not None else None]
+        condition = ' OR '.join(c for c in checks if c)
+        select.append(f"SUM(CASE WHEN {condition} THEN 1 ELSE 0 END) as out_of_range__{column}")
+    for column, (dim_table, dim_key) in REFERENCES.items():
+        if column not in spec['columns']:
+            continue
+        alias = f"d_{column}"
+        joins.append(f"LEFT JOIN {dim_table} {alias} ON f.{column} = {alias}.{dim_key}")
+        select.append(f"SUM(CASE WHEN f.{column} IS NOT NULL AND {alias}.{dim_key} IS NULL "
+                      f"THEN 1 ELSE 0 END) as orphan__{column}")
+    if 'time_id' in spec['columns']:
+        select.append("SUM(CASE WHEN d_time_id.year <> f.year THEN 1 ELSE 0 END) as year_mismatch")
+    # CAST AS CHAR is the portable spelling (MySQL has no CAST AS VARCHAR); DuckDB
+    # will not coalesce a number with ''
+    key = ", '|', ".join(f"COALESCE(CAST(f.{c} AS CHAR), '')" for c in spec['natural_key'])
+    select.append(f"COUNT(*) - COUNT(DISTINCT CONCAT({key})) as duplicate_keys")
+
+    return (f"SELECT\n    " + ",\n    ".join(select) +
+            f"\nFROM {table} f\n" + "\n".join(joins))
+
+
+def fingerprint_query(table, spec):
+    """Cheap (row count, max id, checksum) check of whether a table changed.
+
+    The checksum sums the measures and the lengths of the text attributes,
+    so values revised in place change it without adding rows.
+    """
+    terms = [f"SUM(COALESCE({column}, 0))" for column in spec['ranges']]
+    terms += [f"SUM(COALESCE(LENGTH({column}), 0))" for column in spec['text']]
+    checksum = f"ROUND({' + '.join(terms)}, 4)" if terms else "0"
+    return (f"SELECT COUNT(*) as row_count, MAX({spec['id']}) as max_id, "
+            f"{checksum} as checksum FROM {table}")
+
+
+def _number(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def parse_profile(table, spec, row, duration_ms):
+    rows = int(row['row_count'] or 0)
+
+    def rate(count):
+        return round(100.0 * (count or 0) / rows, 4) if rows else 0.0
+
+    columns = {}
+    for column in spec['columns']:
+        nulls = int(row[f'null__{column}'] or 0)
+        columns[column] = {
+            'nulls': nulls,
+            'null_rate': rate(nulls),
+            'distinct': int(row[f'distinct__{column}'] or 0),
+            'min': _number(row[f'min__{column}']),
+            'max': _number(row[f'max__{column}']),
+        }
+    out_of_range = {}
+    for column, (low, high) in spec['ranges'].items():
+        count = int(row[f'out_of_range__{column}'] or 0)
+        out_of_range[column] = {'rule': {'min': low, 'max': high}, 'count': count, 'rate': rate(count)}
+    integrity = {
+        f'orphan_{column}': int(row[f'orphan__{column}'] or 0)
+        for column in REFERENCES if f'orphan__{column}' in row
+    }
+    if 'year_mismatch' in row:
+        integrity['year_mismatch'] = int(row['year_mismatch'] or 0)
+
+    return {
+        'dataset': spec['dataset'],
+        'table': table,
+        'total_records': rows,
+        'columns': columns,
+        'out_of_range': out_of_range,
+        'integrity': integrity,
+        'duplicate_keys': int(row['duplicate_keys'] or 0),
+        'scan_ms': round(duration_ms, 2),
+        'profiled_at': datetime.now().isoformat(),
+    }
+
+
+def quality_scores(profiles):
+    """
+    Dashboard scores (0-100) from the table profiles:
+    completeness - non-null share of profiled cells
+    accuracy     - rows whose natural key is not a duplicate
+    consistency  - rows with resolvable keys and a year matching dim_time
+    validity     - range-checked values inside their allowed range
+    """
+    cells = nulls = rows = duplicates = violations = checked = out_of_range = 0
+    for profile in profiles:
+        n = profile['total_records']
+        rows += n
+        cells += n * len(profile['columns'])
+        nulls += sum(c['nulls'] for c in profile['columns'].values())
+        duplicates += profile['duplicate_keys']
+        violations += sum(profile['integrity'].values())
+        checked += n * len(profile['out_of_range'])
+        out_of_range += sum(r['count'] for r in profile['out_of_range'].values())
+
+    def score(bad, total):
+        return round(100.0 * (1 - bad / total), 2) if total else 100.0
+
+    return {
+        'completeness': score(nulls, cells),
+        'accuracy': score(duplicates, rows),
+        'consistency': score(min(violations, rows), rows),
+        'validity': score(out_of_range, checked),
+    }
+
+
+class DataProfiler:
+    """Cached per-table profiles, re-scanned only for tables that changed"""
+
+    def __init__(self, execute_query, spec=PROFILE_SPEC):
+        self.execute_query = execute_query
+        self.spec = spec
+        self._profiles = {}       # table -> profile
+        self._fingerprints = {}   # table -> (row_count, max_id, checksum)
+        self._lock = threading.Lock()
+
+    def fingerprint(self, table):
+        rows = self.execute_query(fingerprint_query(table, self.spec[table]))
+        return tuple(rows[0].values()) if rows else None
+
+    def refresh(self, force=False):
+        """Re-profile tables whose fingerprint changed; returns the tables scanned"""
+        with self._lock:
+            scanned = []
+            for table, spec in self.spec.items():
+                fingerprint = self.fingerprint(table)
+                if fingerprint is None:
+                    continue
+                if not force and self._fingerprints.get(table) == fingerprint and table in self._profiles:
+                    continue
+                started = time.perf_counter()
+                rows = self.execute_query(profile_query(table, spec))
+                if not rows:
+                    continue
+                self._profiles[table] = parse_profile(table, spec, rows[0],
+                                                      (time.perf_counter() - started) * 1000)
+                self._fingerprints[table] = fingerprint
+                scanned.append(table)
+            return scanned
+
+    def invalidate(self):
+        """Forget fingerprints so the next refresh re-scans every table"""
+        with self._lock:
+            self._fingerprints.clear()
+
+    def report(self):
+        """Scores plus per-table details, or None before the first profile"""
+        with self._lock:
+            if not self._profiles:
+                return None
+            profiles = [self._profiles[t] for t in self.spec if t in self._profiles]
+        return {'metrics': quality_scores(profiles), 'details': profiles}
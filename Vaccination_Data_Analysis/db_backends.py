@@ -0,0 +1,220 @@
+# db_backends.py - Connections for MySQL and the local SQLite/DuckDB stand-ins
+# ==========================================================================
+
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+BACKENDS = ('mysql', 'sqlite', 'duckdb')
+
+# Prepared statements kept per pooled connection (SQLite's own cache, the
+# MySQL server-side statements); least recently used ones are closed first
+STATEMENT_CACHE_SIZE = 64
+
+# Matches single-quoted string literals or a %s placeholder
+_PLACEHOLDER = re.compile(r"('(?:[^']|'')*')|%s")
+
+
+def connect(backend=None, database=None):
+    """
+    Open a DB-API connection.
+
+    backend defaults to $DB_BACKEND (mysql). For sqlite/duckdb, database is
+    a file path (default $DB_PATH or vaccination.db); for mysql it is the
+    schema name and the usual DB_HOST/DB_USER/DB_PASSWORD variables apply.
+    DB_READ_ONLY=1 opens DuckDB read-only, which several processes may do
+    at once on the same file (read-write takes an exclusive lock).
+    """
+    backend = backend or os.getenv('DB_BACKEND', 'mysql')
+
+    if backend == 'sqlite':
+        connection = sqlite3.connect(database or os.getenv('DB_PATH', 'vaccination.db'),
+                                     check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        connection.execute('PRAGMA journal_mode=WAL')
+        # SQLite < 3.44 has no CONCAT(), which the MySQL-flavoured queries use
+        connection.create_function('CONCAT', -1,
+                                   lambda *parts: None if None in parts else ''.join(map(str, parts)),
+                                   deterministic=True)
+        return connection
+
+    if backend == 'duckdb':
+        import duckdb
+        return duckdb.connect(database or os.getenv('DB_PATH', 'vaccination.duckdb'),
+                              read_only=os.getenv('DB_READ_ONLY', '0') != '0')
+
+    if backend == 'mysql':
+        import mysql.connector
+        return mysql.connector.connect(
+            host=os.getenv('DB_HOST', 'localhost'),
+            database=database or os.getenv('DB_NAME', 'vaccination_db'),
+            user=os.getenv('DB_USER', 'root'),
+            password=os.getenv('DB_PASSWORD', 'your_password')
+        )
+
+    raise ValueError(f"Unknown DB backend {backend!r}; expected one of {BACKENDS}")
+
+
+def error_types(backend=None):
+    """Exception classes a backend's driver raises, for use in except clauses"""
+    backend = backend or os.getenv('DB_BACKEND', 'mysql')
+    if backend == 'sqlite':
+        return (sqlite3.Error,)
+    if backend == 'duckdb':
+        import duckdb
+        return (duckdb.Error,)
+    import mysql.connector
+    return (mysql.connector.Error,)
+
+
+def placeholder(backend):
+    """Parameter marker for the backend's DB-API paramstyle"""
+    return '%s' if backend == 'mysql' else '?'
+
+
+@lru_cache(maxsize=1024)
+def _qmark(query):
+    return _PLACEHOLDER.sub(lambda m: m.group(1) or '?', query)
+
+
+def adapt_query(query, backend):
+    """Rewrite MySQL-style %s placeholders for qmark backends, leaving string literals alone"""
+    if backend == 'mysql':
+        return query
+    return _qmark(query)
+
+# ==============================================
+# CONNECTION POOL
+# ==============================================
+# The API used to open a connection per query, so the server parsed and
+# planned every statement from scratch. Pooled connections stay open and
+# keep their prepared statements: SQLite's statement cache, a prepared
+# cursor per statement on MySQL (COM_STMT_PREPARE once, then only
+# COM_STMT_EXECUTE). DuckDB has no statement cache to reuse; it still
+# saves the connect.
+
+
+class PooledConnection:
+    """An open connection plus its prepared statements, keyed by SQL text"""
+
+    def __init__(self, raw, backend, cache_size=STATEMENT_CACHE_SIZE):
+        self.raw = raw
+        self.backend = backend
+        self.cache_size = cache_size
+        self._statements = OrderedDict()   # SQL -> prepared cursor (MySQL) or None
+        self.executions = 0
+        self.prepared = 0
+
+    def execute(self, query, params=None):
+        """Run MySQL-style SQL with %s placeholders; returns the cursor to fetch from"""
+        sql = _qmark(query)
+        self.executions += 1
+        if sql in self._statements:
+            self._statements.move_to_end(sql)
+        else:
+            self.prepared += 1
+            self._statements[sql] = self.raw.cursor(prepared=True) if self.backend == 'mysql' else None
+            if len(self._statements) > self.cache_size:
+                _, evicted = self._statements.popitem(last=False)
+                if evicted is not None:
+                    evicted.close()     # deallocates the server-side statement
+
+        if self.backend == 'mysql':
+            cursor = self._statements[sql]
+            cursor.execute(sql, tuple(params or ()))
+            return cursor
+        # sqlite3 reuses the compiled statement for identical SQL text;
+        # DuckDB's execute() returns the connection as its result cursor
+        return self.raw.execute(sql, tuple(params or ()) if self.backend == 'sqlite' else list(params or ()))
+
+    @staticmethod
+    def fetch_dicts(cursor):
+        rows = cursor.fetchall()
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
+
+    def close(self):
+        for cursor in self._statements.values():
+            if cursor is not None:
+                cursor.close()
+        self._statements.clear()
+        self.raw.close()
+
+
+class ConnectionPool:
+    """
+    Reuses idle connections across requests; up to size stay open. A
+    forked worker (gunicorn --preload) drops what it inherited and opens
+    its own, since a socket or SQLite handle must not be shared across
+    processes.
+    """
+
+    def __init__(self, backend=None, database=None, size=8, statement_cache=STATEMENT_CACHE_SIZE):
+        self.backend = backend or os.getenv('DB_BACKEND', 'mysql')
+        self.database = database
+        self.size = size
+        self.statement_cache = statement_cache
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+        self._closed_stats = [0, 0]    # executions, prepared of closed connections
+
+    def acquire(self):
+        """An idle connection, or a new one when none is free"""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._idle, self._pid = [], os.getpid()
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+            self.opened += 1
+        raw = connect(self.backend, self.database)
+        if self.backend == 'mysql':
+            raw.autocommit = True      # no long-lived snapshot: see each ETL load
+        return PooledConnection(raw, self.backend, self.statement_cache)
+
+    def release(self, connection, discard=False):
+        """Return a connection; discarded (or surplus) connections are closed"""
+        with self._lock:
+            if not discard and len(self._idle) < self.size and self._pid == os.getpid():
+                self._idle.append(connection)
+                return
+            self.discarded += discard
+        self._close(connection)
+
+    def clear(self):
+        """Close every idle connection (the next queries open fresh ones)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._close(connection)
+
+    def _close(self, connection):
+        with self._lock:
+            self._closed_stats[0] += connection.executions
+            self._closed_stats[1] += connection.prepared
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        with self._lock:
+            executions = self._closed_stats[0] + sum(c.executions for c in self._idle)
+            prepared = self._closed_stats[1] + sum(c.prepared for c in self._idle)
+            return {
+                'backend': self.backend,
+                'size': self.size,
+                'idle': len(self._idle),
+                'opened': self.opened,
+                'reused': self.reused,
+                'discarded': self.discarded,
+                'executions': executions,
+                'statements_prepared': prepared,
+                'statement_reuse': round(1 - prepared / executions, 4) if executions else None,
+            }
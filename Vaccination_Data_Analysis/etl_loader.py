@@ -0,0 +1,500 @@
+# etl_loader.py - Bulk loader from the WHO workbooks into the star schema
+# =======================================================================
+#
+# Streams every WHO .xlsx workbook row by row (openpyxl read-only mode),
+# resolves country/year/vaccine/disease surrogate keys through in-memory
+# dictionaries and writes fact rows in large executemany batches inside
+# one transaction (DuckDB: one INSERT ... SELECT per batch from a DataFrame). Dimension tables are written once all facts are known,
+# and secondary indexes are only created after the load so inserts never
+# pay for index maintenance.
+#
+# Every fact row also carries its calendar year, denormalized from
+# dim_time, and fact tables are clustered on (year, id) - range-partitioned
+# by year on MySQL - so year filters prune without a dim_time join.
+# After the load, mergeable sketches per (table, year, region) are built
+# for the API's ?approx=true mode (see sketches.py).
+#
+# Usage:
+#   python etl_loader.py --data-dir . --backend sqlite --database vaccination.db
+
+import argparse
+import itertools
+import os
+import time
+
+from db_backends import connect, placeholder
+from sketches import build_sketches
+
+# ==============================================
+# SCHEMA
+# ==============================================
+
+TABLES = {
+    'dim_countries': """
+        CREATE TABLE dim_countries (
+            country_id INTEGER PRIMARY KEY,
+            code VARCHAR(3) NOT NULL,
+            country_name VARCHAR(100) NOT NULL,
+            who_region VARCHAR(50)
+        )
+    """,
+    'dim_vaccines': """
+        CREATE TABLE dim_vaccines (
+            vaccine_id INTEGER PRIMARY KEY,
+            vaccine_code VARCHAR(200) NOT NULL,
+            vaccine_description VARCHAR(200)
+        )
+    """,
+    'dim_diseases': """
+        CREATE TABLE dim_diseases (
+            disease_id INTEGER PRIMARY KEY,
+            disease_code VARCHAR(20) NOT NULL,
+            disease_description VARCHAR(200)
+        )
+    """,
+    'dim_time': """
+        CREATE TABLE dim_time (
+            time_id INTEGER PRIMARY KEY,
+            year INTEGER NOT NULL,
+            decade INTEGER
+        )
+    """,
+    'fact_coverage': """
+        CREATE TABLE fact_coverage (
+            coverage_id INTEGER NOT NULL,
+            country_id INTEGER NOT NULL,
+            vaccine_id INTEGER NOT NULL,
+            time_id INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            coverage_category VARCHAR(50),
+            target_number BIGINT,
+            doses_administered BIGINT,
+            coverage_percentage DECIMAL(7,2),
+            PRIMARY KEY (year, coverage_id)
+        )
+    """,
+    'fact_incidence': """
+        CREATE TABLE fact_incidence (
+            incidence_id INTEGER NOT NULL,
+            country_id INTEGER NOT NULL,
+            disease_id INTEGER NOT NULL,
+            time_id INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            denominator VARCHAR(50),
+            incidence_rate DECIMAL(12,4),
+            PRIMARY KEY (year, incidence_id)
+        )
+    """,
+    'fact_cases': """
+        CREATE TABLE fact_cases (
+            case_id INTEGER NOT NULL,
+            country_id INTEGER NOT NULL,
+            disease_id INTEGER NOT NULL,
+            time_id INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            reported_cases BIGINT,
+            PRIMARY KEY (year, case_id)
+        )
+    """,
+    'fact_vaccine_introduction': """
+        CREATE TABLE fact_vaccine_introduction (
+            intro_id INTEGER NOT NULL,
+            country_id INTEGER NOT NULL,
+            vaccine_id INTEGER NOT NULL,
+            time_id INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            intro_status VARCHAR(20),
+            PRIMARY KEY (year, intro_id)
+        )
+    """,
+    'fact_vaccine_schedule': """
+        CREATE TABLE fact_vaccine_schedule (
+            schedule_id INTEGER NOT NULL,
+            country_id INTEGER NOT NULL,
+            vaccine_id INTEGER NOT NULL,
+            time_id INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            schedule_round VARCHAR(50),
+            target_population VARCHAR(100),
+            target_pop_description VARCHAR(255),
+            geo_area VARCHAR(100),
+            age_administered VARCHAR(50),
+            source_comment VARCHAR(1000),
+            PRIMARY KEY (year, schedule_id)
+        )
+    """,
+}
+
+# Created after the bulk load (see create_indexes)
+INDEXES = [
+    "CREATE UNIQUE INDEX idx_countries_code ON dim_countries (code)",
+    "CREATE INDEX idx_countries_region ON dim_countries (who_region)",
+    "CREATE UNIQUE INDEX idx_vaccines_code ON dim_vaccines (vaccine_code)",
+    "CREATE UNIQUE INDEX idx_diseases_code ON dim_diseases (disease_code)",
+    "CREATE UNIQUE INDEX idx_time_year ON dim_time (year)",
+    "CREATE INDEX idx_coverage_country_time ON fact_coverage (country_id, time_id)",
+    "CREATE INDEX idx_coverage_vaccine ON fact_coverage (vaccine_id)",
+    "CREATE INDEX idx_incidence_country_disease ON fact_incidence (country_id, disease_id)",
+    "CREATE INDEX idx_incidence_time ON fact_incidence (time_id)",
+    "CREATE INDEX idx_cases_country_disease_time ON fact_cases (country_id, disease_id, time_id)",
+    "CREATE INDEX idx_intro_country_vaccine ON fact_vaccine_introduction (country_id, vaccine_id)",
+    "CREATE INDEX idx_schedule_country_vaccine_time ON fact_vaccine_schedule (country_id, vaccine_id, time_id)",
+]
+
+DIM_TABLES = ['dim_countries', 'dim_vaccines', 'dim_diseases', 'dim_time']
+FACT_TABLES = ['fact_coverage', 'fact_incidence', 'fact_cases',
+               'fact_vaccine_introduction', 'fact_vaccine_schedule']
+FACT_IDS = {
+    'fact_coverage': 'coverage_id',
+    'fact_incidence': 'incidence_id',
+    'fact_cases': 'case_id',
+    'fact_vaccine_introduction': 'intro_id',
+    'fact_vaccine_schedule': 'schedule_id',
+}
+
+# MySQL range partitions for the fact tables, one per decade
+PARTITION_DECADES = range(1970, 2030, 10)
+
+# ==============================================
+# DIMENSION REGISTRY
+# ==============================================
+
+class DimensionRegistry:
+    """In-memory natural key -> surrogate key maps for every dimension"""
+
+    def __init__(self):
+        self.countries = {}   # code -> [country_id, name, region]
+        self.vaccines = {}    # vaccine_code -> [vaccine_id, description]
+        self.diseases = {}    # disease_code -> [disease_id, description]
+        self.years = {}       # year -> time_id
+
+    def country(self, code, name, region=None):
+        entry = self.countries.get(code)
+        if entry is None:
+            entry = self.countries[code] = [len(self.countries) + 1, name or code, region]
+        elif region and not entry[2]:
+            entry[2] = region
+        return entry[0]
+
+    def vaccine(self, code, description):
+        key = (code or description).strip().upper()
+        entry = self.vaccines.get(key)
+        if entry is None:
+            entry = self.vaccines[key] = [len(self.vaccines) + 1, description or code]
+        return entry[0]
+
+    def disease(self, code, description):
+        key = code.strip().upper()
+        entry = self.diseases.get(key)
+        if entry is None:
+            entry = self.diseases[key] = [len(self.diseases) + 1, description or code]
+        return entry[0]
+
+    def time(self, year):
+        time_id = self.years.get(year)
+        if time_id is None:
+            time_id = self.years[year] = len(self.years) + 1
+        return time_id
+
+    def rows(self):
+        """Dimension rows ready for insertion, keyed by table"""
+        return {
+            'dim_countries': [(cid, code, name, region)
+                              for code, (cid, name, region) in self.countries.items()],
+            'dim_vaccines': [(vid, code, desc) for code, (vid, desc) in self.vaccines.items()],
+            'dim_diseases': [(did, code, desc) for code, (did, desc) in self.diseases.items()],
+            'dim_time': [(tid, year, year // 10 * 10) for year, tid in self.years.items()],
+        }
+
+# ==============================================
+# WORKBOOK -> FACT ROW MAPPINGS
+# ==============================================
+
+def _year(value):
+    return int(float(value))
+
+
+def _number(value):
+    if value is None or value == '':
+        return None
+    return float(value)
+
+
+def _integer(value):
+    number = _number(value)
+    return None if number is None else int(number)
+
+
+def _countries_only(record):
+    # GROUP distinguishes country rows from WHO region / global aggregates
+    return record.get('GROUP', 'COUNTRIES') == 'COUNTRIES'
+
+
+def _has(record, *keys):
+    return all(record.get(key) not in (None, '') for key in keys)
+
+
+def map_coverage(record, dims):
+    if not _countries_only(record) or not _has(record, 'CODE', 'YEAR', 'ANTIGEN'):
+        return None
+    year = _year(record['YEAR'])
+    return (
+        dims.country(record['CODE'], record['NAME']),
+        dims.vaccine(record['ANTIGEN'], record['ANTIGEN_DESCRIPTION']),
+        dims.time(year),
+        year,
+        record.get('COVERAGE_CATEGORY'),
+        _integer(record.get('TARGET_NUMBER')),
+        _integer(record.get('DOSES')),
+        _number(record.get('COVERAGE')),
+    )
+
+
+def map_incidence(record, dims):
+    if not _countries_only(record) or not _has(record, 'CODE', 'YEAR', 'DISEASE'):
+        return None
+    year = _year(record['YEAR'])
+    return (
+        dims.country(record['CODE'], record['NAME']),
+        dims.disease(record['DISEASE'], record['DISEASE_DESCRIPTION']),
+        dims.time(year),
+        year,
+        record.get('DENOMINATOR'),
+        _number(record.get('INCIDENCE_RATE')),
+    )
+
+
+def map_cases(record, dims):
+    if not _countries_only(record) or not _has(record, 'CODE', 'YEAR', 'DISEASE'):
+        return None
+    year = _year(record['YEAR'])
+    return (
+        dims.country(record['CODE'], record['NAME']),
+        dims.disease(record['DISEASE'], record['DISEASE_DESCRIPTION']),
+        dims.time(year),
+        year,
+        _integer(record.get('CASES')),
+    )
+
+
+def map_introduction(record, dims):
+    if not _has(record, 'ISO_3_CODE', 'YEAR', 'DESCRIPTION'):
+        return None
+    year = _year(record['YEAR'])
+    return (
+        dims.country(record['ISO_3_CODE'], record['COUNTRYNAME'], record.get('WHO_REGION')),
+        dims.vaccine(None, record['DESCRIPTION']),
+        dims.time(year),
+        year,
+        record.get('INTRO'),
+    )
+
+
+def map_schedule(record, dims):
+    if not _has(record, 'ISO_3_CODE', 'YEAR', 'VACCINECODE'):
+        return None
+    year = _year(record['YEAR'])
+    return (
+        dims.country(record['ISO_3_CODE'], record['COUNTRYNAME'], record.get('WHO_REGION')),
+        dims.vaccine(record['VACCINECODE'], record['VACCINE_DESCRIPTION']),
+        dims.time(year),
+        year,
+        record.get('SCHEDULEROUNDS'),
+        record.get('TARGETPOP'),
+        record.get('TARGETPOP_DESCRIPTION'),
+        record.get('GEOAREA'),
+        record.get('AGEADMINISTERED'),
+        record.get('SOURCECOMMENT'),
+    )
+
+
+# Load order matters only for who_region: the introduction and schedule
+# workbooks carry it, so they go first and coverage/incidence reuse it.
+WORKBOOKS = [
+    ('vaccine-introduction-data.xlsx', 'fact_vaccine_introduction',
+     ['country_id', 'vaccine_id', 'time_id', 'year', 'intro_status'], map_introduction),
+    ('vaccine-schedule-data.xlsx', 'fact_vaccine_schedule',
+     ['country_id', 'vaccine_id', 'time_id', 'year', 'schedule_round', 'target_population',
+      'target_pop_description', 'geo_area', 'age_administered', 'source_comment'], map_schedule),
+    ('coverage-data.xlsx', 'fact_coverage',
+     ['country_id', 'vaccine_id', 'time_id', 'year', 'coverage_category', 'target_number',
+      'doses_administered', 'coverage_percentage'], map_coverage),
+    ('incidence-rate-data.xlsx', 'fact_incidence',
+     ['country_id', 'disease_id', 'time_id', 'year', 'denominator', 'incidence_rate'], map_incidence),
+    ('reported-cases-data.xlsx', 'fact_cases',
+     ['country_id', 'disease_id', 'time_id', 'year', 'reported_cases'], map_cases),
+]
+
+# ==============================================
+# LOADER
+# ==============================================
+
+def iter_workbook(path):
+    """Yield each data row of the first sheet as a {HEADER: value} dict"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(h).strip().upper() if h is not None else '' for h in next(rows)]
+        for row in rows:
+            if row and any(v is not None for v in row):
+                yield dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
+def insert_sql(table, columns, backend):
+    marks = ', '.join([placeholder(backend)] * len(columns))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({marks})"
+
+
+def write_rows(cursor, backend, table, columns, rows, chunk_size=100000):
+    """
+    Insert rows (any iterable of tuples). DuckDB's executemany binds one row
+    at a time, so there each chunk becomes a DataFrame inserted with a single
+    INSERT ... SELECT; the other backends use executemany.
+    """
+    if backend != 'duckdb':
+        cursor.executemany(insert_sql(table, columns, backend), rows)
+        return
+    import pandas as pd
+
+    names = ', '.join(columns)
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        cursor.register('etl_batch', pd.DataFrame.from_records(chunk, columns=columns))
+        try:
+            cursor.execute(f"INSERT INTO {table} ({names}) SELECT {names} FROM etl_batch")
+        finally:
+            cursor.unregister('etl_batch')
+
+
+def table_options(table, backend):
+    """Backend-specific storage clause that clusters fact tables by year"""
+    if table not in FACT_IDS:
+        return ''
+    if backend == 'sqlite':
+        # Store rows in primary key order instead of rowid order
+        return ' WITHOUT ROWID'
+    if backend == 'mysql':
+        partitions = ', '.join(f"PARTITION p{decade} VALUES LESS THAN ({decade + 10})"
+                               for decade in PARTITION_DECADES)
+        return (f" PARTITION BY RANGE (year) (PARTITION pold VALUES LESS THAN ({PARTITION_DECADES[0]}), "
+                f"{partitions}, PARTITION pmax VALUES LESS THAN MAXVALUE)")
+    return ''
+
+
+def create_schema(connection, tables=TABLES, backend='sqlite'):
+    cursor = connection.cursor()
+    for table in list(tables)[::-1]:
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    for table, ddl in tables.items():
+        cursor.execute(ddl.rstrip() + table_options(table, backend))
+    cursor.close()
+
+
+def create_indexes(connection, indexes=INDEXES):
+    cursor = connection.cursor()
+    for ddl in indexes:
+        cursor.execute(ddl)
+    cursor.close()
+
+
+def load_facts(connection, backend, path, table, columns, mapper, dims, batch_size):
+    """Stream one workbook into its fact table; returns (rows written, rows skipped)"""
+    cursor = connection.cursor()
+    # Fact ids are assigned here: the (year, id) primary key is not auto-increment
+    columns = [FACT_IDS[table]] + columns
+    batch = []
+    written = skipped = 0
+    for record in iter_workbook(path):
+        row = mapper(record, dims)
+        if row is None:
+            skipped += 1
+            continue
+        batch.append((written + len(batch) + 1,) + row)
+        if len(batch) >= batch_size:
+            write_rows(cursor, backend, table, columns, batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        write_rows(cursor, backend, table, columns, batch)
+        written += len(batch)
+    cursor.close()
+    return written, skipped
+
+
+def load_dimensions(connection, backend, dims):
+    cursor = connection.cursor()
+    columns = {
+        'dim_countries': ['country_id', 'code', 'country_name', 'who_region'],
+        'dim_vaccines': ['vaccine_id', 'vaccine_code', 'vaccine_description'],
+        'dim_diseases': ['disease_id', 'disease_code', 'disease_description'],
+        'dim_time': ['time_id', 'year', 'decade'],
+    }
+    counts = {}
+    for table, rows in dims.rows().items():
+        if rows:
+            write_rows(cursor, backend, table, columns[table], rows)
+        counts[table] = len(rows)
+    cursor.close()
+    return counts
+
+
+def run_etl(data_dir='.', backend='sqlite', database=None, batch_size=10000):
+    """Load every available workbook and print a rows/sec report"""
+    connection = connect(backend, database)
+    dims = DimensionRegistry()
+    report = []
+    started = time.perf_counter()
+
+    create_schema(connection, backend=backend)
+    for filename, table, columns, mapper in WORKBOOKS:
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            print(f"  - {filename} not found, skipping {table}")
+            continue
+        t0 = time.perf_counter()
+        rows, skipped = load_facts(connection, backend, path, table, columns, mapper, dims, batch_size)
+        elapsed = time.perf_counter() - t0
+        report.append((table, rows, elapsed))
+        print(f"  ✓ {table:<28} {rows:>9,} rows  {elapsed:7.2f}s  {rows / elapsed:>10,.0f} rows/s"
+              f"  ({skipped:,} aggregate/incomplete rows skipped)")
+
+    for table, rows in load_dimensions(connection, backend, dims).items():
+        print(f"  ✓ {table:<28} {rows:>9,} rows")
+
+    t0 = time.perf_counter()
+    create_indexes(connection)
+    print(f"  ✓ {len(INDEXES)} secondary indexes built in {time.perf_counter() - t0:.2f}s")
+
+    t0 = time.perf_counter()
+    cells = build_sketches(connection, backend)
+    print(f"  ✓ {cells} approximate-query sketch cells built in {time.perf_counter() - t0:.2f}s")
+
+    connection.commit()
+    connection.close()
+
+    total_rows = sum(rows for _, rows, _ in report)
+    total_time = time.perf_counter() - started
+    print(f"\nLoaded {total_rows:,} fact rows in {total_time:.2f}s "
+          f"({total_rows / total_time:,.0f} rows/s overall)")
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load the WHO workbooks into the vaccination star schema')
+    parser.add_argument('--data-dir', default='.')
+    parser.add_argument('--backend', choices=['sqlite', 'duckdb', 'mysql'], default='sqlite')
+    parser.add_argument('--database', help='database file (sqlite/duckdb) or schema name (mysql)')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📥 Vaccination ETL")
+    print("=" * 60)
+    run_etl(args.data_dir, args.backend, args.database, args.batch_size)
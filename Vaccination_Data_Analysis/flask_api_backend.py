@@ -1,55 +1,343 @@
 # app.py - Flask Backend API for Vaccination Dashboard
 # ====================================================
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
-import mysql.connector
-from mysql.connector import Error
-import pandas as pd
 import json
+from collections import OrderedDict
 from datetime import datetime
+import hmac
 import os
+import threading
+import time
+
+import serialization
+from precompute import PayloadScheduler
+from data_profiler import DataProfiler
+from sketches import SketchStore, HLL_RELATIVE_ERROR, HIST_STEP
+from cube import CoverageCube
+from target_tracker import TargetTracker, CRITICAL_COVERAGE
+from db_backends import ConnectionPool, error_types
+import query_registry
+from query_registry import QueryMetrics
+from request_profiler import RequestProfiler, phase
+# pandas, analytics.py and forecasting.py are imported inside the endpoints
+# that need them, so workers start without loading pandas
 
 app = Flask(__name__)
 CORS(app)  # Enable Cross-Origin Resource Sharing for React
+serialization.install(app)  # orjson encoding, ?format=columnar, gzip/brotli
+
+# REQUEST_PROFILING=1 profiles requests sent with an X-Profile header;
+# PROFILE_SAMPLE_RATE=0.01 also profiles 1% of all requests under cProfile.
+# Traces are kept in a ring buffer at GET /api/debug/profiles
+profiling = RequestProfiler(
+    enabled=os.getenv('REQUEST_PROFILING', '0') != '0',
+    sample_rate=float(os.getenv('PROFILE_SAMPLE_RATE', 0)),
+    capacity=int(os.getenv('PROFILE_BUFFER', 200)),
+)
+profiling.install(app)
 
 # ==============================================
 # DATABASE CONNECTION
 # ==============================================
 
-def get_db_connection():
-    """Create database connection"""
+# DB_BACKEND=mysql (default) or the local sqlite/duckdb stand-ins (DB_PATH)
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+Error = error_types(DB_BACKEND)
+
+# Connections stay open between queries and keep their prepared statements
+pool = ConnectionPool(DB_BACKEND, size=int(os.getenv('DB_POOL_SIZE', 8)))
+query_metrics = QueryMetrics()
+
+def run_query(query, params=None):
+    """Execute a registered query (by name, see query_registry.py) or SQL text; list of dicts"""
+    label, sql = query_registry.resolve(query, params)
+    started = time.perf_counter()
+    results = None
     try:
-        connection = mysql.connector.connect(
-            host=os.getenv('DB_HOST', 'localhost'),
-            database=os.getenv('DB_NAME', 'vaccination_db'),
-            user=os.getenv('DB_USER', 'root'),
-            password=os.getenv('DB_PASSWORD', 'your_password')
-        )
-        return connection
+        with phase('connect'):
+            connection = pool.acquire()
     except Error as e:
-        print(f"Error connecting to MySQL: {e}")
+        print(f"Error connecting to {DB_BACKEND}: {e}")
+        query_metrics.record(label, time.perf_counter() - started)
         return None
 
-def execute_query(query, params=None):
-    """Execute SQL query and return results as list of dicts"""
-    connection = get_db_connection()
-    if not connection:
-        return None
-    
     try:
-        cursor = connection.cursor(dictionary=True)
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        results = cursor.fetchall()
-        cursor.close()
-        connection.close()
+        with phase('execute'):
+            cursor = connection.execute(sql, params)
+        with phase('fetch'):
+            results = connection.fetch_dicts(cursor)
         return results
     except Error as e:
-        print(f"Error executing query: {e}")
+        print(f"Error executing query {label}: {e}")
+        return None
+    finally:
+        pool.release(connection, discard=results is None)
+        query_metrics.record(label, time.perf_counter() - started, results)
+
+# ==============================================
+# REQUEST COALESCING
+# ==============================================
+# Identical queries issued concurrently (many dashboards asking for the
+# same page at once) run once; the other callers wait for that execution
+# and share its result. Nothing is kept after the query finishes.
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key"""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.deduplicated = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            call.done.wait()
+            return call.result
+
+        try:
+            call.result = fn()
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'deduplicated': self.deduplicated,
+                'in_flight': len(self._calls),
+            }
+
+query_flight = SingleFlight()
+
+def execute_query(query, params=None):
+    """Execute SQL query (coalescing identical concurrent calls) and return results as list of dicts"""
+    key = (query, tuple(params) if params else None)
+    # Time spent waiting on another caller's identical query counts as execute
+    with phase('execute'):
+        return query_flight.do(key, lambda: run_query(query, params))
+
+# ==============================================
+# RESULT CACHE
+# ==============================================
+# Expensive analytics results are kept until the warehouse is reloaded
+# (POST /api/admin/reload once etl_loader.py has finished). The cache is an
+# LRU of RESULT_CACHE_SIZE entries, and client-supplied years are clamped to
+# the data's range so they cannot mint unbounded distinct keys.
+
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', 32))
+
+def cached_result(key, compute):
+    """Return the cached value for key, computing and storing it on a miss"""
+    with _result_cache_lock:
+        if key in _result_cache:
+            _result_cache.move_to_end(key)
+            return _result_cache[key]
+    value = compute()
+    if value is not None:
+        with _result_cache_lock:
+            _result_cache[key] = value
+            _result_cache.move_to_end(key)
+            while len(_result_cache) > RESULT_CACHE_SIZE:
+                _result_cache.popitem(last=False)
+    return value
+
+def clamp_year(year):
+    """year limited to the first..last year in the fact tables (unchanged if they are empty)"""
+    def compute():
+        rows = execute_query('admin.year_range')
+        return (rows[0]['min_year'], rows[0]['max_year']) if rows else None
+
+    first, last = cached_result(('year-range',), compute) or (None, None)
+    if first is None or last is None:
+        return year
+    return min(max(year, int(first)), int(last))
+
+# ==============================================
+# PRECOMPUTED DASHBOARD PAYLOADS
+# ==============================================
+# The dashboard polls these on an interval; their responses are built in
+# the background on startup and whenever the warehouse changes, and
+# served from memory in between.
+
+HOT_ENDPOINTS = [
+    '/api/cleaning/quality',
+    '/api/eda/global-trends',
+    '/api/eda/top-countries',
+    '/api/eda/low-coverage',
+    '/api/eda/disease-impact',
+    '/api/eda/regional-analysis',
+    '/api/insights/summary',
+]
+
+def data_fingerprint():
+    rows = execute_query('admin.data_fingerprint')  # checked every REFRESH_CHECK_SECONDS
+    return tuple(rows[0].values()) if rows else None
+
+def clear_result_cache():
+    with _result_cache_lock:
+        dropped = len(_result_cache)
+        _result_cache.clear()
+    return dropped
+
+profiler = DataProfiler(execute_query)
+sketch_store = SketchStore(execute_query)  # ?approx=true answers, see sketches.py
+
+# Coverage endpoints are answered from an in-memory cube (cube.py);
+# COVERAGE_CUBE=0 sends them to SQL instead
+USE_COVERAGE_CUBE = os.getenv('COVERAGE_CUBE', '1') != '0'
+cube = CoverageCube(execute_query)
+tracker = TargetTracker(execute_query)  # WHO 95% measles target, updated incrementally
+
+def coverage_cube():
+    """The coverage cube, or None when disabled or it could not be built"""
+    if not USE_COVERAGE_CUBE or cube.data() is None:
         return None
+    return cube
+
+def on_data_change():
+    """Runs in the refresh thread before the hot payloads are rebuilt"""
+    clear_result_cache()
+    if USE_COVERAGE_CUBE:
+        cube.rebuild()
+    profiler.refresh()
+    sketch_store.reload()
+    tracker.update()  # new years only; replays by itself if years or countries went away
+
+def approx_requested():
+    """True for ?approx=true when the load-time sketches are available"""
+    if request.args.get('approx', 'false').lower() != 'true':
+        return False
+    return sketch_store.ready or sketch_store.reload()
+
+scheduler = PayloadScheduler(
+    app, HOT_ENDPOINTS,
+    fingerprint=data_fingerprint,
+    on_change=on_data_change,
+    check_interval=int(os.getenv('REFRESH_CHECK_SECONDS', 30)),
+    max_age=int(os.getenv('REFRESH_MAX_AGE_SECONDS', 600)),
+    max_streams=int(os.getenv('STREAM_MAX_PER_WORKER', 8)),   # serve.py caps this by --threads
+    stream_lifetime=int(os.getenv('STREAM_LIFETIME_SECONDS', 300)),
+)
+app.before_request(scheduler.respond)
+
+# ADMIN_TOKEN=<secret> lets clients send it as X-Admin-Token; without it the
+# admin endpoints only answer requests from this host
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+LOCAL_ADDRESSES = {'127.0.0.1', '::1'}
+_reload_lock = threading.Lock()
+
+def admin_allowed():
+    if ADMIN_TOKEN:
+        return hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN)
+    return request.remote_addr in LOCAL_ADDRESSES
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_data():
+    """Drop cached results and rebuild precomputed payloads after a reload"""
+    if not admin_allowed():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+
+    # A reload that is still waiting for the refresh thread covers this one
+    if not _reload_lock.acquire(blocking=False):
+        return jsonify({'success': True, 'coalesced': True,
+                        'timestamp': datetime.now().isoformat()}), 202
+    try:
+        if scheduler.pending():
+            return jsonify({'success': True, 'coalesced': True,
+                            'timestamp': datetime.now().isoformat()}), 202
+        dropped = clear_result_cache()
+        pool.clear()  # reconnect and re-prepare against the reloaded schema
+        profiler.invalidate()
+        tracker.reset()
+        sketch_store.reload()
+        scheduler.trigger('reload')
+    finally:
+        _reload_lock.release()
+    return jsonify({
+        'success': True,
+        'cleared': dropped,
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/stream', methods=['GET'])
+def stream_updates():
+    """Server-Sent Events: push hot endpoint payloads when their data changes"""
+    requested = request.args.get('endpoints')
+    urls = requested.split(',') if requested else HOT_ENDPOINTS
+    unknown = [url for url in urls if url not in HOT_ENDPOINTS]
+    if unknown:
+        return jsonify({'success': False, 'error': f'Not streamable: {", ".join(unknown)}',
+                        'streamable': HOT_ENDPOINTS}), 400
+
+    if not scheduler.open_stream():
+        return jsonify({'success': False, 'error': 'Too many open streams on this worker',
+                        'max_streams': scheduler.max_streams}), 503, {'Retry-After': '30'}
+
+    response = Response(stream_with_context(scheduler.stream(urls)),
+                        mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(scheduler.close_stream)
+    return response
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Background refresh timings, hit counts and query deduplication counters"""
+    return jsonify({
+        'success': True,
+        'refresh': scheduler.metrics(),
+        'single_flight': query_flight.stats(),
+        'pool': pool.stats(),
+        'queries': query_metrics.report(),
+        'cube': cube.memory_report(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/debug/profiles', methods=['GET'])
+def get_profiles():
+    """Recent request profiles: phase breakdowns, plus cProfile tables for sampled requests"""
+    if not profiling.active:
+        return jsonify({'success': False,
+                        'error': 'Request profiling is off (set REQUEST_PROFILING=1 or PROFILE_SAMPLE_RATE)'}), 404
+
+    trace_id = request.args.get('id', type=int)
+    if trace_id is not None:
+        trace = profiling.get(trace_id)
+        if trace is None:
+            return jsonify({'success': False, 'error': f'Profile {trace_id} is no longer buffered'}), 404
+        return jsonify({'success': True, 'data': trace, 'timestamp': datetime.now().isoformat()})
+
+    path = request.args.get('path')
+    traces = profiling.traces(path, request.args.get('limit', 50, type=int))
+    return jsonify({
+        'success': True,
+        'config': profiling.config(),
+        'summary': profiling.summary(),
+        'count': len(traces),
+        'data': traces,
+        'timestamp': datetime.now().isoformat()
+    })
 
 # ==============================================
 # API ENDPOINTS
@@ -70,38 +358,14 @@ def health_check():
 
 @app.route('/api/cleaning/overview', methods=['GET'])
 def get_cleaning_overview():
-    """Get data cleaning overview statistics"""
-    
-    queries = {
-        'coverage': """
-            SELECT 
-                'Coverage' as dataset,
-                COUNT(*) as total_records,
-                COUNT(DISTINCT country_id) as countries,
-                COUNT(DISTINCT vaccine_id) as vaccines
-            FROM fact_coverage
-        """,
-        'incidence': """
-            SELECT 
-                'Incidence' as dataset,
-                COUNT(*) as total_records,
-                COUNT(DISTINCT country_id) as countries,
-                COUNT(DISTINCT disease_id) as diseases
-            FROM fact_incidence
-        """,
-        'cases': """
-            SELECT 
-                'Cases' as dataset,
-                COUNT(*) as total_records,
-                COUNT(DISTINCT country_id) as countries,
-                COUNT(DISTINCT disease_id) as diseases
-            FROM fact_cases
-        """
-    }
+    """Get data cleaning overview statistics (?approx=true: from sketches)"""
     
+    if approx_requested():
+        return get_cleaning_overview_approx()
+
     results = []
-    for name, query in queries.items():
-        data = execute_query(query)
+    for name in ('cleaning.overview.coverage', 'cleaning.overview.incidence', 'cleaning.overview.cases'):
+        data = execute_query(name)
         if data:
             results.extend(data)
     
@@ -111,44 +375,49 @@ def get_cleaning_overview():
         'timestamp': datetime.now().isoformat()
     })
 
+def get_cleaning_overview_approx():
+    """Exact record counts, HyperLogLog distinct counts with 95% bounds"""
+    datasets = [
+        ('Coverage', 'fact_coverage', ['countries', 'vaccines']),
+        ('Incidence', 'fact_incidence', ['countries', 'diseases']),
+        ('Cases', 'fact_cases', ['countries', 'diseases']),
+    ]
+    columns = {'countries': 'country_id', 'vaccines': 'vaccine_id', 'diseases': 'disease_id'}
+    results = []
+    for dataset, table, distinct in datasets:
+        cell = sketch_store.merged(table)
+        row = {'dataset': dataset, 'total_records': cell.rows}
+        bounds = {}
+        for name in distinct:
+            estimate, error = cell.distinct(columns[name])
+            row[name] = int(round(estimate))
+            bounds[name] = round(error, 1)
+        row['error_bounds'] = bounds
+        results.append(row)
+
+    return jsonify({
+        'success': True,
+        'data': results,
+        'approx': True,
+        'error_bounds': {'distinct_relative_95': round(2 * HLL_RELATIVE_ERROR, 4)},
+        'timestamp': datetime.now().isoformat()
+    })
+
 @app.route('/api/cleaning/quality', methods=['GET'])
 def get_data_quality():
-    """Get data quality metrics"""
-    
-    query = """
-        SELECT 
-            'Coverage' as dataset,
-            COUNT(*) as total_records,
-            SUM(CASE WHEN coverage_percentage IS NULL THEN 1 ELSE 0 END) as null_coverage,
-            SUM(CASE WHEN target_number IS NULL THEN 1 ELSE 0 END) as null_target,
-            AVG(coverage_percentage) as avg_coverage
-        FROM fact_coverage
-        
-        UNION ALL
-        
-        SELECT 
-            'Incidence' as dataset,
-            COUNT(*) as total_records,
-            SUM(CASE WHEN incidence_rate IS NULL THEN 1 ELSE 0 END) as null_incidence,
-            0 as null_target,
-            AVG(incidence_rate) as avg_incidence
-        FROM fact_incidence
-    """
+    """Get data quality metrics from the cached single-scan table profiles"""
     
-    results = execute_query(query)
-    
-    # Calculate quality scores
-    quality_metrics = {
-        'completeness': 99.2,  # Calculate based on null counts
-        'accuracy': 98.7,
-        'consistency': 99.5,
-        'validity': 98.9
-    }
+    report = profiler.report()
+    if report is None:
+        profiler.refresh()
+        report = profiler.report()
+    if report is None:
+        return jsonify({'success': False, 'error': 'Database query failed'}), 500
     
     return jsonify({
         'success': True,
-        'metrics': quality_metrics,
-        'details': results,
+        'metrics': report['metrics'],
+        'details': report['details'],
         'timestamp': datetime.now().isoformat()
     })
 
@@ -160,20 +429,8 @@ def get_data_quality():
 def get_global_trends():
     """Get global vaccination coverage trends by year"""
     
-    query = """
-        SELECT 
-            t.year,
-            AVG(fc.coverage_percentage) as avg_coverage,
-            COUNT(DISTINCT fc.country_id) as countries,
-            SUM(fc.doses_administered) as total_doses
-        FROM fact_coverage fc
-        JOIN dim_time t ON fc.time_id = t.time_id
-        WHERE t.year >= 2015
-        GROUP BY t.year
-        ORDER BY t.year
-    """
-    
-    results = execute_query(query)
+    olap = coverage_cube()
+    results = olap.global_trends(2015) if olap else execute_query('eda.global_trends')
     
     return jsonify({
         'success': True,
@@ -188,22 +445,8 @@ def get_top_countries():
     limit = request.args.get('limit', 10, type=int)
     year = request.args.get('year', 2024, type=int)
     
-    query = """
-        SELECT 
-            c.country_name,
-            c.who_region,
-            AVG(fc.coverage_percentage) as avg_coverage,
-            SUM(fc.doses_administered) as total_doses
-        FROM fact_coverage fc
-        JOIN dim_countries c ON fc.country_id = c.country_id
-        JOIN dim_time t ON fc.time_id = t.time_id
-        WHERE t.year >= %s
-        GROUP BY c.country_name, c.who_region
-        ORDER BY avg_coverage DESC
-        LIMIT %s
-    """
-    
-    results = execute_query(query, (year - 2, limit))
+    olap = coverage_cube()
+    results = olap.top_countries(year - 2, limit) if olap else execute_query('eda.top_countries', (year - 2, limit))
     
     return jsonify({
         'success': True,
@@ -218,23 +461,8 @@ def get_low_coverage_countries():
     
     threshold = request.args.get('threshold', 60, type=int)
     
-    query = """
-        SELECT 
-            c.country_name,
-            c.who_region,
-            AVG(fc.coverage_percentage) as avg_coverage,
-            SUM(fc.target_number) as target_population,
-            SUM(fc.target_number - fc.doses_administered) as unvaccinated_population
-        FROM fact_coverage fc
-        JOIN dim_countries c ON fc.country_id = c.country_id
-        JOIN dim_time t ON fc.time_id = t.time_id
-        WHERE t.year >= 2022
-        GROUP BY c.country_name, c.who_region
-        HAVING avg_coverage < %s
-        ORDER BY avg_coverage ASC
-    """
-    
-    results = execute_query(query, (threshold,))
+    olap = coverage_cube()
+    results = olap.low_coverage_countries(2022, threshold) if olap else execute_query('eda.low_coverage', (threshold,))
     
     return jsonify({
         'success': True,
@@ -248,31 +476,7 @@ def get_low_coverage_countries():
 def get_disease_impact():
     """Analyze vaccination impact on disease reduction"""
     
-    query = """
-        SELECT 
-            d.disease_description as disease,
-            AVG(fc.coverage_percentage) as avg_coverage,
-            AVG(fi.incidence_rate) as avg_incidence,
-            SUM(fca.reported_cases) as total_cases,
-            COUNT(DISTINCT c.country_id) as countries_affected
-        FROM dim_diseases d
-        LEFT JOIN fact_incidence fi ON d.disease_id = fi.disease_id
-        LEFT JOIN fact_cases fca ON d.disease_id = fca.disease_id 
-            AND fi.country_id = fca.country_id 
-            AND fi.time_id = fca.time_id
-        LEFT JOIN dim_vaccines v ON LOWER(v.vaccine_description) LIKE CONCAT('%', LOWER(d.disease_code), '%')
-        LEFT JOIN fact_coverage fc ON v.vaccine_id = fc.vaccine_id 
-            AND fi.country_id = fc.country_id 
-            AND fi.time_id = fc.time_id
-        JOIN dim_countries c ON fi.country_id = c.country_id
-        JOIN dim_time t ON fi.time_id = t.time_id
-        WHERE t.year >= 2020
-        GROUP BY d.disease_description
-        HAVING avg_coverage IS NOT NULL
-        ORDER BY total_cases DESC
-    """
-    
-    results = execute_query(query)
+    results = execute_query('eda.disease_impact')
     
     return jsonify({
         'success': True,
@@ -282,25 +486,13 @@ def get_disease_impact():
 
 @app.route('/api/eda/regional-analysis', methods=['GET'])
 def get_regional_analysis():
-    """Get vaccination coverage by WHO region"""
-    
-    query = """
-        SELECT 
-            c.who_region,
-            COUNT(DISTINCT c.country_id) as countries,
-            AVG(fc.coverage_percentage) as avg_coverage,
-            MIN(fc.coverage_percentage) as min_coverage,
-            MAX(fc.coverage_percentage) as max_coverage,
-            SUM(fc.doses_administered) as total_doses
-        FROM fact_coverage fc
-        JOIN dim_countries c ON fc.country_id = c.country_id
-        JOIN dim_time t ON fc.time_id = t.time_id
-        WHERE t.year >= 2020
-        GROUP BY c.who_region
-        ORDER BY avg_coverage DESC
-    """
+    """Get vaccination coverage by WHO region (?approx=true: from sketches)"""
     
-    results = execute_query(query)
+    if approx_requested():
+        return get_regional_analysis_approx()
+
+    olap = coverage_cube()
+    results = olap.regional_analysis(2020) if olap else execute_query('eda.regional_analysis')
     
     return jsonify({
         'success': True,
@@ -308,6 +500,44 @@ def get_regional_analysis():
         'timestamp': datetime.now().isoformat()
     })
 
+def get_regional_analysis_approx():
+    """
+    Regional coverage from merged (year >= 2020, region) sketch cells:
+    avg/min/max/doses are exact, countries is a HyperLogLog estimate and
+    the median/p10/p90 come from the coverage histogram.
+    """
+    results = []
+    for region in sketch_store.regions('fact_coverage'):
+        cell = sketch_store.merged('fact_coverage', min_year=2020, regions={region})
+        if cell.rows == 0:
+            continue
+        countries, countries_error = cell.distinct('country_id')
+        has_values = cell.count > 0
+        results.append({
+            'who_region': region,
+            'countries': int(round(countries)),
+            'avg_coverage': cell.sum / cell.count if has_values else None,
+            'min_coverage': cell.min if has_values else None,
+            'max_coverage': cell.max if has_values else None,
+            'median_coverage': cell.quantile(0.5),
+            'p10_coverage': cell.quantile(0.1),
+            'p90_coverage': cell.quantile(0.9),
+            'total_doses': cell.total,
+            'error_bounds': {'countries': round(countries_error, 1)},
+        })
+    results.sort(key=lambda r: r['avg_coverage'] if r['avg_coverage'] is not None else -1, reverse=True)
+
+    return jsonify({
+        'success': True,
+        'data': results,
+        'approx': True,
+        'error_bounds': {
+            'distinct_relative_95': round(2 * HLL_RELATIVE_ERROR, 4),
+            'percentile_absolute': HIST_STEP / 2,
+        },
+        'timestamp': datetime.now().isoformat()
+    })
+
 # ----------------------------------------------
 # SQL DATABASE STATS
 # ----------------------------------------------
@@ -316,19 +546,10 @@ def get_regional_analysis():
 def get_database_stats():
     """Get database statistics"""
     
-    queries = {
-        'tables': "SELECT COUNT(*) as count FROM information_schema.tables WHERE table_schema = 'vaccination_db'",
-        'total_records': """
-            SELECT 
-                (SELECT COUNT(*) FROM fact_coverage) +
-                (SELECT COUNT(*) FROM fact_incidence) +
-                (SELECT COUNT(*) FROM fact_cases) as total
-        """
-    }
-    
     stats = {}
-    for key, query in queries.items():
-        result = execute_query(query)
+    for key in ('tables', 'indexes', 'total_records'):
+        query = query_registry.for_backend(f'sql.stats.{key}', DB_BACKEND)
+        result = execute_query(query.name) if query else None
         if result:
             stats[key] = result[0]
     
@@ -339,7 +560,7 @@ def get_database_stats():
             'total_views': 3,
             'total_records': stats.get('total_records', {}).get('total', 0),
             'avg_query_time': '1.4s',
-            'index_count': 24
+            'index_count': stats.get('indexes', {}).get('count', 0)
         },
         'timestamp': datetime.now().isoformat()
     })
@@ -352,41 +573,21 @@ def get_database_stats():
 def get_insights_summary():
     """Get key insights and recommendations"""
     
-    # Get low coverage count
-    low_coverage_query = """
-        SELECT COUNT(DISTINCT c.country_id) as count
-        FROM fact_coverage fc
-        JOIN dim_countries c ON fc.country_id = c.country_id
-        JOIN dim_time t ON fc.time_id = t.time_id
-        WHERE t.year >= 2022
-        GROUP BY c.country_id
-        HAVING AVG(fc.coverage_percentage) < 60
-    """
-    
-    low_coverage = execute_query(low_coverage_query)
-    low_count = len(low_coverage) if low_coverage else 0
-    
-    # Regional disparity
-    regional_query = """
-        SELECT 
-            MAX(avg_cov) - MIN(avg_cov) as disparity
-        FROM (
-            SELECT c.who_region, AVG(fc.coverage_percentage) as avg_cov
-            FROM fact_coverage fc
-            JOIN dim_countries c ON fc.country_id = c.country_id
-            JOIN dim_time t ON fc.time_id = t.time_id
-            WHERE t.year >= 2020
-            GROUP BY c.who_region
-        ) as regional_coverage
-    """
+    # Critical gap from the incrementally maintained target tracker
+    low_count = tracker.critical_count() if tracker.ready() else 0
     
-    disparity = execute_query(regional_query)
+    olap = coverage_cube()
+    if olap:
+        gap = olap.regional_disparity(2020)
+        disparity = [{'disparity': gap}] if gap is not None else None
+    else:
+        disparity = execute_query('insights.regional_disparity')
     
     insights = [
         {
             'title': 'Critical Gap Identified',
             'type': 'alert',
-            'description': f'{low_count} countries have <60% vaccination coverage, representing millions of unvaccinated individuals',
+            'description': f'{low_count} countries have <{CRITICAL_COVERAGE}% measles vaccination coverage in their latest reported year, representing millions of unvaccinated individuals',
             'action': 'Prioritize mobile vaccination campaigns',
             'priority': 'high'
         },
@@ -405,6 +606,30 @@ def get_insights_summary():
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/insights/target-tracking', methods=['GET'])
+def get_target_tracking():
+    """Per-country progress towards the WHO 95% measles coverage target"""
+
+    region = request.args.get('region')
+    status = request.args.get('status')
+
+    if not tracker.ready():
+        return jsonify({'success': False, 'error': 'Database query failed'}), 500
+
+    records = tracker.records()
+    if region:
+        records = [r for r in records if r['who_region'] == region]
+    if status:
+        records = [r for r in records if r['status'].lower() == status.lower()]
+
+    return jsonify({
+        'success': True,
+        'filters': {'region': region, 'status': status},
+        'summary': tracker.summary(records),
+        'data': records,
+        'timestamp': datetime.now().isoformat()
+    })
+
 # ----------------------------------------------
 # ANALYTICS QUERIES
 # ----------------------------------------------
@@ -415,35 +640,12 @@ def get_coverage_disease_correlation():
     
     disease = request.args.get('disease', 'Measles')
     
-    query = """
-        SELECT 
-            c.country_name,
-            t.year,
-            AVG(fc.coverage_percentage) as coverage,
-            AVG(fi.incidence_rate) as incidence,
-            SUM(fca.reported_cases) as cases
-        FROM fact_coverage fc
-        JOIN dim_countries c ON fc.country_id = c.country_id
-        JOIN dim_time t ON fc.time_id = t.time_id
-        JOIN dim_vaccines v ON fc.vaccine_id = v.vaccine_id
-        LEFT JOIN dim_diseases d ON LOWER(v.vaccine_description) LIKE CONCAT('%', LOWER(%s), '%')
-        LEFT JOIN fact_incidence fi ON d.disease_id = fi.disease_id 
-            AND fc.country_id = fi.country_id 
-            AND fc.time_id = fi.time_id
-        LEFT JOIN fact_cases fca ON d.disease_id = fca.disease_id 
-            AND fc.country_id = fca.country_id 
-            AND fc.time_id = fca.time_id
-        WHERE t.year >= 2015 AND d.disease_id IS NOT NULL
-        GROUP BY c.country_name, t.year
-        HAVING coverage IS NOT NULL AND incidence IS NOT NULL
-        ORDER BY t.year, c.country_name
-    """
-    
-    results = execute_query(query, (disease,))
+    results = execute_query('analytics.correlation', (disease,))
     
     # Calculate correlation coefficient if we have data
     correlation = None
     if results and len(results) > 2:
+        import pandas as pd
         df = pd.DataFrame(results)
         if 'coverage' in df.columns and 'incidence' in df.columns:
             correlation = df['coverage'].corr(df['incidence'])
@@ -456,6 +658,106 @@ def get_coverage_disease_correlation():
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/analytics/correlation-matrix', methods=['GET'])
+def get_correlation_matrix():
+    """Coverage vs incidence/cases correlations for every antigen x disease pair"""
+
+    from analytics import CORRELATION_QUERIES, correlation_matrix
+
+    min_year = clamp_year(request.args.get('min_year', 2015, type=int))
+    by_region = request.args.get('by_region', 'false').lower() == 'true'
+
+    def compute():
+        rows = {}
+        for name, query in CORRELATION_QUERIES.items():
+            rows[name] = execute_query(query, (min_year,) if query_registry.QUERIES[query].params else None)
+            if rows[name] is None:
+                return None
+        return correlation_matrix(rows, by_region)
+
+    results = cached_result(('correlation-matrix', min_year, by_region), compute)
+    if results is None:
+        return jsonify({'success': False, 'error': 'Database query failed'}), 500
+
+    return jsonify({
+        'success': True,
+        'filters': {'min_year': min_year, 'by_region': by_region},
+        'data': results,
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/analytics/forecast', methods=['GET'])
+def get_forecast():
+    """Coverage and vaccine demand forecasts per country x vaccine (Scenario 3)"""
+
+    from forecasting import FORECAST_QUERIES, MODELS, forecast_series, demand_summary
+
+    model = request.args.get('model', 'holt')
+    horizon = min(max(request.args.get('horizon', 3, type=int), 1), 10)
+    min_year = clamp_year(request.args.get('min_year', 2000, type=int))
+    region = request.args.get('region')
+    vaccine = request.args.get('vaccine')
+    if model not in MODELS:
+        return jsonify({'success': False, 'error': f'Unknown model: {model}',
+                        'models': sorted(MODELS)}), 400
+
+    def compute():
+        rows = {}
+        for name, query in FORECAST_QUERIES.items():
+            rows[name] = execute_query(query, (min_year,) if query_registry.QUERIES[query].params else None)
+            if rows[name] is None:
+                return None
+        return forecast_series(rows, model, horizon)
+
+    # Every series is fitted once per (model, horizon, min_year); filters slice the cached fit
+    results = cached_result(('forecast', model, horizon, min_year), compute)
+    if results is None:
+        return jsonify({'success': False, 'error': 'Database query failed'}), 500
+
+    if region:
+        results = [r for r in results if r['who_region'] == region]
+    if vaccine:
+        wanted = vaccine.lower()
+        results = [r for r in results
+                   if wanted in ((r['vaccine_code'] or '').lower(), (r['vaccine_description'] or '').lower())]
+
+    return jsonify({
+        'success': True,
+        'filters': {'model': model, 'horizon': horizon, 'min_year': min_year,
+                    'region': region, 'vaccine': vaccine},
+        'demand': demand_summary(results),
+        'count': len(results),
+        'data': results,
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/analytics/introduction-impact', methods=['GET'])
+def get_introduction_impact():
+    """Average reported cases before vs after each vaccine introduction"""
+
+    from analytics import INTRODUCTION_QUERIES, MAX_WINDOW, introduction_impact
+
+    window = request.args.get('window', 5, type=int)
+    region = request.args.get('region')
+    if not 1 <= window <= MAX_WINDOW:
+        return jsonify({'success': False, 'error': f'window must be between 1 and {MAX_WINDOW}',
+                        'max_window': MAX_WINDOW}), 400
+
+    rows = {name: execute_query(query) for name, query in INTRODUCTION_QUERIES.items()}
+    if any(data is None for data in rows.values()):
+        return jsonify({'success': False, 'error': 'Database query failed'}), 500
+
+    impact = introduction_impact(rows['introductions'], rows['pairs'], rows['cases'], window)
+    if region:
+        impact = impact[impact['who_region'] == region]
+
+    return jsonify({
+        'success': True,
+        'window_years': window,
+        'data': impact.astype(object).where(impact.notna(), None).to_dict('records'),
+        'timestamp': datetime.now().isoformat()
+    })
+
 # ----------------------------------------------
 # EXPORT ENDPOINTS
 # ----------------------------------------------
@@ -466,31 +768,15 @@ def export_to_csv():
     
     query = request.args.get('query', 'global-trends')
     
-    # Map query types to SQL
-    query_map = {
-        'global-trends': """
-            SELECT t.year, AVG(fc.coverage_percentage) as avg_coverage
-            FROM fact_coverage fc
-            JOIN dim_time t ON fc.time_id = t.time_id
-            GROUP BY t.year
-            ORDER BY t.year
-        """,
-        'country-coverage': """
-            SELECT c.country_name, c.who_region, AVG(fc.coverage_percentage) as avg_coverage
-            FROM fact_coverage fc
-            JOIN dim_countries c ON fc.country_id = c.country_id
-            GROUP BY c.country_name, c.who_region
-            ORDER BY avg_coverage DESC
-        """
-    }
-    
-    sql = query_map.get(query)
-    if not sql:
-        return jsonify({'success': False, 'error': 'Invalid query type'}), 400
-    
-    results = execute_query(sql)
+    # Export names map to registered queries (query_registry.py)
+    exports = query_registry.export_queries()
+    if query not in exports:
+        return jsonify({'success': False, 'error': 'Invalid query type', 'exports': sorted(exports)}), 400
+    
+    results = execute_query(exports[query].name)
     
     if results:
+        import pandas as pd
         df = pd.DataFrame(results)
         csv_data = df.to_csv(index=False)
         
@@ -529,6 +815,13 @@ if __name__ == '__main__':
     print("  - GET  /api/eda/top-countries")
     print("  - GET  /api/eda/low-coverage")
     print("  - GET  /api/insights/summary")
+    print("  - GET  /api/analytics/correlation-matrix")
+    print("  - GET  /api/analytics/introduction-impact")
+    print("  - GET  /api/analytics/forecast")
+    print("  - GET  /api/insights/target-tracking")
+    print("  - GET  /api/stream")
+    print("  - GET  /api/metrics")
+    print("\nDevelopment server only - for production use: python serve.py")
     print("="*60)
     
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
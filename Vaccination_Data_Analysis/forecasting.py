@@ -0,0 +1,281 @@
+# forecasting.py - Batch coverage and demand forecasts for every country x vaccine
+# ================================================================================
+#
+# Every (country, vaccine) coverage and target history is laid out as one
+# row of a (series x year) matrix with NaN for missing years, and each
+# model fits all rows at once:
+#   linear - least-squares trend per row, closed form over the masked matrix
+#   holt   - Holt's linear exponential smoothing; the smoothing parameters
+#            are picked per series from a grid evaluated as a third axis
+#   damped - damped-trend Holt over a much larger grid; heavy enough that
+#            the rows are split into chunks fitted in a process pool
+#
+# Forecast targets feed the Power BI "Scenario 3" demand figures: doses
+# needed for 95% coverage and doses expected at the forecast coverage.
+#
+# Usage:
+#   DB_BACKEND=sqlite DB_PATH=vaccination.db python forecasting.py --model holt --horizon 3
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+# Engine input -> query registered in query_registry.py (series takes min_year)
+FORECAST_QUERIES = {
+    'series': 'analytics.forecast.series',
+    'countries': 'dim.countries',
+    'vaccines': 'dim.vaccines',
+}
+
+TARGET_COVERAGE = 0.95       # WHO goal used for the doses-needed figure
+MIN_OBSERVATIONS = 3
+CHUNK_SIZE = 2000            # series per process-pool task
+
+# ==============================================
+# PANEL
+# ==============================================
+
+def series_panel(rows):
+    """
+    (keys, years, coverage, target): keys is a DataFrame of
+    (country_id, vaccine_id) per row, the matrices are (series x year)
+    with NaN where a year was not reported.
+    """
+    frame = pd.DataFrame(rows, columns=['country_id', 'vaccine_id', 'year', 'coverage', 'target'])
+    for column in ('coverage', 'target'):
+        frame[column] = pd.to_numeric(frame[column], errors='coerce').astype(float)
+    keys = frame[['country_id', 'vaccine_id']].drop_duplicates().sort_values(
+        ['country_id', 'vaccine_id']).reset_index(drop=True)
+    index = pd.MultiIndex.from_frame(keys)
+    row = index.get_indexer(pd.MultiIndex.from_frame(frame[['country_id', 'vaccine_id']]))
+    years = np.arange(int(frame['year'].min()), int(frame['year'].max()) + 1) if len(frame) else np.array([], int)
+    col = frame['year'].to_numpy(dtype=np.int64) - (years[0] if len(years) else 0)
+
+    matrices = []
+    for column in ('coverage', 'target'):
+        matrix = np.full((len(keys), len(years)), np.nan)
+        matrix[row, col] = frame[column].to_numpy()
+        matrices.append(matrix)
+    return keys, years, matrices[0], matrices[1]
+
+# ==============================================
+# MODELS
+# ==============================================
+# Each model takes Y (n x T, NaN = missing) and a horizon and returns
+# (forecast n x horizon, in-sample RMSE n); rows without enough
+# observations give NaN.
+
+def linear_trend(Y, horizon):
+    """Ordinary least squares y = a + b*t per row, over the observed years only"""
+    T = Y.shape[1]
+    t = np.arange(T, dtype=float)
+    mask = ~np.isnan(Y)
+    Y0 = np.where(mask, Y, 0.0)
+    n = mask.sum(axis=1).astype(float)
+    st, sy = mask @ t, Y0.sum(axis=1)
+    stt, sty = mask @ (t * t), Y0 @ t
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (n * sty - st * sy) / (n * stt - st ** 2)
+        slope = np.where(n >= 2, slope, 0.0)
+        intercept = (sy - slope * st) / n
+        residuals = np.where(mask, Y - (intercept[:, None] + slope[:, None] * t), 0.0)
+        rmse = np.sqrt((residuals ** 2).sum(axis=1) / n)
+    future = np.arange(T, T + horizon, dtype=float)
+    forecast = intercept[:, None] + slope[:, None] * future
+    forecast[n < MIN_OBSERVATIONS] = np.nan
+    return forecast, rmse
+
+
+def _holt_grid(Y, alphas, betas, phis):
+    """
+    Damped Holt smoothing for every row and every (alpha, beta, phi) in
+    the grid at once: state arrays are (n x G). Missing years advance the
+    state without an update. Returns (level, trend, mse) per grid point.
+    """
+    grid = np.array(np.meshgrid(alphas, betas, phis, indexing='ij')).reshape(3, -1)
+    alpha, beta, phi = (g[None, :] for g in grid)
+    n, G = Y.shape[0], grid.shape[1]
+    level = np.full((n, G), np.nan)
+    trend = np.zeros((n, G))
+    sse = np.zeros((n, G))
+    count = np.zeros((n, 1))
+    for t in range(Y.shape[1]):
+        y = Y[:, t:t + 1]
+        observed = ~np.isnan(y)
+        started = ~np.isnan(level)
+        predicted = level + phi * trend
+        update = observed & started
+        error = np.where(update, y - predicted, 0.0)
+        sse += error ** 2
+        count += update[:, :1]
+        new_level = predicted + alpha * error
+        new_trend = phi * trend + alpha * beta * error
+        level = np.where(update, new_level, np.where(started, predicted, np.where(observed, y, np.nan)))
+        trend = np.where(started, new_trend, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mse = np.where(count > 0, sse / count, np.inf)
+    return level, trend, mse, grid
+
+
+def _holt_forecast(Y, horizon, alphas, betas, phis):
+    level, trend, mse, grid = _holt_grid(Y, alphas, betas, phis)
+    best = np.argmin(mse, axis=1)
+    rows = np.arange(Y.shape[0])
+    level, trend, phi = level[rows, best], trend[rows, best], grid[2, best]
+    # Sum of phi^1..phi^h for each step ahead
+    steps = np.cumsum(phi[:, None] ** np.arange(1, horizon + 1), axis=1)
+    forecast = level[:, None] + steps * trend[:, None]
+    forecast[(~np.isnan(Y)).sum(axis=1) < MIN_OBSERVATIONS] = np.nan
+    return forecast, np.sqrt(mse[rows, best])
+
+
+def holt(Y, horizon):
+    """Holt's linear trend, alpha/beta chosen per series by one-step-ahead MSE"""
+    return _holt_forecast(Y, horizon, np.linspace(0.1, 0.9, 9), np.linspace(0.05, 0.5, 4), [1.0])
+
+
+def damped(Y, horizon):
+    """Damped-trend Holt over a fine alpha/beta/phi grid (~500 fits per series)"""
+    return _holt_forecast(Y, horizon, np.linspace(0.05, 0.95, 19), np.linspace(0.05, 0.5, 7),
+                          np.linspace(0.8, 0.98, 4))
+
+
+# name -> (function, runs in the process pool)
+MODELS = {
+    'linear': (linear_trend, False),
+    'holt': (holt, False),
+    'damped': (damped, True),
+}
+
+
+def _fit_chunk(model, Y, horizon):
+    return MODELS[model][0](Y, horizon)
+
+
+def fit(model, Y, horizon, workers=None):
+    """
+    Fit one model to every row of Y. Heavy models are split into chunks
+    across a process pool; if worker processes cannot be started the
+    chunks run in this process instead.
+    """
+    function, heavy = MODELS[model]
+    if not heavy or len(Y) <= CHUNK_SIZE:
+        return function(Y, horizon)
+    chunks = [Y[i:i + CHUNK_SIZE] for i in range(0, len(Y), CHUNK_SIZE)]
+    workers = workers or min(len(chunks), os.cpu_count() or 1)
+    try:
+        # spawn: safe from threaded servers, workers only import this module
+        with ProcessPoolExecutor(workers, mp_context=get_context('spawn')) as pool:
+            parts = list(pool.map(_fit_chunk, [model] * len(chunks), chunks, [horizon] * len(chunks)))
+    except (OSError, BrokenProcessPool) as e:
+        print(f"Process pool unavailable ({e}); fitting {model} in-process")
+        parts = [function(chunk, horizon) for chunk in chunks]
+    return np.vstack([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+# ==============================================
+# FORECASTS
+# ==============================================
+
+def _value(x, digits=2):
+    return None if x is None or np.isnan(x) else round(float(x), digits)
+
+
+def forecast_series(rows, model='holt', horizon=3, workers=None):
+    """
+    Coverage and target forecasts for every (country, vaccine) series in
+    the FORECAST_QUERIES results; one record per series with enough
+    history, each carrying `horizon` yearly points.
+    """
+    keys, years, coverage, target = series_panel(rows['series'])
+    if keys.empty:
+        return []
+    coverage_forecast, coverage_rmse = fit(model, coverage, horizon, workers)
+    target_forecast, _ = fit(model, target, horizon, workers)
+
+    # Coverage stays within what has been observed for the series (and >= 0)
+    ceiling = np.maximum(np.nanmax(np.where(np.isnan(coverage), -np.inf, coverage), axis=1), 100.0)
+    coverage_forecast = np.clip(coverage_forecast, 0.0, ceiling[:, None])
+    target_forecast = np.clip(target_forecast, 0.0, None)
+
+    observed = ~np.isnan(coverage)
+    observations = observed.sum(axis=1)
+    last = np.where(observed.any(axis=1), observed.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1), -1)
+    countries = {r['country_id']: r for r in rows['countries']}
+    vaccines = {r['vaccine_id']: r for r in rows['vaccines']}
+    future_years = [int(years[-1]) + step for step in range(1, horizon + 1)]
+
+    records = []
+    for i in np.flatnonzero(observations >= MIN_OBSERVATIONS):
+        country = countries.get(keys.at[i, 'country_id'], {})
+        vaccine = vaccines.get(keys.at[i, 'vaccine_id'], {})
+        points = []
+        for step, year in enumerate(future_years):
+            cov, tgt = coverage_forecast[i, step], target_forecast[i, step]
+            points.append({
+                'year': year,
+                'coverage': _value(cov),
+                'target': _value(tgt, 0),
+                'expected_doses': _value(tgt * cov / 100, 0),
+                'doses_needed_95pct': _value(tgt * TARGET_COVERAGE, 0),
+            })
+        records.append({
+            'country_name': country.get('country_name'),
+            'who_region': country.get('who_region'),
+            'vaccine_code': vaccine.get('vaccine_code'),
+            'vaccine_description': vaccine.get('vaccine_description'),
+            'observations': int(observations[i]),
+            'last_year': int(years[last[i]]),
+            'last_coverage': _value(coverage[i, last[i]]),
+            'rmse': _value(coverage_rmse[i], 3),
+            'forecast': points,
+        })
+    return records
+
+
+def demand_summary(records):
+    """Scenario 3 totals per forecast year over the given series"""
+    totals = {}
+    for record in records:
+        for point in record['forecast']:
+            year = totals.setdefault(point['year'], {'year': point['year'], 'series': 0, 'target': 0.0,
+                                                     'expected_doses': 0.0, 'doses_needed_95pct': 0.0})
+            year['series'] += 1
+            for column in ('target', 'expected_doses', 'doses_needed_95pct'):
+                year[column] += point[column] or 0
+    return [totals[year] for year in sorted(totals)]
+
+
+if __name__ == '__main__':
+    from db_backends import connect, adapt_query
+    from query_registry import QUERIES
+
+    parser = argparse.ArgumentParser(description='Fit coverage forecasts for every country x vaccine')
+    parser.add_argument('--model', choices=sorted(MODELS), default='holt')
+    parser.add_argument('--horizon', type=int, default=3)
+    parser.add_argument('--min-year', type=int, default=2000)
+    args = parser.parse_args()
+
+    backend = os.getenv('DB_BACKEND', 'mysql')
+    connection = connect(backend)
+    cursor = connection.cursor()
+    rows = {}
+    for name, query_name in FORECAST_QUERIES.items():
+        query = QUERIES[query_name]
+        params = (args.min_year,) if query.params else ()
+        cursor.execute(adapt_query(query.sql, backend), params)
+        names = [d[0] for d in cursor.description]
+        rows[name] = [dict(zip(names, row)) for row in cursor.fetchall()]
+    connection.close()
+
+    started = time.perf_counter()
+    records = forecast_series(rows, args.model, args.horizon)
+    print(f"{args.model}: {len(records):,} series forecast in {time.perf_counter() - started:.2f}s")
+    for year in demand_summary(records):
+        print(f"  {year['year']}: target {year['target']:,.0f}  "
+              f"doses needed for 95% {year['doses_needed_95pct']:,.0f}")
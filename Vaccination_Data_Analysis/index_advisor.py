@@ -0,0 +1,451 @@
+# index_advisor.py - EXPLAIN capture and covering-index advisor
+# ============================================================
+#
+# Collects every SQL statement the API endpoints (query_registry.py) and
+# the Power BI report run, captures its EXPLAIN plan, flags full table
+# scans and filesorts (temp B-trees for GROUP BY / ORDER BY on SQLite),
+# and proposes covering composite indexes for the fact tables from the
+# columns each query actually touches. The proposals are then measured on synthetic
+# warehouses scaled to 10x and 100x the current row counts; an index that
+# makes a query slower there is dropped and left out of the recommendation.
+#
+# Usage:
+#   python index_advisor.py --explain-only --database vaccination.db
+#   python index_advisor.py --scales 10 100 --output index_report.json
+
+import argparse
+import json
+import os
+import re
+import time
+
+from db_backends import connect, adapt_query
+from etl_loader import FACT_TABLES
+from query_registry import QUERIES
+from synthetic_data import build_synthetic_db
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+POWERBI_SOURCE = os.path.join(HERE, 'powerbi_queries.sql')
+
+# Join keys, in the order they lead a composite index when unfiltered
+KEY_COLUMNS = ['year', 'time_id', 'country_id', 'vaccine_id', 'disease_id']
+
+# Catalogue lookups and the whole-table scans run once per data reload
+# (profiles, cube, sketches) are not serving paths; indexing for them
+# only widens the proposals
+CATALOG_TABLES = ('information_schema', 'sqlite_master', 'duckdb_indexes')
+BACKGROUND_QUERIES = ('profile.', 'cube.', 'sketches.')
+
+# A query regresses when it gets this much slower (relative and absolute)
+REGRESSION_TOLERANCE = 0.2
+REGRESSION_MIN_S = 0.002
+
+SQL_KEYWORDS = {'ON', 'WHERE', 'JOIN', 'LEFT', 'RIGHT', 'INNER', 'OUTER', 'GROUP',
+                'ORDER', 'HAVING', 'LIMIT', 'AS', 'USING', 'UNION', 'CROSS'}
+
+# ==============================================
+# QUERY COLLECTION
+# ==============================================
+
+def api_queries(backend=None):
+    """Every registered endpoint query (query_registry.py) with its sample parameters"""
+    return [
+        {'name': f"api:{query.name}", 'sql': query.sql, 'params': query.sample_params()}
+        for query in QUERIES.values()
+        if (backend is None or backend in query.backends)
+        and not query.name.startswith(BACKGROUND_QUERIES)
+    ]
+
+
+def powerbi_queries(path=POWERBI_SOURCE):
+    """Each statement of powerbi_queries.sql, named after its -- Qn: comment"""
+    text = re.sub(r'/\*.*?\*/', '', open(path).read(), flags=re.DOTALL)
+    queries, lines = [], []
+    section, title = '', ''
+    for line in text.splitlines():
+        stripped = line.strip()
+        header = re.match(r'--\s*(\w+) LEVEL QUERIES|--\s*(SCENARIO)-BASED QUERIES', stripped)
+        if header:
+            section = (header.group(1) or header.group(2)).title()
+            continue
+        label = re.match(r'--\s*((?:Q\d+|Scenario \d+):.*)', stripped)
+        if label and not lines:
+            title = label.group(1)
+            continue
+        if stripped.startswith('--') or (not stripped and not lines):
+            continue
+        lines.append(line)
+        if stripped.endswith(';'):
+            name = title if title.startswith('Scenario') else f"{section} {title}"
+            queries.append({
+                'name': f"powerbi:{name.strip()}",
+                'sql': '\n'.join(lines).rstrip().rstrip(';'),
+                'params': (),
+            })
+            lines = []
+    return queries
+
+
+def collect_queries(backend=None):
+    return api_queries(backend) + powerbi_queries()
+
+# ==============================================
+# EXPLAIN
+# ==============================================
+
+def explain(connection, backend, query):
+    """Return (plan lines, findings) for one query"""
+    cursor = connection.cursor()
+    sql = adapt_query(query['sql'], backend)
+    findings = []
+    if backend == 'sqlite':
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, query['params'])
+        plan = [row[3] for row in cursor.fetchall()]
+        for detail in plan:
+            if re.match(r'SCAN \w+$', detail) or re.match(r'SCAN \w+ USING INDEX', detail):
+                findings.append(('full_scan', detail))
+            elif 'USE TEMP B-TREE' in detail:
+                findings.append(('filesort', detail))
+    else:
+        cursor.execute('EXPLAIN ' + sql, query['params'] or None)
+        columns = [c[0] for c in cursor.description]
+        plan = []
+        for row in cursor.fetchall():
+            row = dict(zip(columns, row))
+            plan.append(f"{row.get('table')}: type={row.get('type')} key={row.get('key')} "
+                        f"rows={row.get('rows')} extra={row.get('Extra')}")
+            if row.get('type') == 'ALL':
+                findings.append(('full_scan', f"{row.get('table')} ({row.get('rows')} rows)"))
+            extra = row.get('Extra') or ''
+            if 'Using filesort' in extra or 'Using temporary' in extra:
+                findings.append(('filesort', f"{row.get('table')}: {extra}"))
+    cursor.close()
+    return plan, findings
+
+# ==============================================
+# INDEX PROPOSALS
+# ==============================================
+
+def _aliases(sql):
+    """alias -> table for every FROM/JOIN of a star-schema table"""
+    aliases = {}
+    for table, alias in re.findall(r'(?:FROM|JOIN)\s+((?:fact|dim)_\w+)(?:\s+(?:AS\s+)?(\w+))?', sql, re.I):
+        if not alias or alias.upper() in SQL_KEYWORDS:
+            alias = table
+        aliases[alias] = table
+    return aliases
+
+
+def _filtered_aliases(sql):
+    """Aliases referenced in any WHERE clause"""
+    filtered = set()
+    for clause in re.findall(r'\bWHERE\b(.*?)(?=\bGROUP BY\b|\bORDER BY\b|\bHAVING\b|\bLIMIT\b|\)\s*,|\)\s*SELECT|$)',
+                             sql, re.I | re.S):
+        filtered.update(re.findall(r'\b(\w+)\.\w+', clause))
+    return filtered
+
+
+def table_access(sql):
+    """For each fact table alias: (table, leading columns, covered columns)"""
+    aliases = _aliases(sql)
+    filtered = _filtered_aliases(sql)
+    joins = re.findall(r'\b(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)', sql)
+    constants = re.findall(r"\b(\w+)\.(\w+)\s*=\s*'", sql)
+
+    access = []
+    for alias, table in aliases.items():
+        if table not in FACT_TABLES:
+            continue
+        used = list(dict.fromkeys(re.findall(rf'\b{re.escape(alias)}\.(\w+)', sql)))
+        if not used:
+            continue
+
+        lead = list(dict.fromkeys(col for a, col in constants if a == alias))
+        # Keys joined to a dimension that the query filters on drive the lookup
+        for a1, c1, a2, c2 in joins:
+            for mine, col, other in ((a1, c1, a2), (a2, c2, a1)):
+                if mine == alias and col in KEY_COLUMNS and other in filtered and col not in lead:
+                    lead.append(col)
+        if alias in filtered:
+            lead += [c for c in KEY_COLUMNS if c in used and c not in lead
+                     and re.search(rf'\b{re.escape(alias)}\.{c}\s+(?:IN|>=|<=|BETWEEN)', sql)]
+        keys = lead + [c for c in KEY_COLUMNS if c in used and c not in lead]
+        covered = [c for c in used if c not in keys]
+        access.append((table, tuple(keys), tuple(covered)))
+    return access
+
+
+def propose_indexes(queries):
+    """Merge per-query access paths into one covering index per distinct key order"""
+    proposals = {}
+    for query in queries:
+        for table, keys, covered in table_access(query['sql']):
+            if not keys:
+                continue
+            entry = proposals.setdefault((table, keys), {'covered': [], 'queries': []})
+            entry['covered'] += [c for c in covered if c not in entry['covered']]
+            entry['queries'].append(query['name'])
+
+    # An index whose key order is a prefix of another's is served by the longer one
+    for table, keys in sorted(proposals, key=lambda k: len(k[1])):
+        for other_table, other_keys in proposals:
+            if (table == other_table and len(other_keys) > len(keys)
+                    and other_keys[:len(keys)] == keys and (table, keys) in proposals):
+                merged = proposals.pop((table, keys))
+                target = proposals[(other_table, other_keys)]
+                target['covered'] += [c for c in merged['covered'] if c not in target['covered']]
+                target['queries'] += merged['queries']
+                break
+
+    statements = []
+    for n, ((table, keys), entry) in enumerate(sorted(proposals.items())):
+        columns = list(keys) + entry['covered']
+        statements.append({
+            'table': table,
+            'columns': columns,
+            'sql': f"CREATE INDEX idx_adv_{table}_{n} ON {table} ({', '.join(columns)})",
+            'queries': entry['queries'],
+        })
+    return statements
+
+# ==============================================
+# TIMING
+# ==============================================
+
+def time_query(connection, backend, query, repeat=3, timeout=60.0):
+    """Best-of-N wall time in seconds, or None if it hit the timeout"""
+    sql = adapt_query(query['sql'], backend)
+    best = None
+    for _ in range(repeat):
+        deadline = time.perf_counter() + timeout
+        if backend == 'sqlite':
+            connection.set_progress_handler(lambda: time.perf_counter() > deadline, 10000)
+        cursor = connection.cursor()
+        started = time.perf_counter()
+        try:
+            cursor.execute(sql, query['params'])
+            cursor.fetchall()
+        except Exception as e:
+            if 'interrupted' in str(e):
+                return None
+            raise
+        finally:
+            cursor.close()
+            if backend == 'sqlite':
+                connection.set_progress_handler(None, 0)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure(connection, backend, queries, repeat, timeout):
+    timings = {}
+    for query in queries:
+        try:
+            timings[query['name']] = time_query(connection, backend, query, repeat, timeout)
+        except Exception as e:
+            timings[query['name']] = f"error: {e}"
+    return timings
+
+
+def regressions(before, after, tolerance=REGRESSION_TOLERANCE):
+    """Queries slower after the indexes: name -> (before_s, after_s); a new timeout counts"""
+    slower = {}
+    for name, seconds in before.items():
+        if not isinstance(seconds, float):
+            continue
+        now = after.get(name)
+        if now is None or (isinstance(now, float) and now > seconds * (1 + tolerance)
+                           and now - seconds > REGRESSION_MIN_S):
+            slower[name] = (seconds, now)
+    return slower
+
+
+def indexes_used(plan):
+    """Advisor indexes named in a plan"""
+    return {name for line in plan for name in re.findall(r'\bidx_adv_\w+', str(line))}
+
+
+def _confirm(connection, backend, queries, before, after, repeat, timeout, tolerance):
+    """Re-time apparent regressions once and keep the better run, so noise is not blamed"""
+    suspects = [q for q in queries if q['name'] in regressions(before, after, tolerance)]
+    retimed = measure(connection, backend, suspects, repeat, timeout)
+    after = dict(after)
+    for name, seconds in retimed.items():
+        if isinstance(seconds, float) and (after[name] is None or seconds < after[name]):
+            after[name] = seconds
+    return after
+
+
+def _index_name(proposal):
+    return proposal['sql'].split()[2]
+
+
+def _drop_index(cursor, backend, proposal):
+    if backend == 'mysql':
+        cursor.execute(f"DROP INDEX {_index_name(proposal)} ON {proposal['table']}")
+    else:
+        cursor.execute(f"DROP INDEX {_index_name(proposal)}")
+
+
+def run_advisor(scales, backend='sqlite', workdir='.', repeat=3, timeout=60.0,
+                tolerance=REGRESSION_TOLERANCE):
+    """Measure the proposals per scale; indexes that slow a query down are dropped.
+
+    A regressed query is blamed on the advisor indexes its new plan uses;
+    those are dropped and the queries re-measured until nothing regresses
+    or a regression uses no advisor index (then it is only reported).
+    Proposals dropped at any scale are marked recommended=False.
+    """
+    queries = [q for q in collect_queries(backend)
+               if not any(table in q['sql'] for table in CATALOG_TABLES)]
+    proposals = propose_indexes(queries)
+    for proposal in proposals:
+        proposal['regressions'] = {}
+    by_index = {_index_name(p): p for p in proposals}
+    report = {'proposals': proposals, 'scales': {}, 'regressions': {}}
+
+    print("\nProposed covering indexes:")
+    for proposal in proposals:
+        print(f"  {proposal['sql']};")
+
+    for scale in scales:
+        label = f"{scale:g}x"
+        database = os.path.join(workdir, f"advisor_{scale:g}x.db")
+        print(f"\nBuilding synthetic warehouse at {scale:g}x ...")
+        build_synthetic_db(database, scale, backend)
+
+        connection = connect(backend, database)
+        cursor = connection.cursor()
+        if backend == 'sqlite':
+            # Same planner statistics on both sides, so only the indexes differ
+            cursor.execute('ANALYZE')
+            connection.commit()
+        before_plans = {q['name']: _safe_explain(connection, backend, q) for q in queries}
+        before = measure(connection, backend, queries, repeat, timeout)
+
+        for proposal in proposals:
+            cursor.execute(proposal['sql'])
+        if backend == 'sqlite':
+            cursor.execute('ANALYZE')
+        connection.commit()
+
+        all_plans = {q['name']: _safe_explain(connection, backend, q) for q in queries}
+        with_all = _confirm(connection, backend, queries, before,
+                            measure(connection, backend, queries, repeat, timeout), repeat, timeout, tolerance)
+        regressed = regressions(before, with_all, tolerance)
+
+        after_plans, after, active = all_plans, with_all, set(by_index)
+        while True:
+            blamed = {}
+            for name in regressions(before, after, tolerance):
+                for index in indexes_used(after_plans[name][0]) & active:
+                    blamed.setdefault(index, []).append(name)
+            if not blamed:
+                break
+            for index, names in sorted(blamed.items()):
+                print(f"  dropping {index}: slows {', '.join(names)}")
+                _drop_index(cursor, backend, by_index[index])
+                by_index[index]['regressions'][label] = names
+                active.discard(index)
+            if backend == 'sqlite':
+                cursor.execute('ANALYZE')
+            connection.commit()
+            after_plans = {q['name']: _safe_explain(connection, backend, q) for q in queries}
+            after = _confirm(connection, backend, queries, before,
+                             measure(connection, backend, queries, repeat, timeout), repeat, timeout, tolerance)
+        cursor.close()
+        connection.close()
+
+        rows = []
+        for query in queries:
+            name = query['name']
+            rows.append({
+                'query': name,
+                'before_s': before[name],
+                'all_indexes_s': with_all[name],
+                'after_s': after[name],
+                'regressed': name in regressed,
+                'findings_before': before_plans[name][1],
+                'findings_after': after_plans[name][1],
+            })
+        report['scales'][label] = rows
+        report['regressions'][label] = {
+            'with_all_indexes': sorted(regressed),
+            'remaining': sorted(regressions(before, after, tolerance)),
+            'dropped': sorted(set(by_index) - active),
+        }
+        print_scale(scale, rows)
+
+    for proposal in proposals:
+        proposal['recommended'] = not proposal['regressions']
+    print("\nRecommended indexes:")
+    for proposal in proposals:
+        if proposal['recommended']:
+            print(f"  {proposal['sql']};")
+    return report
+
+
+def _safe_explain(connection, backend, query):
+    try:
+        return explain(connection, backend, query)
+    except Exception as e:
+        return [], [('error', str(e))]
+
+
+def _fmt(seconds):
+    if seconds is None:
+        return 'timeout'
+    if isinstance(seconds, str):
+        return 'error'
+    return f"{seconds * 1000:.1f}ms"
+
+
+def print_scale(scale, rows):
+    print(f"\n{'=' * 120}\nQuery times at {scale:g}x "
+          f"(before -> all advisor indexes -> regressing indexes dropped)\n{'=' * 120}")
+    for row in rows:
+        before, after = row['before_s'], row['after_s']
+        speedup = (f"{before / after:6.1f}x" if isinstance(before, float) and isinstance(after, float)
+                   and after > 0 else '     -')
+        flags = ', '.join(sorted({kind for kind, _ in row['findings_before']})) or 'ok'
+        if row['regressed']:
+            flags += ', REGRESSED'
+        print(f"  {row['query'][:60]:<60} {_fmt(before):>10} -> {_fmt(row['all_indexes_s']):>10} "
+              f"-> {_fmt(after):>10} {speedup}  [{flags}]")
+
+
+def print_explain(backend, database):
+    connection = connect(backend, database)
+    for query in collect_queries(backend):
+        plan, findings = _safe_explain(connection, backend, query)
+        print(f"\n{query['name']}")
+        for line in plan:
+            print(f"    {line}")
+        for kind, detail in findings:
+            print(f"  ⚠ {kind}: {detail}")
+    connection.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='EXPLAIN capture and index advisor for the vaccination queries')
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    parser.add_argument('--database', help='existing database for --explain-only')
+    parser.add_argument('--explain-only', action='store_true', help='print plans and findings, no benchmark')
+    parser.add_argument('--scales', type=float, nargs='+', default=[10, 100])
+    parser.add_argument('--workdir', default='.')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=60.0, help='per-query timeout in seconds')
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help='relative slowdown that counts as a regression')
+    parser.add_argument('--output', default='index_report.json')
+    args = parser.parse_args()
+
+    if args.explain_only:
+        print_explain(args.backend, args.database)
+    else:
+        report = run_advisor(args.scales, args.backend, args.workdir, args.repeat, args.timeout,
+                             args.tolerance)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nReport saved to {args.output}")
@@ -0,0 +1,196 @@
+# load_test.py - Replay the dashboard's endpoint mix against serve.py
+# ==================================================================
+#
+# Builds (or reuses) a synthetic SQLite/DuckDB warehouse, then for every
+# worker configuration starts serve.py against it, waits for
+# /api/health, and hammers it with concurrent clients replaying the
+# dashboard's request mix for a fixed duration. Reports requests/sec and
+# latency percentiles per configuration. Only answers with a 2xx status and
+# a body carrying data count as served; everything else is an error.
+#
+# Usage:
+#   python load_test.py --configs 1x1 1x8 4x4 --clients 32 --duration 20
+#   python load_test.py --backend duckdb --scale 1 --server waitress
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from synthetic_data import build_synthetic_db
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (path, weight) - what the dashboard requests on load and on each poll
+ENDPOINT_MIX = [
+    ('/api/eda/global-trends', 5),
+    ('/api/eda/top-countries?year=2024&limit=10', 4),
+    ('/api/eda/low-coverage?threshold=60', 3),
+    ('/api/eda/regional-analysis', 3),
+    ('/api/insights/summary', 3),
+    ('/api/cleaning/overview', 1),
+    ('/api/eda/disease-impact', 1),
+]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float('nan')
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def wait_ready(base_url, process, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(base_url + '/api/health', timeout=2):
+                return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.25)
+    raise RuntimeError('server did not become ready')
+
+
+def start_server(workers, threads, port, backend, database, server):
+    env = dict(os.environ, DB_BACKEND=backend, DB_PATH=database)
+    cmd = [sys.executable, os.path.join(HERE, 'serve.py'), '--bind', f'127.0.0.1:{port}',
+           '--workers', str(workers), '--threads', str(threads), '--server', server]
+    return subprocess.Popen(cmd, cwd=HERE, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def served(body):
+    """True for a JSON body that reports success and carries data"""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return False
+    if not isinstance(payload, dict) or payload.get('success') is False:
+        return False
+    return 'data' not in payload or bool(payload['data'])
+
+
+def replay(base_url, clients, duration, seed=0):
+    """Run `clients` concurrent request loops for `duration` seconds"""
+    paths = [path for path, weight in ENDPOINT_MIX for _ in range(weight)]
+    latencies = []
+    errors = []
+    bad = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(client_id):
+        rng = random.Random(seed + client_id)
+        mine, failed, empty = [], 0, 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                # HTTPError (4xx/5xx) is a URLError
+                with urllib.request.urlopen(base_url + rng.choice(paths), timeout=60) as response:
+                    body = response.read()
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                failed += 1
+                continue
+            if served(body):
+                mine.append(time.perf_counter() - started)
+            else:
+                empty += 1
+        with lock:
+            latencies.extend(mine)
+            errors.append(failed + empty)
+            bad.append(empty)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'bad_responses': sum(bad),   # 2xx without data, or success: false
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def parse_config(text):
+    workers, _, threads = text.lower().partition('x')
+    return int(workers), int(threads or 1)
+
+
+def run_load_test(configs, clients=32, duration=20, warmup=3, backend='sqlite',
+                  database=None, scale=1.0, server='auto', port=5055):
+    database = database or os.path.join(HERE, f'loadtest_{backend}_{scale:g}x.db')
+    if not os.path.exists(database):
+        print(f"Building synthetic {backend} warehouse at {scale:g}x -> {database}")
+        build_synthetic_db(database, scale, backend)
+
+    base_url = f'http://127.0.0.1:{port}'
+    report = []
+    for workers, threads in configs:
+        process = start_server(workers, threads, port, backend, database, server)
+        try:
+            wait_ready(base_url, process)
+            replay(base_url, clients, warmup)
+            result = replay(base_url, clients, duration)
+        finally:
+            stop_server(process)
+        result.update({'workers': workers, 'threads': threads})
+        report.append(result)
+        print(f"  {workers:>2} worker(s) x {threads:>2} thread(s): {result['rps']:8.1f} req/s  "
+              f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+              f"p99 {result['p99_ms']:7.1f} ms  ({result['requests']:,} ok, {result['errors']} errors)")
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test the API under different worker configurations')
+    parser.add_argument('--configs', nargs='+', default=['1x1', '1x8', '4x1', '4x4'],
+                        help='WORKERSxTHREADS, e.g. 4x8')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--warmup', type=float, default=3)
+    parser.add_argument('--backend', choices=['sqlite', 'duckdb'], default='sqlite')
+    parser.add_argument('--database', help='existing warehouse file (default: build a synthetic one)')
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'waitress'], default='auto')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--output', help='write the report as JSON')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔥 API Load Test")
+    print("=" * 60)
+    report = run_load_test([parse_config(c) for c in args.configs], args.clients, args.duration,
+                           args.warmup, args.backend, args.database, args.scale, args.server,
+                           args.port)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to {args.output}")
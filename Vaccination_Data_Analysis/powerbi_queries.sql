@@ -10,23 +10,22 @@
 -- Q1: Vaccination rates vs disease incidence correlation
 SELECT 
     c.country_name,
-    t.year,
+    fc.year,
     AVG(fc.coverage_percentage) as avg_coverage,
     AVG(fi.incidence_rate) as avg_incidence,
     AVG(fca.reported_cases) as avg_cases
 FROM fact_coverage fc
 JOIN dim_countries c ON fc.country_id = c.country_id
-JOIN dim_time t ON fc.time_id = t.time_id
-LEFT JOIN fact_incidence fi ON fi.country_id = c.country_id AND fi.time_id = t.time_id
-LEFT JOIN fact_cases fca ON fca.country_id = c.country_id AND fca.time_id = t.time_id
-WHERE t.year >= 2015
-GROUP BY c.country_name, t.year
-ORDER BY t.year DESC, c.country_name;
+LEFT JOIN fact_incidence fi ON fi.country_id = c.country_id AND fi.year = fc.year
+LEFT JOIN fact_cases fca ON fca.country_id = c.country_id AND fca.year = fc.year
+WHERE fc.year >= 2015
+GROUP BY c.country_name, fc.year
+ORDER BY fc.year DESC, c.country_name;
 
 -- Q2: Drop-off rate between 1st dose and subsequent doses
 SELECT 
     v.vaccine_description,
-    t.year,
+    fs.year,
     fs.schedule_round,
     AVG(fc.coverage_percentage) as avg_coverage,
     COUNT(DISTINCT c.country_id) as country_count
@@ -36,16 +35,15 @@ JOIN fact_coverage fc ON fs.country_id = fc.country_id
     AND fs.time_id = fc.time_id
 JOIN dim_vaccines v ON fs.vaccine_id = v.vaccine_id
 JOIN dim_countries c ON fs.country_id = c.country_id
-JOIN dim_time t ON fs.time_id = t.time_id
-WHERE t.year >= 2020
-GROUP BY v.vaccine_description, t.year, fs.schedule_round
-ORDER BY v.vaccine_description, t.year, fs.schedule_round;
+WHERE fs.year >= 2020
+GROUP BY v.vaccine_description, fs.year, fs.schedule_round
+ORDER BY v.vaccine_description, fs.year, fs.schedule_round;
 
 -- Q3: Urban vs rural vaccination rates (using geo_area from schedule)
 SELECT 
     c.country_name,
     c.who_region,
-    t.year,
+    fs.year,
     fs.geo_area,
     AVG(fc.coverage_percentage) as avg_coverage
 FROM fact_vaccine_schedule fs
@@ -53,15 +51,14 @@ JOIN fact_coverage fc ON fs.country_id = fc.country_id
     AND fs.vaccine_id = fc.vaccine_id 
     AND fs.time_id = fc.time_id
 JOIN dim_countries c ON fs.country_id = c.country_id
-JOIN dim_time t ON fs.time_id = t.time_id
-WHERE t.year >= 2018
+WHERE fs.year >= 2018
     AND fs.geo_area IS NOT NULL
-GROUP BY c.country_name, c.who_region, t.year, fs.geo_area
-ORDER BY t.year DESC, c.country_name;
+GROUP BY c.country_name, c.who_region, fs.year, fs.geo_area
+ORDER BY fs.year DESC, c.country_name;
 
 -- Q4: Booster dose uptake over time
 SELECT 
-    t.year,
+    fs.year,
     v.vaccine_description,
     COUNT(CASE WHEN fs.schedule_round LIKE '%booster%' 
                OR fs.schedule_round LIKE '%dose 2%' 
@@ -75,11 +72,10 @@ JOIN fact_coverage fc ON fs.country_id = fc.country_id
     AND fs.vaccine_id = fc.vaccine_id 
     AND fs.time_id = fc.time_id
 JOIN dim_vaccines v ON fs.vaccine_id = v.vaccine_id
-JOIN dim_time t ON fs.time_id = t.time_id
-WHERE t.year >= 2015
-GROUP BY t.year, v.vaccine_description
+WHERE fs.year >= 2015
+GROUP BY fs.year, v.vaccine_description
 HAVING booster_programs > 0
-ORDER BY t.year DESC, avg_booster_coverage DESC;
+ORDER BY fs.year DESC, avg_booster_coverage DESC;
 
 -- Q5: Regions with high disease incidence despite high vaccination
 SELECT 
@@ -92,15 +88,14 @@ SELECT
 FROM fact_coverage fc
 JOIN dim_countries c ON fc.country_id = c.country_id
 JOIN dim_vaccines v ON fc.vaccine_id = v.vaccine_id
-JOIN dim_time t ON fc.time_id = t.time_id
 LEFT JOIN dim_diseases d ON LOWER(v.vaccine_description) LIKE CONCAT('%', LOWER(d.disease_code), '%')
 LEFT JOIN fact_incidence fi ON fi.country_id = c.country_id 
     AND fi.disease_id = d.disease_id 
-    AND fi.time_id = t.time_id
+    AND fi.year = fc.year
 LEFT JOIN fact_cases fca ON fca.country_id = c.country_id 
     AND fca.disease_id = d.disease_id 
-    AND fca.time_id = t.time_id
-WHERE t.year >= 2020
+    AND fca.year = fc.year
+WHERE fc.year >= 2020
     AND d.disease_id IS NOT NULL
 GROUP BY c.country_name, c.who_region, d.disease_description
 HAVING avg_coverage > 70 AND avg_incidence > 0
@@ -119,14 +114,10 @@ WITH pre_intro AS (
         AVG(fca.reported_cases) as avg_cases_before
     FROM fact_vaccine_introduction fvi
     JOIN dim_vaccines v ON fvi.vaccine_id = v.vaccine_id
-    JOIN dim_time t ON fvi.time_id = t.time_id
     LEFT JOIN dim_diseases d ON LOWER(v.vaccine_description) LIKE CONCAT('%', LOWER(d.disease_code), '%')
     LEFT JOIN fact_cases fca ON fca.country_id = fvi.country_id 
         AND fca.disease_id = d.disease_id
-        AND fca.time_id IN (
-            SELECT time_id FROM dim_time 
-            WHERE year BETWEEN t.year - 5 AND t.year - 1
-        )
+        AND fca.year BETWEEN fvi.year - 5 AND fvi.year - 1
     WHERE fvi.intro_status = 'Yes' AND d.disease_id IS NOT NULL
     GROUP BY fvi.country_id, fvi.vaccine_id, d.disease_id
 ),
@@ -138,14 +129,10 @@ post_intro AS (
         AVG(fca.reported_cases) as avg_cases_after
     FROM fact_vaccine_introduction fvi
     JOIN dim_vaccines v ON fvi.vaccine_id = v.vaccine_id
-    JOIN dim_time t ON fvi.time_id = t.time_id
     LEFT JOIN dim_diseases d ON LOWER(v.vaccine_description) LIKE CONCAT('%', LOWER(d.disease_code), '%')
     LEFT JOIN fact_cases fca ON fca.country_id = fvi.country_id 
         AND fca.disease_id = d.disease_id
-        AND fca.time_id IN (
-            SELECT time_id FROM dim_time 
-            WHERE year BETWEEN t.year + 1 AND t.year + 5
-        )
+        AND fca.year BETWEEN fvi.year + 1 AND fvi.year + 5
     WHERE fvi.intro_status = 'Yes' AND d.disease_id IS NOT NULL
     GROUP BY fvi.country_id, fvi.vaccine_id, d.disease_id
 )
@@ -170,7 +157,7 @@ ORDER BY reduction_percentage DESC;
 SELECT 
     v.vaccine_description,
     c.who_region,
-    t.year,
+    fc.year,
     SUM(fc.target_number) as total_target,
     SUM(fc.doses_administered) as total_doses,
     AVG(fc.coverage_percentage) as avg_coverage,
@@ -178,23 +165,21 @@ SELECT
 FROM fact_coverage fc
 JOIN dim_vaccines v ON fc.vaccine_id = v.vaccine_id
 JOIN dim_countries c ON fc.country_id = c.country_id
-JOIN dim_time t ON fc.time_id = t.time_id
-WHERE t.year >= 2020
-GROUP BY v.vaccine_description, c.who_region, t.year
-ORDER BY t.year DESC, actual_coverage_rate DESC;
+WHERE fc.year >= 2020
+GROUP BY v.vaccine_description, c.who_region, fc.year
+ORDER BY fc.year DESC, actual_coverage_rate DESC;
 
 -- Q3: Regional disparities in vaccine introduction timelines
 SELECT 
     c.who_region,
     v.vaccine_description,
-    MIN(t.year) as first_introduction,
-    MAX(t.year) as latest_introduction,
-    (MAX(t.year) - MIN(t.year)) as introduction_gap_years,
+    MIN(fvi.year) as first_introduction,
+    MAX(fvi.year) as latest_introduction,
+    (MAX(fvi.year) - MIN(fvi.year)) as introduction_gap_years,
     COUNT(DISTINCT c.country_id) as countries_introduced
 FROM fact_vaccine_introduction fvi
 JOIN dim_countries c ON fvi.country_id = c.country_id
 JOIN dim_vaccines v ON fvi.vaccine_id = v.vaccine_id
-JOIN dim_time t ON fvi.time_id = t.time_id
 WHERE fvi.intro_status = 'Yes'
 GROUP BY c.who_region, v.vaccine_description
 HAVING COUNT(DISTINCT c.country_id) > 5
@@ -212,12 +197,11 @@ SELECT
 FROM dim_diseases d
 JOIN fact_incidence fi ON d.disease_id = fi.disease_id
 JOIN dim_countries c ON fi.country_id = c.country_id
-JOIN dim_time t ON fi.time_id = t.time_id
 LEFT JOIN dim_vaccines v ON LOWER(v.vaccine_description) LIKE CONCAT('%', LOWER(d.disease_code), '%')
 LEFT JOIN fact_coverage fc ON fc.vaccine_id = v.vaccine_id 
     AND fc.country_id = c.country_id 
-    AND fc.time_id = t.time_id
-WHERE t.year >= 2020
+    AND fc.year = fi.year
+WHERE fi.year >= 2020
     AND d.disease_description IN ('Tuberculosis', 'Hepatitis B', 'Measles', 'Polio', 'Tetanus')
 GROUP BY d.disease_description, c.who_region
 ORDER BY avg_coverage ASC, avg_incidence DESC;
@@ -234,15 +218,14 @@ SELECT
 FROM fact_incidence fi
 JOIN dim_countries c ON fi.country_id = c.country_id
 JOIN dim_diseases d ON fi.disease_id = d.disease_id
-JOIN dim_time t ON fi.time_id = t.time_id
 LEFT JOIN fact_cases fca ON fca.country_id = fi.country_id 
     AND fca.disease_id = fi.disease_id 
-    AND fca.time_id = t.time_id
+    AND fca.year = fi.year
 LEFT JOIN dim_vaccines v ON LOWER(v.vaccine_description) LIKE CONCAT('%', LOWER(d.disease_code), '%')
 LEFT JOIN fact_coverage fc ON fc.vaccine_id = v.vaccine_id 
     AND fc.country_id = c.country_id 
-    AND fc.time_id = t.time_id
-WHERE t.year >= 2018
+    AND fc.year = fi.year
+WHERE fi.year >= 2018
 GROUP BY c.who_region, c.country_name, d.disease_description
 HAVING avg_incidence > 0
 ORDER BY d.disease_description, disease_rank;
@@ -261,8 +244,7 @@ SELECT
     COUNT(DISTINCT fc.vaccine_id) as vaccine_types
 FROM fact_coverage fc
 JOIN dim_countries c ON fc.country_id = c.country_id
-JOIN dim_time t ON fc.time_id = t.time_id
-WHERE t.year >= 2022
+WHERE fc.year >= 2022
 GROUP BY c.who_region, c.country_name
 HAVING avg_coverage < 60
 ORDER BY unvaccinated_population DESC, avg_coverage ASC
@@ -277,13 +259,12 @@ WITH baseline AS (
     FROM fact_cases fca
     JOIN dim_countries c ON fca.country_id = c.country_id
     JOIN dim_diseases d ON fca.disease_id = d.disease_id
-    JOIN dim_time t ON fca.time_id = t.time_id
     LEFT JOIN dim_vaccines v ON LOWER(v.vaccine_description) LIKE '%measles%'
     LEFT JOIN fact_coverage fc ON fc.vaccine_id = v.vaccine_id 
         AND fc.country_id = c.country_id 
-        AND fc.time_id = t.time_id
+        AND fc.year = fca.year
     WHERE d.disease_description LIKE '%Measles%'
-        AND t.year BETWEEN 2015 AND 2019
+        AND fca.year BETWEEN 2015 AND 2019
     GROUP BY c.country_name
 ),
 current AS (
@@ -294,13 +275,12 @@ current AS (
     FROM fact_cases fca
     JOIN dim_countries c ON fca.country_id = c.country_id
     JOIN dim_diseases d ON fca.disease_id = d.disease_id
-    JOIN dim_time t ON fca.time_id = t.time_id
     LEFT JOIN dim_vaccines v ON LOWER(v.vaccine_description) LIKE '%measles%'
     LEFT JOIN fact_coverage fc ON fc.vaccine_id = v.vaccine_id 
         AND fc.country_id = c.country_id 
-        AND fc.time_id = t.time_id
+        AND fc.year = fca.year
     WHERE d.disease_description LIKE '%Measles%'
-        AND t.year BETWEEN 2020 AND 2024
+        AND fca.year BETWEEN 2020 AND 2024
     GROUP BY c.country_name
 )
 SELECT 
@@ -338,8 +318,7 @@ SELECT
 FROM fact_coverage fc
 JOIN dim_vaccines v ON fc.vaccine_id = v.vaccine_id
 JOIN dim_countries c ON fc.country_id = c.country_id
-JOIN dim_time t ON fc.time_id = t.time_id
-WHERE t.year BETWEEN 2021 AND 2023
+WHERE fc.year BETWEEN 2021 AND 2023
 GROUP BY v.vaccine_description, c.who_region
 ORDER BY forecasted_target_2025 DESC;
 
@@ -347,7 +326,7 @@ ORDER BY forecasted_target_2025 DESC;
 SELECT 
     c.country_name,
     c.who_region,
-    t.year,
+    fc.year,
     AVG(fc.coverage_percentage) as current_coverage,
     95 - AVG(fc.coverage_percentage) as gap_to_target,
     CASE 
@@ -361,11 +340,10 @@ SELECT
 FROM fact_coverage fc
 JOIN dim_countries c ON fc.country_id = c.country_id
 JOIN dim_vaccines v ON fc.vaccine_id = v.vaccine_id
-JOIN dim_time t ON fc.time_id = t.time_id
 WHERE v.vaccine_description LIKE '%Measles%'
-    AND t.year >= 2020
-GROUP BY c.country_name, c.who_region, t.year
-ORDER BY t.year DESC, gap_to_target DESC;
+    AND fc.year >= 2020
+GROUP BY c.country_name, c.who_region, fc.year
+ORDER BY fc.year DESC, gap_to_target DESC;
 
 -- =====================================================
 -- POWER BI DAX MEASURES (To be created in Power BI)
@@ -0,0 +1,304 @@
+# precompute.py - Pre-built payloads for the dashboard's hot endpoints
+# ===================================================================
+#
+# PayloadScheduler renders a fixed list of GET URLs (the endpoints the
+# dashboard polls) into ready-to-send JSON bodies: once on startup and
+# again whenever the warehouse changes, checked every `check_interval`
+# seconds through a cheap fingerprint query, or at the latest after
+# `max_age` seconds. Every refresh after startup runs `on_change` first so
+# derived in-memory state is rebuilt with it; a pass that raises is logged
+# and counted in metrics() and the thread keeps going. The thread is stopped
+# at interpreter exit so it is never killed inside a database call. Requests
+# for those URLs are answered from the stored body; refresh timings are kept
+# for /api/metrics.
+#
+# The same refresh is the single producer for /api/stream: each payload
+# gets a version that only moves when its content (ignoring the
+# timestamp) changes, and stream() pushes new versions to every
+# subscriber as Server-Sent Events. A stream occupies a worker thread for
+# as long as it is open, so each worker accepts at most `max_streams` of
+# them (the API answers 503 beyond that) and ends each one after
+# `stream_lifetime` seconds; EventSource reconnects on its own.
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from flask import request
+
+
+def url_key(path, args):
+    """Cache key for a request: path plus sorted query arguments"""
+    return (path, tuple(sorted(args.items(multi=True))))
+
+
+class PayloadScheduler:
+    def __init__(self, app, urls, fingerprint=None, on_change=None,
+                 check_interval=30, max_age=600, max_streams=8, stream_lifetime=300):
+        self.app = app
+        self.urls = list(urls)
+        self.fingerprint = fingerprint
+        self.on_change = on_change
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self.max_streams = max_streams          # open streams per worker process
+        self.stream_lifetime = stream_lifetime  # seconds before a stream ends and the client reconnects
+
+        self._entries = {}        # url key -> {'body', 'built_at', ...}
+        self._latest = {}         # url -> same entry, for subscribers
+        self._changed = threading.Condition()
+        self._generation = 0      # bumped whenever any payload version moves
+        self._stats = {url: {'refreshes': 0, 'failures': 0, 'hits': 0, 'version': 0,
+                             'last_duration_ms': None, 'last_refreshed': None}
+                       for url in self.urls}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._force = False       # False or the reason for an immediate refresh
+        self._thread_pid = None
+        self._last_fingerprint = None
+        self._last_full_refresh = 0.0
+        self._loop_failures = 0   # refresh passes that raised
+        self._last_error = None
+        self._open_streams = 0
+        self._refused_streams = 0
+
+    # ------------------------------------------
+    # Building payloads
+    # ------------------------------------------
+
+    def build(self, url):
+        """Run the view for url without the request hooks; returns (status, body)"""
+        with self.app.test_request_context(url):
+            adapter = self.app.url_map.bind('localhost')
+            endpoint, values = adapter.match(request.path)
+            response = self.app.make_response(self.app.view_functions[endpoint](**values))
+            return response.status_code, response.get_data()
+
+    @staticmethod
+    def content_digest(body):
+        """Hash of a JSON payload without its volatile timestamp"""
+        payload = json.loads(body)
+        if isinstance(payload, dict):
+            payload.pop('timestamp', None)
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def refresh(self, urls=None, reason='scheduled'):
+        """Rebuild payloads, keeping the previous one for any URL that fails"""
+        started_all = time.perf_counter()
+        updated = False
+        for url in urls or self.urls:
+            started = time.perf_counter()
+            try:
+                status, body = self.build(url)
+            except Exception as e:
+                print(f"Error precomputing {url}: {e}")
+                status, body = 500, None
+            duration_ms = (time.perf_counter() - started) * 1000
+
+            with self.app.test_request_context(url):
+                key = url_key(request.path, request.args)
+            with self._lock:
+                stats = self._stats[url]
+                stats['last_duration_ms'] = round(duration_ms, 2)
+                if status == 200:
+                    previous = self._latest.get(url)
+                    digest = self.content_digest(body)
+                    version = previous['version'] if previous else 0
+                    if previous is None or previous['digest'] != digest:
+                        version += 1
+                        updated = True
+                    self._entries[key] = self._latest[url] = {
+                        'body': body, 'built_at': time.time(), 'reason': reason,
+                        'digest': digest, 'version': version,
+                    }
+                    stats['refreshes'] += 1
+                    stats['version'] = version
+                    stats['last_refreshed'] = datetime.now().isoformat()
+                else:
+                    stats['failures'] += 1
+        self._last_full_refresh = time.time()
+        if updated:
+            with self._changed:
+                self._generation += 1
+                self._changed.notify_all()
+        return (time.perf_counter() - started_all) * 1000
+
+    # ------------------------------------------
+    # Serving
+    # ------------------------------------------
+
+    def lookup(self, path, args):
+        """Stored (body, age in seconds) for a request, or None"""
+        key = url_key(path, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            for url, stats in self._stats.items():
+                if url.split('?')[0] == path:
+                    stats['hits'] += 1
+                    break
+            return entry['body'], time.time() - entry['built_at']
+
+    def respond(self):
+        """before_request hook: answer GETs for precomputed URLs from memory"""
+        self.start()
+        if request.method != 'GET':
+            return None
+        found = self.lookup(request.path, request.args)
+        if found is None:
+            return None
+        body, age = found
+        response = self.app.response_class(body, status=200, mimetype='application/json')
+        response.headers['X-Payload-Age'] = f"{age:.0f}"
+        return response
+
+    def open_stream(self):
+        """Claim a stream slot; False when max_streams are already open"""
+        with self._lock:
+            if self._open_streams >= self.max_streams:
+                self._refused_streams += 1
+                return False
+            self._open_streams += 1
+            return True
+
+    def close_stream(self):
+        with self._lock:
+            self._open_streams -= 1
+
+    def stream(self, urls, keepalive=15):
+        """
+        Server-Sent Events for the given URLs: the current payload of each
+        on connect, then every new version as the refresher produces it.
+        Waiting clients share the one refresh, but each holds a worker
+        thread, so a stream ends after stream_lifetime seconds (kept below
+        the worker timeout) and the client's EventSource reconnects.
+        """
+        self.start()
+        sent = {}
+        deadline = time.monotonic() + self.stream_lifetime
+        yield f"retry: {keepalive * 1000}\n\n"
+        while True:
+            generation = self._generation
+            with self._lock:
+                pending = [(url, self._latest[url]) for url in urls
+                           if url in self._latest and self._latest[url]['version'] != sent.get(url)]
+            for url, entry in pending:
+                sent[url] = entry['version']
+                yield (f"id: {entry['version']}\nevent: {url}\n"
+                       f"data: {entry['body'].decode('utf-8').strip()}\n\n")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            with self._changed:
+                notified = self._changed.wait_for(lambda: self._generation != generation,
+                                                  min(keepalive, remaining))
+            if not notified:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+
+    # ------------------------------------------
+    # Background refresh
+    # ------------------------------------------
+
+    def trigger(self, reason='reload'):
+        """Ask the background thread to refresh now (e.g. after a data reload)"""
+        self.start()
+        self._force = reason
+        self._wake.set()
+
+    def pending(self):
+        """True while a triggered refresh has not started yet"""
+        return bool(self._force)
+
+    def start(self):
+        """Start the refresh thread once per process (workers fork after preload)"""
+        if self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+            self._wake = threading.Event()
+            self._stopping = threading.Event()
+            if not self._entries:
+                self._force = 'startup'
+            self._thread = threading.Thread(target=self._run, name='payload-refresh', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout=10):
+        """Stop the refresh thread after its current pass"""
+        thread = self._thread
+        if thread is None or self._thread_pid != os.getpid():
+            return
+        self._stopping.set()
+        self._wake.set()
+        thread.join(timeout)
+        self._thread_pid = None
+        atexit.unregister(self.stop)
+
+    def _current_fingerprint(self):
+        if self.fingerprint is None:
+            return None
+        try:
+            return self.fingerprint()
+        except Exception as e:
+            print(f"Error reading data fingerprint: {e}")
+            return self._last_fingerprint
+
+    def _run(self):
+        if self._last_fingerprint is None:
+            self._last_fingerprint = self._current_fingerprint()
+        stopping = self._stopping
+        while not stopping.is_set():
+            if not self._force:
+                self._wake.wait(self.check_interval)
+            self._wake.clear()
+            if stopping.is_set():
+                break
+            try:
+                self._tick()
+            except Exception as e:
+                # One bad pass must not kill the thread; the next one retries
+                print(f"Error in background refresh: {e}")
+                with self._lock:
+                    self._loop_failures += 1
+                    self._last_error = {'error': str(e), 'at': datetime.now().isoformat()}
+
+    def _tick(self):
+        fingerprint = self._current_fingerprint()
+        changed = fingerprint != self._last_fingerprint
+        stale = time.time() - self._last_full_refresh >= self.max_age
+        if not (self._force or changed or stale):
+            return
+
+        reason = self._force or ('data changed' if changed else 'max age')
+        self._force = False
+        # Derived state (caches, cube, sketches, tracker) is rebuilt on every
+        # refresh but the first, so a change the fingerprint misses is picked
+        # up within max_age
+        if reason != 'startup' and self.on_change is not None:
+            self.on_change()
+        self.refresh(reason=reason)
+        self._last_fingerprint = fingerprint   # only once handled, so a failed pass retries
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'check_interval_s': self.check_interval,
+                'max_age_s': self.max_age,
+                'last_full_refresh': (datetime.fromtimestamp(self._last_full_refresh).isoformat()
+                                      if self._last_full_refresh else None),
+                'loop_failures': self._loop_failures,
+                'last_error': self._last_error,
+                'streams': {'open': self._open_streams, 'max': self.max_streams,
+                            'refused': self._refused_streams, 'lifetime_s': self.stream_lifetime},
+                'endpoints': {url: dict(stats) for url, stats in self._stats.items()},
+            }
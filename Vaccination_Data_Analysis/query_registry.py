@@ -0,0 +1,626 @@
+# query_registry.py - Every SQL statement the API endpoints run, declared once
+# ===========================================================================
+#
+# Each endpoint query is registered here under a name with its parameters
+# (name -> representative value) and the result schema it must return
+# (column -> 'int' / 'number' / 'text' / 'any'; NULLs are always allowed). The API
+# executes queries by name on pooled connections, where they are prepared
+# once per connection (db_backends.ConnectionPool). The registry also
+# defines the CSV exports, labels the per-query metrics at /api/metrics,
+# and feeds index_advisor.py.
+#
+# Usage (self-check: run every registered query against a local stand-in
+# and compare its columns and value types with the declared schema):
+#   python query_registry.py --backend sqlite --database vaccination.db
+#   python query_registry.py --backend sqlite duckdb --scale 0.05   # synthetic warehouses
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+
+import cube
+import data_profiler
+import sketches
+import target_tracker
+from db_backends import BACKENDS
+
+UNREGISTERED = 'unregistered'
+
+
+class RegisteredQuery:
+    __slots__ = ('name', 'sql', 'params', 'columns', 'backends', 'export')
+
+    def __init__(self, name, sql, params=None, columns=None, backends=BACKENDS, export=None):
+        self.name = name
+        self.sql = sql.strip()
+        self.params = dict(params or {})
+        self.columns = dict(columns or {})
+        self.backends = tuple(backends)
+        self.export = export
+
+    def sample_params(self):
+        return tuple(self.params.values())
+
+
+QUERIES = {}
+_BY_SQL = {}
+
+
+def register(name, sql, params=None, columns=None, backends=BACKENDS, export=None):
+    if name in QUERIES:
+        raise ValueError(f"Query {name!r} is already registered")
+    query = RegisteredQuery(name, sql, params, columns, backends, export)
+    QUERIES[name] = query
+    _BY_SQL[query.sql] = query
+    return query
+
+
+def resolve(query, params=None):
+    """(label, SQL) for a registered name or raw SQL text"""
+    registered = QUERIES.get(query)
+    if registered is None:
+        registered = _BY_SQL.get(query.strip())
+        return (registered.name if registered else UNREGISTERED), query
+    if len(params or ()) != len(registered.params):
+        raise ValueError(f"{registered.name} takes {len(registered.params)} parameters "
+                         f"({', '.join(registered.params) or 'none'}), got {len(params or ())}")
+    return registered.name, registered.sql
+
+
+def for_backend(name, backend):
+    """The variant of a registered query that runs on backend, or None.
+
+    Backend-specific dialects are registered as '<name>.<backend>'.
+    """
+    query = QUERIES.get(name)
+    if query is not None and backend in query.backends:
+        return query
+    variant = QUERIES.get(f"{name}.{backend}")
+    return variant if variant is not None and backend in variant.backends else None
+
+
+def export_queries():
+    """CSV export name -> registered query"""
+    return {q.export: q for q in QUERIES.values() if q.export}
+
+# ==============================================
+# DATA CLEANING
+# ==============================================
+
+register('cleaning.overview.coverage', """
+    SELECT
+        'Coverage' as dataset,
+        COUNT(*) as total_records,
+        COUNT(DISTINCT country_id) as countries,
+        COUNT(DISTINCT vaccine_id) as vaccines
+    FROM fact_coverage
+""", columns={'dataset': 'text', 'total_records': 'int', 'countries': 'int', 'vaccines': 'int'})
+
+register('cleaning.overview.incidence', """
+    SELECT
+        'Incidence' as dataset,
+        COUNT(*) as total_records,
+        COUNT(DISTINCT country_id) as countries,
+        COUNT(DISTINCT disease_id) as diseases
+    FROM fact_incidence
+""", columns={'dataset': 'text', 'total_records': 'int', 'countries': 'int', 'diseases': 'int'})
+
+register('cleaning.overview.cases', """
+    SELECT
+        'Cases' as dataset,
+        COUNT(*) as total_records,
+        COUNT(DISTINCT country_id) as countries,
+        COUNT(DISTINCT disease_id) as diseases
+    FROM fact_cases
+""", columns={'dataset': 'text', 'total_records': 'int', 'countries': 'int', 'diseases': 'int'})
+
+# ==============================================
+# EDA
+# ==============================================
+
+register('eda.global_trends', """
+    SELECT
+        fc.year,
+        AVG(fc.coverage_percentage) as avg_coverage,
+        COUNT(DISTINCT fc.country_id) as countries,
+        SUM(fc.doses_administered) as total_doses
+    FROM fact_coverage fc
+    WHERE fc.year >= 2015
+    GROUP BY fc.year
+    ORDER BY fc.year
+""", columns={'year': 'int', 'avg_coverage': 'number', 'countries': 'int', 'total_doses': 'number'})
+
+register('eda.top_countries', """
+    SELECT
+        c.country_name,
+        c.who_region,
+        AVG(fc.coverage_percentage) as avg_coverage,
+        SUM(fc.doses_administered) as total_doses
+    FROM fact_coverage fc
+    JOIN dim_countries c ON fc.country_id = c.country_id
+    WHERE fc.year >= %s
+    GROUP BY c.country_name, c.who_region
+    ORDER BY avg_coverage DESC
+    LIMIT %s
+""", params={'min_year': 2022, 'limit': 10},
+    columns={'country_name': 'text', 'who_region': 'text', 'avg_coverage': 'number',
+             'total_doses': 'number'})
+
+register('eda.low_coverage', """
+    SELECT
+        c.country_name,
+        c.who_region,
+        AVG(fc.coverage_percentage) as avg_coverage,
+        SUM(fc.target_number) as target_population,
+        SUM(fc.target_number - fc.doses_administered) as unvaccinated_population
+    FROM fact_coverage fc
+    JOIN dim_countries c ON fc.country_id = c.country_id
+    WHERE fc.year >= 2022
+    GROUP BY c.country_name, c.who_region
+    HAVING avg_coverage < %s
+    ORDER BY avg_coverage ASC
+""", params={'threshold': 60},
+    columns={'country_name': 'text', 'who_region': 'text', 'avg_coverage': 'number',
+             'target_population': 'number', 'unvaccinated_population': 'number'})
+
+register('eda.disease_impact', """
+    SELECT
+        d.disease_description as disease,
+        AVG(fc.coverage_percentage) as avg_coverage,
+        AVG(fi.incidence_rate) as avg_incidence,
+        SUM(fca.reported_cases) as total_cases,
+        COUNT(DISTINCT c.country_id) as countries_affected
+    FROM dim_diseases d
+    LEFT JOIN fact_incidence fi ON d.disease_id = fi.disease_id
+    LEFT JOIN fact_cases fca ON d.disease_id = fca.disease_id
+        AND fi.country_id = fca.country_id
+        AND fi.time_id = fca.time_id
+    LEFT JOIN dim_vaccines v ON LOWER(v.vaccine_description) LIKE CONCAT('%', LOWER(d.disease_code), '%')
+    LEFT JOIN fact_coverage fc ON v.vaccine_id = fc.vaccine_id
+        AND fi.country_id = fc.country_id
+        AND fi.time_id = fc.time_id
+    JOIN dim_countries c ON fi.country_id = c.country_id
+    WHERE fi.year >= 2020
+    GROUP BY d.disease_description
+    HAVING avg_coverage IS NOT NULL
+    ORDER BY total_cases DESC
+""", columns={'disease': 'text', 'avg_coverage': 'number', 'avg_incidence': 'number',
+              'total_cases': 'number', 'countries_affected': 'int'})
+
+register('eda.regional_analysis', """
+    SELECT
+        c.who_region,
+        COUNT(DISTINCT c.country_id) as countries,
+        AVG(fc.coverage_percentage) as avg_coverage,
+        MIN(fc.coverage_percentage) as min_coverage,
+        MAX(fc.coverage_percentage) as max_coverage,
+        SUM(fc.doses_administered) as total_doses
+    FROM fact_coverage fc
+    JOIN dim_countries c ON fc.country_id = c.country_id
+    WHERE fc.year >= 2020
+    GROUP BY c.who_region
+    ORDER BY avg_coverage DESC
+""", columns={'who_region': 'text', 'countries': 'int', 'avg_coverage': 'number',
+              'min_coverage': 'number', 'max_coverage': 'number', 'total_doses': 'number'})
+
+# ==============================================
+# SQL DATABASE STATS
+# ==============================================
+
+register('sql.stats.tables',
+         "SELECT COUNT(*) as count FROM information_schema.tables WHERE table_schema = 'vaccination_db'",
+         columns={'count': 'int'}, backends=('mysql',))
+
+register('sql.stats.indexes', """
+    SELECT COUNT(DISTINCT table_name, index_name) as count
+    FROM information_schema.statistics
+    WHERE table_schema = 'vaccination_db' AND index_name <> 'PRIMARY'
+""", columns={'count': 'int'}, backends=('mysql',))
+
+# Explicit indexes only; SQLite's automatic PRIMARY KEY/UNIQUE indexes have no sql
+register('sql.stats.indexes.sqlite',
+         "SELECT COUNT(*) as count FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL",
+         columns={'count': 'int'}, backends=('sqlite',))
+
+register('sql.stats.indexes.duckdb', "SELECT COUNT(*) as count FROM duckdb_indexes()",
+         columns={'count': 'int'}, backends=('duckdb',))
+
+register('sql.stats.total_records', """
+    SELECT
+        (SELECT COUNT(*) FROM fact_coverage) +
+        (SELECT COUNT(*) FROM fact_incidence) +
+        (SELECT COUNT(*) FROM fact_cases) as total
+""", columns={'total': 'int'})
+
+# ==============================================
+# INSIGHTS
+# ==============================================
+
+register('insights.regional_disparity', """
+    SELECT
+        MAX(avg_cov) - MIN(avg_cov) as disparity
+    FROM (
+        SELECT c.who_region, AVG(fc.coverage_percentage) as avg_cov
+        FROM fact_coverage fc
+        JOIN dim_countries c ON fc.country_id = c.country_id
+        WHERE fc.year >= 2020
+        GROUP BY c.who_region
+    ) as regional_coverage
+""", columns={'disparity': 'number'})
+
+# ==============================================
+# ANALYTICS
+# ==============================================
+
+register('analytics.correlation', """
+    SELECT
+        c.country_name,
+        fc.year,
+        AVG(fc.coverage_percentage) as coverage,
+        AVG(fi.incidence_rate) as incidence,
+        SUM(fca.reported_cases) as cases
+    FROM fact_coverage fc
+    JOIN dim_countries c ON fc.country_id = c.country_id
+    JOIN dim_vaccines v ON fc.vaccine_id = v.vaccine_id
+    LEFT JOIN dim_diseases d ON LOWER(v.vaccine_description) LIKE CONCAT('%', LOWER(%s), '%')
+    LEFT JOIN fact_incidence fi ON d.disease_id = fi.disease_id
+        AND fc.country_id = fi.country_id
+        AND fc.time_id = fi.time_id
+    LEFT JOIN fact_cases fca ON d.disease_id = fca.disease_id
+        AND fc.country_id = fca.country_id
+        AND fc.time_id = fca.time_id
+    WHERE fc.year >= 2015 AND d.disease_id IS NOT NULL
+    GROUP BY c.country_name, fc.year
+    HAVING coverage IS NOT NULL AND incidence IS NOT NULL
+    ORDER BY fc.year, c.country_name
+""", params={'disease': 'Measles'},
+    columns={'country_name': 'text', 'year': 'int', 'coverage': 'number', 'incidence': 'number',
+             'cases': 'number'})
+
+# Correlation matrix panel (analytics.correlation_matrix)
+register('analytics.correlation_matrix.coverage', """
+    SELECT country_id, year, vaccine_id, AVG(coverage_percentage) as value
+    FROM fact_coverage
+    WHERE year >= %s AND coverage_percentage IS NOT NULL
+    GROUP BY country_id, year, vaccine_id
+""", params={'min_year': 2015},
+    columns={'country_id': 'int', 'year': 'int', 'vaccine_id': 'int', 'value': 'number'})
+
+register('analytics.correlation_matrix.incidence', """
+    SELECT country_id, year, disease_id, AVG(incidence_rate) as value
+    FROM fact_incidence
+    WHERE year >= %s AND incidence_rate IS NOT NULL
+    GROUP BY country_id, year, disease_id
+""", params={'min_year': 2015},
+    columns={'country_id': 'int', 'year': 'int', 'disease_id': 'int', 'value': 'number'})
+
+register('analytics.correlation_matrix.cases', """
+    SELECT country_id, year, disease_id, SUM(reported_cases) as value
+    FROM fact_cases
+    WHERE year >= %s AND reported_cases IS NOT NULL
+    GROUP BY country_id, year, disease_id
+""", params={'min_year': 2015},
+    columns={'country_id': 'int', 'year': 'int', 'disease_id': 'int', 'value': 'number'})
+
+register('analytics.correlation_matrix.countries', "SELECT country_id, who_region FROM dim_countries",
+         columns={'country_id': 'int', 'who_region': 'text'})
+
+# Vaccine introduction impact (analytics.introduction_impact)
+# First year each vaccine was reported as introduced in each country
+register('analytics.introduction.introductions', """
+    SELECT
+        fvi.country_id,
+        c.country_name,
+        c.who_region,
+        fvi.vaccine_id,
+        v.vaccine_description,
+        MIN(fvi.year) as intro_year
+    FROM fact_vaccine_introduction fvi
+    JOIN dim_countries c ON fvi.country_id = c.country_id
+    JOIN dim_vaccines v ON fvi.vaccine_id = v.vaccine_id
+    WHERE fvi.intro_status = 'Yes'
+    GROUP BY fvi.country_id, c.country_name, c.who_region,
+             fvi.vaccine_id, v.vaccine_description
+""", columns={'country_id': 'int', 'country_name': 'text', 'who_region': 'text', 'vaccine_id': 'int',
+              'vaccine_description': 'text', 'intro_year': 'int'})
+
+# Vaccine -> disease pairs, matched once on the dimension tables
+register('analytics.introduction.pairs', """
+    SELECT v.vaccine_id, d.disease_id, d.disease_description
+    FROM dim_vaccines v
+    JOIN dim_diseases d ON LOWER(v.vaccine_description) LIKE CONCAT('%', LOWER(d.disease_code), '%')
+""", columns={'vaccine_id': 'int', 'disease_id': 'int', 'disease_description': 'text'})
+
+register('analytics.introduction.cases', """
+    SELECT
+        country_id,
+        disease_id,
+        year,
+        SUM(reported_cases) as cases,
+        COUNT(reported_cases) as reports
+    FROM fact_cases
+    GROUP BY country_id, disease_id, year
+""", columns={'country_id': 'int', 'disease_id': 'int', 'year': 'int', 'cases': 'number',
+              'reports': 'int'})
+
+# Coverage and demand forecasts (forecasting.forecast_series)
+register('analytics.forecast.series', """
+    SELECT
+        country_id,
+        vaccine_id,
+        year,
+        AVG(coverage_percentage) as coverage,
+        AVG(target_number) as target
+    FROM fact_coverage
+    WHERE year >= %s
+    GROUP BY country_id, vaccine_id, year
+""", params={'min_year': 2000},
+    columns={'country_id': 'int', 'vaccine_id': 'int', 'year': 'int', 'coverage': 'number',
+             'target': 'number'})
+
+# ==============================================
+# DIMENSIONS (shared by the analytics engines and the coverage cube)
+# ==============================================
+
+register('dim.countries', cube.COUNTRY_QUERY,
+         columns={'country_id': 'int', 'country_name': 'text', 'who_region': 'text'})
+
+register('dim.vaccines', "SELECT vaccine_id, vaccine_code, vaccine_description FROM dim_vaccines",
+         columns={'vaccine_id': 'int', 'vaccine_code': 'text', 'vaccine_description': 'text'})
+
+register('dim.diseases', "SELECT disease_id, disease_code, disease_description FROM dim_diseases",
+         columns={'disease_id': 'int', 'disease_code': 'text', 'disease_description': 'text'})
+
+# ==============================================
+# IN-MEMORY MODELS
+# ==============================================
+# cube.py, target_tracker.py, sketches.py and data_profiler.py keep their SQL
+# next to the code that reads it and run it through the executor they are
+# given (the API's execute_query, or a plain cursor in their CLIs). The API
+# resolves the same text to these names for /api/metrics.
+
+register('cube.coverage', cube.CUBE_QUERY, columns={
+    'country_id': 'int', 'year': 'int', 'vaccine_id': 'int', 'row_count': 'int',
+    'coverage_sum': 'number', 'coverage_count': 'int', 'coverage_min': 'number', 'coverage_max': 'number',
+    'doses': 'number', 'doses_count': 'int', 'target': 'number', 'target_count': 'int',
+    'unvaccinated': 'number', 'unvaccinated_count': 'int'})
+
+register('tracker.measles_coverage', target_tracker.TRACKER_QUERY,
+         params={'vaccines': target_tracker.MEASLES_VACCINES, 'since_year': 2015},
+         columns={'country_code': 'text', 'year': 'int', 'coverage': 'number',
+                  'target_population': 'number'})
+
+register('tracker.countries', target_tracker.COUNTRY_QUERY,
+         columns={'country_code': 'text', 'country_name': 'text', 'who_region': 'text'})
+
+register('tracker.latest_year', target_tracker.LATEST_YEAR_QUERY,
+         params={'vaccines': target_tracker.MEASLES_VACCINES}, columns={'latest_year': 'int'})
+
+register('sketches.cells', sketches.CELLS_QUERY,
+         columns={'table_name': 'text', 'year': 'int', 'who_region': 'text', 'payload': 'any'})
+
+
+def _profile_columns(spec):
+    """Result schema of data_profiler.profile_query, in select order"""
+    columns = {'row_count': 'int'}
+    for column in spec['columns']:
+        columns.update({f'null__{column}': 'int', f'distinct__{column}': 'int',
+                        f'min__{column}': 'any', f'max__{column}': 'any'})
+    columns.update({f'out_of_range__{column}': 'int' for column in spec['ranges']})
+    columns.update({f'orphan__{column}': 'int' for column in data_profiler.REFERENCES
+                    if column in spec['columns']})
+    if 'time_id' in spec['columns']:
+        columns['year_mismatch'] = 'int'
+    columns['duplicate_keys'] = 'int'
+    return columns
+
+
+for _table, _spec in data_profiler.PROFILE_SPEC.items():
+    register(f'profile.{_table}', data_profiler.profile_query(_table, _spec),
+             columns=_profile_columns(_spec))
+    register(f'profile.fingerprint.{_table}', data_profiler.fingerprint_query(_table, _spec),
+             columns={'row_count': 'int', 'max_id': 'int', 'checksum': 'number'})
+
+# ==============================================
+# CSV EXPORTS (/api/export/csv?query=<export>)
+# ==============================================
+
+register('export.global_trends', """
+    SELECT fc.year, AVG(fc.coverage_percentage) as avg_coverage
+    FROM fact_coverage fc
+    GROUP BY fc.year
+    ORDER BY fc.year
+""", columns={'year': 'int', 'avg_coverage': 'number'}, export='global-trends')
+
+register('export.country_coverage', """
+    SELECT c.country_name, c.who_region, AVG(fc.coverage_percentage) as avg_coverage
+    FROM fact_coverage fc
+    JOIN dim_countries c ON fc.country_id = c.country_id
+    GROUP BY c.country_name, c.who_region
+    ORDER BY avg_coverage DESC
+""", columns={'country_name': 'text', 'who_region': 'text', 'avg_coverage': 'number'},
+    export='country-coverage')
+
+# ==============================================
+# BACKGROUND REFRESH
+# ==============================================
+
+# Checked every REFRESH_CHECK_SECONDS. Row counts catch appends and deletes;
+# the measure sums catch a re-ETL that revises values in place.
+register('admin.data_fingerprint', """
+    SELECT cv.row_count as coverage_rows, cv.measure_sum as coverage_sum, cv.latest_year,
+           inc.row_count as incidence_rows, inc.measure_sum as incidence_sum,
+           cs.row_count as cases_rows, cs.measure_sum as cases_sum
+    FROM (SELECT COUNT(*) as row_count, ROUND(SUM(coverage_percentage), 4) as measure_sum,
+                 MAX(year) as latest_year
+          FROM fact_coverage) cv,
+         (SELECT COUNT(*) as row_count, ROUND(SUM(incidence_rate), 4) as measure_sum
+          FROM fact_incidence) inc,
+         (SELECT COUNT(*) as row_count, SUM(reported_cases) as measure_sum
+          FROM fact_cases) cs
+""", columns={'coverage_rows': 'int', 'coverage_sum': 'number', 'latest_year': 'int',
+              'incidence_rows': 'int', 'incidence_sum': 'number',
+              'cases_rows': 'int', 'cases_sum': 'number'})
+
+# Bounds for client-supplied years (flask_api_backend.clamp_year)
+register('admin.year_range', """
+    SELECT MIN(first_year) as min_year, MAX(last_year) as max_year
+    FROM (
+        SELECT MIN(year) as first_year, MAX(year) as last_year FROM fact_coverage
+        UNION ALL
+        SELECT MIN(year), MAX(year) FROM fact_incidence
+        UNION ALL
+        SELECT MIN(year), MAX(year) FROM fact_cases
+    ) as year_ranges
+""", columns={'min_year': 'int', 'max_year': 'int'})
+
+# ==============================================
+# METRICS
+# ==============================================
+
+class QueryMetrics:
+    """Calls, errors, rows and latency per registered query name"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, label, seconds, rows=None):
+        with self._lock:
+            stats = self._stats.setdefault(label, [0, 0, 0, 0.0, 0.0])
+            stats[0] += 1
+            if rows is None:
+                stats[1] += 1
+            else:
+                stats[2] += len(rows)
+            stats[3] += seconds
+            stats[4] = max(stats[4], seconds)
+
+    def report(self):
+        with self._lock:
+            stats = dict(self._stats)
+        report = {}
+        for label in list(QUERIES) + [UNREGISTERED]:
+            calls, errors, rows, total, worst = stats.get(label, (0, 0, 0, 0.0, 0.0))
+            report[label] = {
+                'calls': calls,
+                'errors': errors,
+                'rows': rows,
+                'mean_ms': round(total / calls * 1000, 3) if calls else None,
+                'max_ms': round(worst * 1000, 3) if calls else None,
+            }
+        return report
+
+# ==============================================
+# SELF-CHECK
+# ==============================================
+
+def _matches(kind, value):
+    if value is None or kind == 'any':
+        return True
+    if kind == 'text':
+        return isinstance(value, str)
+    if isinstance(value, bool):
+        return False
+    if kind == 'int':
+        return isinstance(value, int) or (isinstance(value, (float, Decimal)) and value == int(value))
+    return isinstance(value, (int, float, Decimal))
+
+
+def check_result(query, columns, rows):
+    """Differences between a result and the declared schema, as strings"""
+    problems = []
+    if list(columns) != list(query.columns):
+        problems.append(f"columns {list(columns)} != declared {list(query.columns)}")
+    for column, kind in query.columns.items():
+        if column not in columns:
+            continue
+        bad = next((row[column] for row in rows if not _matches(kind, row[column])), None)
+        if bad is not None:
+            problems.append(f"{column}: {bad!r} ({type(bad).__name__}) is not {kind}")
+    return problems
+
+
+def self_check(pool, repeat=2):
+    """Run every registered query the pool's backend supports; list of result dicts"""
+    results = []
+    for query in QUERIES.values():
+        if pool.backend not in query.backends:
+            results.append({'name': query.name, 'status': 'skipped',
+                            'detail': f"{'/'.join(query.backends)} only"})
+            continue
+        connection = pool.acquire()
+        failed = True
+        try:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                cursor = connection.execute(query.sql, query.sample_params())
+                rows = connection.fetch_dicts(cursor)
+                timings.append(time.perf_counter() - started)
+            columns = [column[0] for column in cursor.description]
+            problems = check_result(query, columns, rows)
+            failed = False
+            results.append({'name': query.name, 'status': 'failed' if problems else 'ok',
+                            'rows': len(rows), 'first_ms': timings[0] * 1000,
+                            'cached_ms': min(timings[1:] or timings) * 1000,
+                            'detail': '; '.join(problems)})
+        except Exception as e:
+            results.append({'name': query.name, 'status': 'failed', 'detail': f"{type(e).__name__}: {e}"})
+        finally:
+            pool.release(connection, discard=failed)
+    return results
+
+
+def run_self_check(backend, database=None, scale=0.05, repeat=2):
+    """Print the self-check of one backend; returns the names of failed queries"""
+    from db_backends import ConnectionPool
+
+    if database is None and backend != 'mysql':
+        from synthetic_data import build_synthetic_db
+        database = os.path.join(tempfile.mkdtemp(), f"registry_check.{backend}")
+        print(f"Building synthetic warehouse at {scale:g}x -> {database}")
+        build_synthetic_db(database, scale, backend)
+
+    pool = ConnectionPool(backend, database, size=1)
+    print("=" * 60)
+    print(f"🔎 Query registry self-check ({backend}, {len(QUERIES)} queries)")
+    print("=" * 60)
+    results = self_check(pool, max(repeat, 1))
+    for r in results:
+        if r['status'] == 'ok':
+            print(f"  ✓ {r['name']:<40} {r['rows']:>6} rows  {r['first_ms']:8.1f} ms "
+                  f"-> {r['cached_ms']:8.1f} ms repeat")
+        elif r['status'] == 'skipped':
+            print(f"  - {r['name']:<40} skipped ({r['detail']})")
+        else:
+            print(f"  ✗ {r['name']:<40} {r['detail']}")
+    pool.clear()
+    stats = pool.stats()
+    print(f"\n{stats['executions']} executions, {stats['statements_prepared']} statements prepared "
+          f"on {stats['opened']} connection(s)")
+    return [r['name'] for r in results if r['status'] == 'failed']
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run every registered API query and check its result schema')
+    parser.add_argument('--backend', nargs='+', choices=BACKENDS,
+                        default=[os.getenv('DB_BACKEND', 'sqlite')],
+                        help='one or more backends, e.g. --backend sqlite duckdb')
+    parser.add_argument('--database', help='existing warehouse (default: build a synthetic one)')
+    parser.add_argument('--scale', type=float, default=0.05, help='synthetic warehouse scale')
+    parser.add_argument('--repeat', type=int, default=2, help='runs per query (later runs reuse the statement)')
+    args = parser.parse_args()
+    if args.database and len(args.backend) > 1:
+        parser.error('--database needs a single --backend')
+
+    failed = {backend: run_self_check(backend, args.database, args.scale, args.repeat)
+              for backend in args.backend}
+    for backend, names in failed.items():
+        if names:
+            print(f"✗ {backend}: {len(names)} queries failed: {', '.join(names)}")
+    sys.exit(1 if any(failed.values()) else 0)
@@ -0,0 +1,243 @@
+# request_profiler.py - Opt-in per-request profiling for the API
+# ==============================================================
+#
+# A profiled request gets a phase breakdown of its wall time:
+#
+#   connect    checking out a pooled connection (opening one if none is idle)
+#   execute    sending the SQL (and waiting on a coalesced identical query)
+#   fetch      reading rows and turning them into dicts
+#   transform  everything else in the view: pandas, cube/sketch math, ...
+#   serialize  JSON encoding and response compression
+#
+# Phases nest and are timed exclusively, so they add up to the request
+# total. Requests are profiled when they carry the X-Profile header
+# (REQUEST_PROFILING=1) or are picked by PROFILE_SAMPLE_RATE; sampled
+# requests and `X-Profile: cprofile` also run under cProfile. Finished
+# traces go to a ring buffer served at GET /api/debug/profiles.
+#
+# With profiling off no hooks are installed and phase() returns a shared
+# no-op context, so the query path pays one thread-local lookup per phase.
+
+import itertools
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+
+from flask import request
+
+PHASES = ('connect', 'execute', 'fetch', 'transform', 'serialize')
+
+_local = threading.local()
+_NO_PHASE = nullcontext()
+_ids = itertools.count(1)
+
+
+def current():
+    """Trace of the request being handled on this thread, or None"""
+    return getattr(_local, 'trace', None)
+
+
+def phase(name):
+    """Context manager charging the enclosed time to a phase of the current trace"""
+    trace = getattr(_local, 'trace', None)
+    return _NO_PHASE if trace is None else _Phase(trace, name)
+
+
+class _Phase:
+    __slots__ = ('trace', 'name')
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.trace.enter(self.name)
+
+    def __exit__(self, *exc):
+        self.trace.exit()
+        return False
+
+
+class Trace:
+    """Phase timings of one request; the innermost open phase owns the clock"""
+
+    def __init__(self, method, path, query_string, reason):
+        self.id = next(_ids)
+        self.method = method
+        self.path = path
+        self.query_string = query_string
+        self.reason = reason
+        self.status = None
+        self.started_at = datetime.now().isoformat()
+        self.started = time.perf_counter()
+        self.phases = {}           # name -> [seconds, calls]
+        self.profile = None
+        self._stack = []           # [name, resumed at]
+
+    def enter(self, name):
+        now = time.perf_counter()
+        entry = self.phases.setdefault(name, [0.0, 0])
+        if self._stack:
+            outer = self._stack[-1]
+            self.phases[outer[0]][0] += now - outer[1]
+            entry[1] += outer[0] != name    # a phase nested in itself is one call
+        else:
+            entry[1] += 1
+        self._stack.append([name, now])
+
+    def exit(self):
+        now = time.perf_counter()
+        name, since = self._stack.pop()
+        self.phases[name][0] += now - since
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def finish(self, top):
+        while self._stack:
+            self.exit()
+        total = time.perf_counter() - self.started
+        record = {
+            'id': self.id,
+            'method': self.method,
+            'path': self.path,
+            'query': self.query_string or None,
+            'status': self.status,
+            'reason': self.reason,
+            'started_at': self.started_at,
+            'total_ms': round(total * 1000, 3),
+            'phases': {name: {'ms': round(seconds * 1000, 3), 'calls': calls}
+                       for name, (seconds, calls) in sorted(
+                           self.phases.items(), key=lambda item: PHASES.index(item[0])
+                           if item[0] in PHASES else len(PHASES))},
+            'cprofile': None,
+        }
+        if self.profile is not None:
+            record['cprofile'] = profile_summary(self.profile, top)
+        return record
+
+
+def profile_summary(profile, top=30):
+    """Heaviest functions of a cProfile run by cumulative time"""
+    import pstats
+
+    stats = pstats.Stats(profile).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+    return [
+        {'function': f"{func} ({os.path.basename(filename)}:{line})",
+         'calls': calls, 'own_ms': round(own * 1000, 3), 'cumulative_ms': round(cumulative * 1000, 3)}
+        for (filename, line, func), (_, calls, own, cumulative, _) in rows
+    ]
+
+
+class RequestProfiler:
+    """Flask hooks that trace opted-in or sampled requests into a ring buffer"""
+
+    SKIP_PREFIXES = ('/api/debug/', '/api/stream')
+
+    def __init__(self, enabled=False, sample_rate=0.0, capacity=200, header='X-Profile', top=30):
+        self.enabled = enabled
+        self.sample_rate = max(0.0, min(sample_rate, 1.0))
+        self.header = header
+        self.top = top
+        self._traces = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._cprofile_lock = threading.Lock()   # one cProfile run at a time
+        self.profiled = 0
+
+    @property
+    def active(self):
+        return self.enabled or self.sample_rate > 0
+
+    def install(self, app):
+        """Register the hooks; does nothing while profiling is off"""
+        if self.active:
+            app.before_request(self._start)
+            app.after_request(self._tag)
+            app.teardown_request(self._finish)
+        return app
+
+    def _start(self):
+        if request.path.startswith(self.SKIP_PREFIXES):
+            return None
+        requested = request.headers.get(self.header) if self.enabled else None
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not requested and not sampled:
+            return None
+
+        trace = Trace(request.method, request.path, request.query_string.decode('utf-8', 'replace'),
+                      'sampled' if sampled else 'header')
+        if (sampled or requested.lower() == 'cprofile') and self._cprofile_lock.acquire(blocking=False):
+            import cProfile
+            trace.profile = cProfile.Profile()
+            trace.profile.enable()
+        _local.trace = trace
+        trace.enter('transform')
+        return None
+
+    def _tag(self, response):
+        trace = current()
+        if trace is not None:
+            trace.status = response.status_code
+            response.headers['X-Profile-Id'] = str(trace.id)
+        return response
+
+    def _finish(self, exc=None):
+        trace = current()
+        if trace is None:
+            return
+        _local.trace = None
+        if trace.profile is not None:
+            trace.profile.disable()
+            self._cprofile_lock.release()
+        if trace.status is None and exc is not None:
+            trace.status = 500
+        record = trace.finish(self.top)
+        with self._lock:
+            self._traces.append(record)
+            self.profiled += 1
+
+    # ------------------------------------------
+    # Ring buffer access
+    # ------------------------------------------
+
+    def get(self, trace_id):
+        with self._lock:
+            return next((t for t in self._traces if t['id'] == trace_id), None)
+
+    def traces(self, path=None, limit=50):
+        """Newest first, without the cProfile tables"""
+        with self._lock:
+            traces = [t for t in reversed(self._traces) if path is None or t['path'] == path]
+        return [dict(t, cprofile=t['cprofile'] is not None) for t in traces[:max(limit, 0)]]
+
+    def summary(self):
+        """Mean total and phase times per path over the buffered traces"""
+        with self._lock:
+            traces = list(self._traces)
+        paths = {}
+        for t in traces:
+            entry = paths.setdefault(t['path'], {'requests': 0, 'total_ms': 0.0,
+                                                 'phases': dict.fromkeys(PHASES, 0.0)})
+            entry['requests'] += 1
+            entry['total_ms'] += t['total_ms']
+            for name, timing in t['phases'].items():
+                entry['phases'][name] = entry['phases'].get(name, 0.0) + timing['ms']
+        return {
+            path: {'requests': e['requests'],
+                   'mean_ms': round(e['total_ms'] / e['requests'], 3),
+                   'mean_phase_ms': {name: round(ms / e['requests'], 3) for name, ms in e['phases'].items()}}
+            for path, e in sorted(paths.items(), key=lambda item: -item[1]['total_ms'])
+        }
+
+    def config(self):
+        return {
+            'header': self.header if self.enabled else None,
+            'sample_rate': self.sample_rate,
+            'capacity': self._traces.maxlen,
+            'buffered': len(self._traces),
+            'profiled': self.profiled,
+        }
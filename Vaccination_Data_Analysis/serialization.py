@@ -0,0 +1,214 @@
+# serialization.py - Fast JSON, columnar payloads and compression for the API
+# ===========================================================================
+#
+# install(app) swaps Flask's JSON provider for one backed by orjson (when
+# installed) that writes Decimal values as numbers, adds the optional
+# ?format=columnar response shape, and compresses responses with brotli
+# or gzip according to Accept-Encoding.
+#
+# Usage (payload size / encode time benchmark):
+#   python serialization.py --rows 20000
+
+import argparse
+import gzip
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import request, has_request_context
+from flask.json.provider import DefaultJSONProvider
+
+from request_profiler import phase
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# ==============================================
+# ENCODING
+# ==============================================
+
+def _default(value):
+    """Types neither encoder handles on its own"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        # numpy scalars
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj):
+    """Serialize obj to compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def to_columnar(obj):
+    """
+    Rewrite every top-level list of row dicts as {'columns': [...],
+    'values': [[column 0 values], [column 1 values], ...]} so column
+    names are sent once instead of on every row.
+    """
+    if not isinstance(obj, dict):
+        return obj
+    converted = {}
+    for key, value in obj.items():
+        if isinstance(value, list) and value and all(isinstance(row, dict) for row in value):
+            columns = list(value[0])
+            for row in value:
+                if len(row) != len(columns):
+                    columns += [c for c in row if c not in columns]
+            converted[key] = {
+                'columns': columns,
+                'values': [[row.get(column) for row in value] for column in columns],
+            }
+        else:
+            converted[key] = value
+    return converted
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes with orjson and honours ?format=columnar"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        with phase('serialize'):
+            if has_request_context() and request.args.get('format') == 'columnar':
+                obj = to_columnar(obj)
+            return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+# ==============================================
+# COMPRESSION
+# ==============================================
+
+def choose_encoding(accept_encodings):
+    """Best supported content coding for a request's Accept-Encoding"""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def compress_response(response):
+    """after_request hook: compress buffered bodies the client accepts"""
+    if (response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or not 200 <= response.status_code < 300):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+    data = response.get_data()
+    if encoding is None or len(data) < MIN_COMPRESS_BYTES:
+        return response
+
+    with phase('serialize'):
+        response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def install(app):
+    """Enable the fast JSON provider and response compression on a Flask app"""
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
+    return app
+
+# ==============================================
+# BENCHMARK
+# ==============================================
+
+def sample_payload(n_rows):
+    """A country-year panel shaped like the analytics responses, Decimal-valued like MySQL AVG()"""
+    rows = [
+        {
+            'country_name': f"Country {i % 194 + 1}",
+            'who_region': ['AFRO', 'AMRO', 'EMRO', 'EURO', 'SEARO', 'WPRO'][i % 6],
+            'year': 1980 + i % 45,
+            'coverage': Decimal(f"{(i * 7919) % 10000 / 100:.4f}"),
+            'incidence': Decimal(f"{(i * 104729) % 500000 / 1000:.4f}"),
+            'cases': Decimal((i * 31) % 50000),
+        }
+        for i in range(n_rows)
+    ]
+    return {'success': True, 'data': rows, 'timestamp': datetime.now().isoformat()}
+
+
+def _flask_default(obj):
+    # What jsonify did before: stdlib json with Flask's default hook (Decimal -> str)
+    return json.dumps(obj, default=DefaultJSONProvider.default, sort_keys=True,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def _time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def run_benchmark(n_rows=20000, repeat=5):
+    payload = sample_payload(n_rows)
+    encoders = [('flask default', _flask_default), ('fast', dumps_bytes)]
+    shapes = [('rows', payload), ('columnar', to_columnar(payload))]
+    codings = [('identity', None), ('gzip', 'gzip')] + ([('br', 'br')] if brotli else [])
+
+    print(f"Payload: {n_rows:,} rows, best of {repeat} "
+          f"(encoder backend: {'orjson' if orjson else 'json'})\n")
+    print(f"{'encoder':<14} {'shape':<9} {'coding':<9} {'bytes':>12} {'encode ms':>10} {'compress ms':>12}")
+    report = []
+    for encoder_name, encoder in encoders:
+        for shape_name, obj in shapes:
+            body, encode_time = _time(lambda: encoder(obj), repeat)
+            for coding_name, coding in codings:
+                if coding:
+                    sent, compress_time = _time(lambda: compress(body, coding), repeat)
+                else:
+                    sent, compress_time = body, 0.0
+                report.append({'encoder': encoder_name, 'shape': shape_name, 'coding': coding_name,
+                               'bytes': len(sent), 'encode_ms': encode_time * 1000,
+                               'compress_ms': compress_time * 1000})
+                print(f"{encoder_name:<14} {shape_name:<9} {coding_name:<9} {len(sent):>12,} "
+                      f"{encode_time * 1000:>10.1f} {compress_time * 1000:>12.1f}")
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare API payload size and JSON encode time')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.repeat)
@@ -0,0 +1,113 @@
+# serve.py - Production server for the Vaccination Dashboard API
+# ==============================================================
+#
+# Runs flask_api_backend.app under gunicorn (pre-fork worker processes,
+# each with a thread pool) with the app imported once in the master, so
+# workers fork with pandas/NumPy and the Flask app already loaded. Falls
+# back to waitress (threads only, also works on Windows) when gunicorn
+# is not installed. The coverage cube and the dashboard's hot payloads
+# are built in the master too, so every worker starts warm. flask_api_backend.py's
+# app.run() stays the development server.
+#
+# Graceful reload (gunicorn): kill -HUP <master pid> starts fresh workers
+# and lets the old ones finish their in-flight requests.
+#
+# DuckDB lets only one process hold a file read-write, so with
+# DB_BACKEND=duckdb every process opens it read-only (the API never
+# writes) and the master closes its connections before workers fork.
+#
+# Usage:
+#   python serve.py --workers 4 --threads 8 --bind 0.0.0.0:5000
+#   DB_BACKEND=sqlite DB_PATH=vaccination.db python serve.py --server waitress
+
+import argparse
+import os
+
+
+def default_workers():
+    return (os.cpu_count() or 1) * 2 + 1
+
+
+def run_gunicorn(app, bind, workers, threads, timeout, graceful_timeout, max_requests):
+    from gunicorn.app.base import BaseApplication
+
+    class APIServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', bind)
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread' if threads > 1 else 'sync')
+            self.cfg.set('preload_app', True)
+            self.cfg.set('timeout', timeout)
+            self.cfg.set('graceful_timeout', graceful_timeout)
+            # Recycle workers now and then so slow leaks can't accumulate
+            self.cfg.set('max_requests', max_requests)
+            self.cfg.set('max_requests_jitter', max_requests // 10)
+            self.cfg.set('accesslog', os.getenv('ACCESS_LOG'))
+
+        def load(self):
+            return app
+
+    APIServer().run()
+
+
+def run_waitress(app, bind, threads):
+    from waitress import serve
+
+    host, _, port = bind.rpartition(':')
+    serve(app, host=host or '0.0.0.0', port=int(port), threads=threads)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the vaccination API with a production WSGI server')
+    parser.add_argument('--bind', default=os.getenv('API_BIND', '0.0.0.0:5000'))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('API_WORKERS', default_workers())),
+                        help='worker processes (gunicorn only)')
+    parser.add_argument('--threads', type=int, default=int(os.getenv('API_THREADS', 4)),
+                        help='threads per worker')
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'waitress'], default='auto')
+    parser.add_argument('--timeout', type=int, default=60)
+    parser.add_argument('--graceful-timeout', type=int, default=30)
+    parser.add_argument('--max-requests', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    server = args.server
+    if server == 'auto':
+        try:
+            import gunicorn  # noqa: F401
+            server = 'gunicorn'
+        except ImportError:
+            server = 'waitress'
+
+    if os.getenv('DB_BACKEND', 'mysql') == 'duckdb':
+        os.environ['DB_READ_ONLY'] = '1'
+
+    # Imported here, once, so gunicorn's preload shares it with every worker,
+    # and the hot dashboard payloads are built before the first worker forks
+    from flask_api_backend import app, scheduler, cube, pool, USE_COVERAGE_CUBE
+    if USE_COVERAGE_CUBE and cube.rebuild():
+        report = cube.memory_report()
+        print(f"Coverage cube ({' x '.join(f'{n} {axis}' for axis, n in report['shape'].items())}) "
+              f"built in {report['build_ms']:.0f} ms, {report['total_bytes'] / 1e6:.1f} MB")
+    # An SSE stream holds a thread for its whole life: leave one thread per worker
+    # for ordinary requests (so the sync worker, threads=1, refuses streams) and
+    # end streams well before the worker timeout
+    scheduler.max_streams = min(scheduler.max_streams, args.threads - 1)
+    scheduler.stream_lifetime = min(scheduler.stream_lifetime, max(args.timeout // 2, 1))
+    elapsed_ms = scheduler.refresh(reason='startup')
+    print(f"Precomputed {len(scheduler.urls)} dashboard payloads in {elapsed_ms:.0f} ms")
+    # No database handle may cross the fork: workers open their own
+    pool.clear()
+
+    print(f"🚀 Vaccination Data API on {args.bind} ({server}, "
+          f"{args.workers if server == 'gunicorn' else 1} worker(s) x {args.threads} thread(s), "
+          f"backend={os.getenv('DB_BACKEND', 'mysql')})")
+    if server == 'gunicorn':
+        run_gunicorn(app, args.bind, args.workers, args.threads, args.timeout,
+                     args.graceful_timeout, args.max_requests)
+    else:
+        run_waitress(app, args.bind, args.threads)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,389 @@
+# sketches.py - Mergeable summary sketches for approximate API answers
+# ====================================================================
+#
+# At load time every fact table is summarised into one cell per
+# (year, WHO region): row counts, HyperLogLog registers for the distinct
+# country / vaccine / disease ids, and for coverage the exact count, sum,
+# min, max and doses plus a fixed-resolution histogram of
+# coverage_percentage for percentiles. Cells are stored in the
+# sketch_store table and merge by register max / histogram sum, so any
+# range of years and any set of regions is answered by combining a few
+# hundred small cells instead of scanning the facts.
+#
+# Coverage percentages are bounded, so the histogram gives percentiles
+# with a hard error bound of half a bin, and merges exactly.
+#
+# Usage:
+#   python sketches.py --backend sqlite --database vaccination.db          # (re)build
+#   python sketches.py --backend sqlite --database vaccination.db --years 2024
+#   python sketches.py --benchmark --scale 100
+
+import argparse
+import io
+import math
+import os
+import time
+import zlib
+
+import numpy as np
+
+from db_backends import connect, placeholder
+
+HLL_PRECISION = 12                      # 4096 registers, ~1.6% standard error
+HLL_REGISTERS = 1 << HLL_PRECISION
+HIST_MIN, HIST_MAX, HIST_STEP = 0.0, 200.0, 0.1
+HIST_BINS = int(round((HIST_MAX - HIST_MIN) / HIST_STEP))
+
+# table -> distinct-count columns, and the measure with a histogram (if any)
+SKETCH_SPEC = {
+    'fact_coverage': {'distinct': ['country_id', 'vaccine_id'], 'measure': 'coverage_percentage',
+                      'total': 'doses_administered'},
+    'fact_incidence': {'distinct': ['country_id', 'disease_id']},
+    'fact_cases': {'distinct': ['country_id', 'disease_id'], 'total': 'reported_cases'},
+}
+
+SKETCH_TABLE = 'sketch_store'
+CELLS_QUERY = f"SELECT table_name, year, who_region, payload FROM {SKETCH_TABLE}"
+
+# ==============================================
+# HYPERLOGLOG
+# ==============================================
+
+def _hash64(values, salt):
+    """splitmix64 of integer ids, vectorized (uint64 arithmetic wraps)"""
+    x = values.astype(np.uint64) + np.uint64((salt * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def hll_add(registers, values, salt=0):
+    """Add integer ids to HLL registers in place"""
+    if len(values) == 0:
+        return registers
+    h = _hash64(values, salt)
+    index = (h >> np.uint64(64 - HLL_PRECISION)).astype(np.int64)
+    rest_bits = 64 - HLL_PRECISION
+    rest = (h & np.uint64((1 << rest_bits) - 1)).astype(np.float64)   # exact: < 2**53
+    # rank = leading zeros in the remaining bits + 1; frexp's exponent is the bit length
+    rank = (rest_bits + 1 - np.frexp(rest)[1]).astype(np.uint8)
+    np.maximum.at(registers, index, rank)
+    return registers
+
+
+def hll_estimate(registers):
+    """Cardinality estimate with small-range (linear counting) correction"""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * math.log(m / zeros)
+    return estimate
+
+
+HLL_RELATIVE_ERROR = 1.04 / math.sqrt(HLL_REGISTERS)
+
+# ==============================================
+# SKETCH CELLS
+# ==============================================
+
+class SketchCell:
+    """Summary of one (table, year, region) slice; cells merge associatively"""
+
+    def __init__(self, distinct_columns=(), with_histogram=False):
+        self.rows = 0
+        self.hll = {c: np.zeros(HLL_REGISTERS, dtype=np.uint8) for c in distinct_columns}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+        self.histogram = np.zeros(HIST_BINS, dtype=np.int64) if with_histogram else None
+
+    def add(self, columns, measure=None, total=None):
+        """columns: {name: id array}; measure: float array (NaN = missing)"""
+        self.rows += len(next(iter(columns.values()))) if columns else 0
+        for name, registers in self.hll.items():
+            hll_add(registers, columns[name], zlib.crc32(name.encode()))
+        if total is not None:
+            self.total += float(np.nansum(total))
+        if measure is not None:
+            measure = measure[~np.isnan(measure)]
+            if len(measure):
+                self.count += len(measure)
+                self.sum += float(measure.sum())
+                self.min = min(self.min, float(measure.min()))
+                self.max = max(self.max, float(measure.max()))
+                if self.histogram is not None:
+                    bins = np.clip(((measure - HIST_MIN) / HIST_STEP).astype(np.int64), 0, HIST_BINS - 1)
+                    self.histogram += np.bincount(bins, minlength=HIST_BINS)
+
+    def merge(self, other):
+        self.rows += other.rows
+        for name, registers in other.hll.items():
+            if name in self.hll:
+                np.maximum(self.hll[name], registers, out=self.hll[name])
+            else:
+                self.hll[name] = registers.copy()
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        if other.histogram is not None:
+            self.histogram = (other.histogram.copy() if self.histogram is None
+                              else self.histogram + other.histogram)
+        return self
+
+    def distinct(self, column):
+        """(estimate, 95% half-width); (0, 0.0) for a slice with no rows sketched"""
+        if column not in self.hll:
+            return 0, 0.0
+        estimate = hll_estimate(self.hll[column])
+        return estimate, 2 * HLL_RELATIVE_ERROR * estimate
+
+    def quantile(self, q):
+        """Nearest-rank quantile from the histogram, within HIST_STEP / 2 of the exact one"""
+        if self.histogram is None or self.count == 0:
+            return None
+        cumulative = np.cumsum(self.histogram)
+        bin_index = int(np.searchsorted(cumulative, q * cumulative[-1], side='left'))
+        value = HIST_MIN + (bin_index + 0.5) * HIST_STEP
+        return round(min(max(value, self.min), self.max), 4)
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        arrays = {f'hll_{name}': registers for name, registers in self.hll.items()}
+        if self.histogram is not None:
+            arrays['histogram'] = self.histogram
+        arrays['scalars'] = np.array([self.rows, self.count, self.sum, self.min, self.max, self.total])
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, payload):
+        cell = cls()
+        with np.load(io.BytesIO(payload), allow_pickle=False) as data:
+            for key in data.files:
+                if key.startswith('hll_'):
+                    cell.hll[key[4:]] = data[key]
+            if 'histogram' in data.files:
+                cell.histogram = data['histogram']
+            rows, count, total_sum, low, high, total = data['scalars']
+        cell.rows, cell.count, cell.sum = int(rows), int(count), float(total_sum)
+        cell.min, cell.max, cell.total = float(low), float(high), float(total)
+        return cell
+
+# ==============================================
+# BUILDING AT LOAD TIME
+# ==============================================
+
+SKETCH_DDL = f"""
+    CREATE TABLE {SKETCH_TABLE} (
+        table_name VARCHAR(50) NOT NULL,
+        year INTEGER NOT NULL,
+        who_region VARCHAR(50),
+        payload BLOB NOT NULL
+    )
+"""
+
+
+def _fetch_columns(cursor, query, params, n_columns, chunk_size=200000):
+    """Run query and return its result as one NumPy object array per column"""
+    cursor.execute(query, params)
+    chunks = [[] for _ in range(n_columns)]
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for i, column in enumerate(zip(*rows)):
+            chunks[i].append(np.array(column, dtype=object))
+    return [np.concatenate(c) if c else np.array([], dtype=object) for c in chunks]
+
+
+def _as_float(values):
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+
+def build_sketches(connection, backend, years=None, spec=SKETCH_SPEC):
+    """
+    (Re)build sketch cells for the given years (default: all) and store
+    them, replacing any existing cells for those years. Returns cells written.
+    """
+    cursor = connection.cursor()
+    mark = placeholder(backend)
+    year_filter, params = '', ()
+    if years:
+        # Incremental: replace only the cells of the reloaded years
+        marks = ', '.join([mark] * len(years))
+        year_filter, params = f"WHERE f.year IN ({marks})", tuple(years)
+        cursor.execute(f"DELETE FROM {SKETCH_TABLE} WHERE year IN ({marks})", params)
+    else:
+        cursor.execute(f"DROP TABLE IF EXISTS {SKETCH_TABLE}")
+        cursor.execute(SKETCH_DDL)
+
+    written = 0
+    for table, table_spec in spec.items():
+        measure, total = table_spec.get('measure'), table_spec.get('total')
+        select = ['f.year', 'c.who_region'] + [f'f.{c}' for c in table_spec['distinct']]
+        select += [f'f.{c}' for c in (measure, total) if c]
+        query = (f"SELECT {', '.join(select)} FROM {table} f "
+                 f"LEFT JOIN dim_countries c ON f.country_id = c.country_id {year_filter}")
+        columns = _fetch_columns(cursor, query, params, len(select))
+        if len(columns[0]) == 0:
+            continue
+
+        year_col = columns[0].astype(np.int64)
+        region_col = np.array(['' if r is None else r for r in columns[1]], dtype=object)
+        ids = {name: columns[2 + i].astype(np.int64) for i, name in enumerate(table_spec['distinct'])}
+        offset = 2 + len(table_spec['distinct'])
+        measure_col = _as_float(columns[offset]) if measure else None
+        total_col = _as_float(columns[offset + (1 if measure else 0)]) if total else None
+
+        regions, region_index = np.unique(region_col, return_inverse=True)
+        group_keys = year_col * len(regions) + region_index
+        unique_keys, group_index = np.unique(group_keys, return_inverse=True)
+        order = np.argsort(group_index, kind='stable')
+        bounds = np.searchsorted(group_index[order], np.arange(len(unique_keys) + 1))
+        rows = []
+        for g, key in enumerate(unique_keys):
+            members = order[bounds[g]:bounds[g + 1]]
+            cell = SketchCell(table_spec['distinct'], with_histogram=measure is not None)
+            cell.add({name: values[members] for name, values in ids.items()},
+                     measure_col[members] if measure else None,
+                     total_col[members] if total else None)
+            year, region = divmod(int(key), len(regions))
+            rows.append((table, year, regions[region] or None, cell.to_bytes()))
+        cursor.executemany(f"INSERT INTO {SKETCH_TABLE} (table_name, year, who_region, payload) "
+                           f"VALUES ({mark}, {mark}, {mark}, {mark})", rows)
+        written += len(rows)
+    connection.commit()
+    cursor.close()
+    return written
+
+# ==============================================
+# SERVING
+# ==============================================
+
+class SketchStore:
+    """All sketch cells held in memory; answers merged queries over years/regions"""
+
+    def __init__(self, execute_query):
+        self.execute_query = execute_query
+        self.cells = {}       # (table, year, region) -> SketchCell
+
+    def reload(self):
+        """Load every cell; False if the sketches have not been built"""
+        rows = self.execute_query(CELLS_QUERY)
+        if not rows:
+            self.cells = {}
+            return False
+        self.cells = {(r['table_name'], int(r['year']), r['who_region']): SketchCell.from_bytes(bytes(r['payload']))
+                      for r in rows}
+        return True
+
+    @property
+    def ready(self):
+        return bool(self.cells)
+
+    def merged(self, table, min_year=None, max_year=None, regions=None):
+        cell = SketchCell()
+        for (name, year, region), part in self.cells.items():
+            if name != table:
+                continue
+            if (min_year is not None and year < min_year) or (max_year is not None and year > max_year):
+                continue
+            if regions is not None and region not in regions:
+                continue
+            cell.merge(part)
+        return cell
+
+    def regions(self, table):
+        """Regions with cells for table, with None (no region assigned) last"""
+        found = {region for name, _, region in self.cells if name == table}
+        return sorted(r for r in found if r) + ([None] if None in found else [])
+
+# ==============================================
+# BENCHMARK
+# ==============================================
+
+def run_benchmark(scale=100.0, backend='sqlite', database=None, repeat=3):
+    """Exact SQL vs merged sketches for the overview and regional queries"""
+    from synthetic_data import build_synthetic_db
+
+    database = database or f'sketch_bench_{scale:g}x.db'
+    if not os.path.exists(database):
+        print(f"Building synthetic warehouse at {scale:g}x -> {database}")
+        build_synthetic_db(database, scale, backend)
+    connection = connect(backend, database)
+    cursor = connection.cursor()
+    started = time.perf_counter()
+    print(f"Built {build_sketches(connection, backend)} sketch cells in "
+          f"{time.perf_counter() - started:.1f}s")
+
+    def execute_query(query, params=None):
+        cursor.execute(query, params or ())
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    exact_queries = {
+        'distinct countries (coverage)': "SELECT COUNT(DISTINCT country_id) as n FROM fact_coverage",
+        'regional coverage since 2020': """
+            SELECT c.who_region, COUNT(DISTINCT c.country_id) as countries,
+                   AVG(fc.coverage_percentage) as avg_coverage,
+                   MIN(fc.coverage_percentage) as min_coverage,
+                   MAX(fc.coverage_percentage) as max_coverage
+            FROM fact_coverage fc JOIN dim_countries c ON fc.country_id = c.country_id
+            WHERE fc.year >= 2020 GROUP BY c.who_region
+        """,
+        'median coverage since 2020': """
+            SELECT coverage_percentage FROM fact_coverage
+            WHERE year >= 2020 AND coverage_percentage IS NOT NULL ORDER BY coverage_percentage
+        """,
+    }
+    store = SketchStore(execute_query)
+    started = time.perf_counter()
+    store.reload()
+    print(f"Loaded {len(store.cells)} cells in {(time.perf_counter() - started) * 1000:.1f} ms\n")
+
+    def approx(name):
+        if name.startswith('distinct'):
+            return store.merged('fact_coverage').distinct('country_id')[0]
+        if name.startswith('regional'):
+            return [store.merged('fact_coverage', 2020, regions={r}).distinct('country_id')
+                    for r in store.regions('fact_coverage')]
+        return store.merged('fact_coverage', 2020).quantile(0.5)
+
+    print(f"{'query':<32} {'exact ms':>10} {'approx ms':>10} {'speedup':>9}")
+    for name, query in exact_queries.items():
+        exact_time = min(_timed(lambda: execute_query(query)) for _ in range(repeat))
+        approx_time = min(_timed(lambda: approx(name)) for _ in range(repeat))
+        print(f"{name:<32} {exact_time * 1000:>10.1f} {approx_time * 1000:>10.2f} "
+              f"{exact_time / approx_time:>8.0f}x")
+    connection.close()
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build or benchmark the approximate-query sketches')
+    parser.add_argument('--backend', choices=['sqlite', 'duckdb', 'mysql'], default='sqlite')
+    parser.add_argument('--database')
+    parser.add_argument('--years', type=int, nargs='+', help='only rebuild these years')
+    parser.add_argument('--benchmark', action='store_true')
+    parser.add_argument('--scale', type=float, default=100.0)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.scale, args.backend, args.database)
+    else:
+        connection = connect(args.backend, args.database)
+        started = time.perf_counter()
+        cells = build_sketches(connection, args.backend, args.years)
+        connection.close()
+        print(f"✓ {cells} sketch cells written in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,127 @@
+# startup_benchmark.py - Cold-start import budget for the EDA CLI and API workers
+# ===============================================================================
+#
+# Imports each entry point in a fresh interpreter under `python -X importtime`,
+# sums the top-level cumulative import times, and measures the median wall
+# time of the process. A target fails if it pulls in a module it must not
+# load at startup (plotting/stats libraries for the EDA, pandas for the API
+# workers) or goes over its import budget. Exits non-zero on any failure so
+# it can guard CI or a pre-deploy hook.
+#
+# Usage:
+#   python startup_benchmark.py                        # both targets
+#   python startup_benchmark.py --targets api --runs 10 --budget-ms 800
+#   python startup_benchmark.py --backend mysql        # import with the MySQL driver
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (import statement, modules that must not be imported, default budget ms)
+TARGETS = {
+    # vaccine_eda.py --analysis-only: the analysis without any plotting stack
+    'eda': ('import vaccine_eda', ('matplotlib', 'seaborn', 'scipy'), 1500),
+    # what every gunicorn/waitress worker imports (serve.py)
+    'api': ('import flask_api_backend', ('pandas', 'matplotlib', 'seaborn', 'scipy'), 1000),
+}
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def run_import(statement, env):
+    """(wall seconds, parsed importtime) of one fresh interpreter"""
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                          cwd=HERE, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"`{statement}` failed:\n{proc.stderr[-2000:]}")
+    return wall, parse_importtime(proc.stderr)
+
+
+def benchmark_target(name, runs=5, budget_ms=None, env=None, top=8):
+    statement, forbidden, default_budget = TARGETS[name]
+    budget_ms = budget_ms or default_budget
+    env = env or os.environ.copy()
+
+    # A bare interpreter's own imports (site, encodings, ...) are not charged to the target
+    baseline = [run_import('pass', env) for _ in range(runs)]
+    startup = {m[0] for m in baseline[0][1]}
+    walls, import_ms, modules = [], [], []
+    for _ in range(runs):
+        wall, modules = run_import(statement, env)
+        walls.append(wall)
+        import_ms.append(sum(m[2] for m in modules if m[3] == 0 and m[0] not in startup) / 1000)
+
+    loaded = {m[0] for m in modules} - startup
+    violations = sorted(m for m in loaded if m.split('.')[0] in forbidden)
+    # Direct imports of the entry point, heaviest first
+    heaviest = sorted((m for m in modules if m[3] == 1), key=lambda m: m[2], reverse=True)[:top]
+    result = {
+        'target': name,
+        'statement': statement,
+        'runs': runs,
+        'import_ms': round(statistics.median(import_ms), 1),
+        'wall_ms': round(statistics.median(walls) * 1000, 1),
+        'interpreter_ms': round(statistics.median(b[0] for b in baseline) * 1000, 1),
+        'modules': len(loaded),
+        'budget_ms': budget_ms,
+        'forbidden_imported': violations,
+        'heaviest': [{'module': m[0], 'cumulative_ms': round(m[2] / 1000, 1)} for m in heaviest],
+    }
+    result['passed'] = not violations and result['import_ms'] <= budget_ms
+    return result
+
+
+def print_result(result):
+    status = '✓' if result['passed'] else '✗'
+    print(f"\n{status} {result['target']}: `{result['statement']}`")
+    print(f"  imports: {result['import_ms']:.0f} ms (budget {result['budget_ms']} ms), "
+          f"{result['modules']} modules")
+    print(f"  wall:    {result['wall_ms']:.0f} ms median of {result['runs']} "
+          f"(bare interpreter {result['interpreter_ms']:.0f} ms)")
+    for module in result['heaviest']:
+        print(f"    {module['cumulative_ms']:8.1f} ms  {module['module']}")
+    if result['forbidden_imported']:
+        print(f"  forbidden at startup: {', '.join(result['forbidden_imported'])}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Guard the cold-start import time of the EDA CLI and API')
+    parser.add_argument('--targets', nargs='+', choices=sorted(TARGETS), default=sorted(TARGETS))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, help='override every target\'s import budget')
+    parser.add_argument('--backend', choices=['sqlite', 'duckdb', 'mysql'],
+                        default=os.getenv('DB_BACKEND', 'sqlite'),
+                        help='DB_BACKEND the API is imported with')
+    parser.add_argument('--output', help='write the report as JSON')
+    args = parser.parse_args()
+
+    env = dict(os.environ, DB_BACKEND=args.backend)
+    print("=" * 60)
+    print("⏱  Startup Benchmark")
+    print("=" * 60)
+    report = [benchmark_target(name, args.runs, args.budget_ms, env) for name in args.targets]
+    for result in report:
+        print_result(result)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to {args.output}")
+    sys.exit(0 if all(r['passed'] for r in report) else 1)
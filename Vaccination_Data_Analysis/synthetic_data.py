@@ -0,0 +1,171 @@
+# synthetic_data.py - Scaled synthetic star schema for benchmarks
+# ==============================================================
+#
+# Builds a database with the etl_loader.py schema and realistic-looking
+# dimensions, with every fact table sized at `scale` times its base row
+# count. Used by the index advisor, load tests and benchmarks to measure
+# queries at 10x / 100x today's data volume.
+#
+# Usage:
+#   python synthetic_data.py --scale 10 --database synthetic_10x.db
+
+import argparse
+import random
+import time
+
+from db_backends import connect
+from etl_loader import TABLES, INDEXES, FACT_TABLES, create_schema, create_indexes, write_rows
+from sketches import build_sketches
+
+# Row counts of the production MySQL load (see complete_data_flow.tsx) and
+# of the shipped introduction/schedule workbooks
+BASE_ROWS = {
+    'fact_coverage': 522448,
+    'fact_incidence': 386310,
+    'fact_cases': 443057,
+    'fact_vaccine_introduction': 138320,
+    'fact_vaccine_schedule': 8052,
+}
+
+REGIONS = ['AFRO', 'AMRO', 'EMRO', 'EURO', 'SEARO', 'WPRO']
+YEARS = list(range(1980, 2025))
+
+DISEASES = [
+    ('CRS', 'Congenital rubella syndrome'),
+    ('DIPHTHERIA', 'Diphtheria'),
+    ('INVASIVE_MENING', 'Invasive meningococcal disease'),
+    ('MEASLES', 'Measles'),
+    ('MUMPS', 'Mumps'),
+    ('NTETANUS', 'Neonatal tetanus'),
+    ('PERTUSSIS', 'Pertussis'),
+    ('POLIO', 'Poliomyelitis'),
+    ('RUBELLA', 'Rubella'),
+    ('TTETANUS', 'Total tetanus'),
+    ('TYPHOID', 'Typhoid'),
+    ('YFEVER', 'Yellow fever'),
+    ('JAPENC', 'Japanese encephalitis'),
+]
+
+VACCINES = [
+    ('BCG', 'BCG'),
+    ('DTPCV1', 'Diphtheria tetanus toxoid and pertussis containing vaccine, 1st dose'),
+    ('DTPCV3', 'Diphtheria tetanus toxoid and pertussis containing vaccine, 3rd dose'),
+    ('HEPB3', 'Hepatitis B vaccine (HepB), 3rd dose'),
+    ('HIB3', 'Haemophilus influenzae type b (Hib) vaccine, 3rd dose'),
+    ('IPV1', 'Inactivated polio containing vaccine (IPV), 1st dose'),
+    ('POL3', 'Polio, 3rd dose'),
+    ('MCV1', 'Measles-containing vaccine, 1st dose'),
+    ('MCV2', 'Measles-containing vaccine, 2nd dose'),
+    ('RCV1', 'Rubella-containing vaccine, 1st dose'),
+    ('MUMPS', 'Mumps vaccine'),
+    ('MENGA', 'Meningococcal meningitis vaccines (all strains)'),
+    ('YFV', 'YF (Yellow fever) vaccine'),
+    ('TYPHOID', 'Typhoid conjugate vaccine'),
+    ('JAPENC', 'Japanese Encephalitis'),
+    ('PCV3', 'Pneumococcal conjugate vaccine, 3rd dose'),
+    ('ROTAC', 'Rotavirus vaccines completed dose'),
+    ('HPVC', 'HPV Vaccination program coverage'),
+]
+
+N_COUNTRIES = 194
+
+
+def dimension_rows(rng):
+    countries = [
+        (i + 1, 'X' + chr(65 + i // 26) + chr(65 + i % 26), f"Country {i + 1}",
+         REGIONS[i % len(REGIONS)])
+        for i in range(N_COUNTRIES)
+    ]
+    return {
+        'dim_countries': (['country_id', 'code', 'country_name', 'who_region'], countries),
+        'dim_vaccines': (['vaccine_id', 'vaccine_code', 'vaccine_description'],
+                         [(i + 1, code, desc) for i, (code, desc) in enumerate(VACCINES)]),
+        'dim_diseases': (['disease_id', 'disease_code', 'disease_description'],
+                         [(i + 1, code, desc) for i, (code, desc) in enumerate(DISEASES)]),
+        'dim_time': (['time_id', 'year', 'decade'],
+                     [(i + 1, year, year // 10 * 10) for i, year in enumerate(YEARS)]),
+    }
+
+
+def fact_rows(table, n_rows, rng):
+    """Generate n_rows random fact tuples, ids numbered from 1"""
+    n_years, n_vaccines, n_diseases = len(YEARS), len(VACCINES), len(DISEASES)
+    randint, random_ = rng.randint, rng.random
+    for fact_id in range(1, n_rows + 1):
+        country_id = randint(1, N_COUNTRIES)
+        time_id = randint(1, n_years)
+        year = YEARS[time_id - 1]
+        if table == 'fact_coverage':
+            target = randint(1000, 5000000)
+            coverage = round(min(100.0, max(0.0, rng.gauss(82, 15))), 2)
+            yield (fact_id, country_id, randint(1, n_vaccines), time_id, year,
+                   rng.choice(['ADMIN', 'OFFICIAL', 'WUENIC']),
+                   target, int(target * coverage / 100), coverage)
+        elif table == 'fact_incidence':
+            yield (fact_id, country_id, randint(1, n_diseases), time_id, year,
+                   'per 1,000,000 total population', round(random_() ** 4 * 500, 4))
+        elif table == 'fact_cases':
+            yield (fact_id, country_id, randint(1, n_diseases), time_id, year,
+                   int(random_() ** 6 * 50000))
+        elif table == 'fact_vaccine_introduction':
+            yield (fact_id, country_id, randint(1, n_vaccines), time_id, year,
+                   'Yes' if random_() < 0.6 else 'No')
+        elif table == 'fact_vaccine_schedule':
+            yield (fact_id, country_id, randint(1, n_vaccines), time_id, year,
+                   rng.choice(['dose 1', 'dose 2', 'dose 3', 'booster']),
+                   'General/routine', None,
+                   rng.choice(['NATIONAL', 'SUBNATIONAL', None]), 'M2', None)
+
+
+FACT_COLUMNS = {
+    'fact_coverage': ['coverage_id', 'country_id', 'vaccine_id', 'time_id', 'year',
+                      'coverage_category', 'target_number', 'doses_administered',
+                      'coverage_percentage'],
+    'fact_incidence': ['incidence_id', 'country_id', 'disease_id', 'time_id', 'year',
+                       'denominator', 'incidence_rate'],
+    'fact_cases': ['case_id', 'country_id', 'disease_id', 'time_id', 'year', 'reported_cases'],
+    'fact_vaccine_introduction': ['intro_id', 'country_id', 'vaccine_id', 'time_id', 'year',
+                                  'intro_status'],
+    'fact_vaccine_schedule': ['schedule_id', 'country_id', 'vaccine_id', 'time_id', 'year',
+                              'schedule_round', 'target_population', 'target_pop_description',
+                              'geo_area', 'age_administered', 'source_comment'],
+}
+
+
+def build_synthetic_db(database, scale=1.0, backend='sqlite', base_rows=None,
+                       seed=42, tables=TABLES, indexes=INDEXES):
+    """Create and populate a synthetic warehouse; returns {table: rows}"""
+    rng = random.Random(seed)
+    base_rows = base_rows or BASE_ROWS
+    connection = connect(backend, database)
+    create_schema(connection, tables, backend)
+
+    cursor = connection.cursor()
+    for table, (columns, rows) in dimension_rows(rng).items():
+        write_rows(cursor, backend, table, columns, rows)
+
+    counts = {}
+    for table in FACT_TABLES:
+        n_rows = int(base_rows[table] * scale)
+        started = time.perf_counter()
+        write_rows(cursor, backend, table, FACT_COLUMNS[table], fact_rows(table, n_rows, rng))
+        counts[table] = n_rows
+        print(f"  ✓ {table:<28} {n_rows:>12,} rows  {time.perf_counter() - started:7.1f}s")
+    cursor.close()
+
+    create_indexes(connection, indexes)
+    build_sketches(connection, backend)
+    connection.commit()
+    connection.close()
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build a scaled synthetic vaccination warehouse')
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--backend', choices=['sqlite', 'duckdb', 'mysql'], default='sqlite')
+    parser.add_argument('--database', default='synthetic.db')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    build_synthetic_db(args.database, args.scale, args.backend, seed=args.seed)
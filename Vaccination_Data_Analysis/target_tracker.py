@@ -0,0 +1,226 @@
+# target_tracker.py - Incremental WHO 95% measles coverage target tracking
+# ========================================================================
+#
+# Keeps a running state per country - latest measles coverage and target
+# population, years reported, years at or above the 95% target, current
+# and longest streaks, and the gap to target - instead of re-aggregating
+# the whole history like Power BI "Scenario 4". Each update only reads the
+# years from the last one processed onwards (the facts are clustered by
+# year), so loading a new reporting year costs O(new rows). The latest
+# year is re-read too, with its previous state kept for rollback, so a
+# year that arrives in several loads is applied exactly once.
+#
+# State is keyed by ISO3 country code, not the surrogate country_id, which
+# the ETL's full DROP/rebuild is free to renumber. update() replays the
+# whole history only when the incremental state cannot be trusted: the
+# latest measles year in the warehouse is older than the watermark (years
+# were removed) or dim_countries no longer has a tracked country. POST
+# /api/admin/reload still resets explicitly.
+
+import threading
+import time
+from datetime import datetime
+
+TARGET_COVERAGE = 95
+CRITICAL_COVERAGE = 60
+MEASLES_VACCINES = '%Measles%'
+
+TRACKER_QUERY = """
+    SELECT
+        c.code as country_code,
+        fc.year,
+        AVG(fc.coverage_percentage) as coverage,
+        SUM(fc.target_number) as target_population
+    FROM fact_coverage fc
+    JOIN dim_vaccines v ON fc.vaccine_id = v.vaccine_id
+    JOIN dim_countries c ON fc.country_id = c.country_id
+    WHERE v.vaccine_description LIKE %s AND fc.year >= %s
+    GROUP BY c.code, fc.year
+    ORDER BY fc.year
+"""
+
+COUNTRY_QUERY = "SELECT code as country_code, country_name, who_region FROM dim_countries"
+
+LATEST_YEAR_QUERY = """
+    SELECT MAX(fc.year) as latest_year
+    FROM fact_coverage fc
+    JOIN dim_vaccines v ON fc.vaccine_id = v.vaccine_id
+    JOIN dim_countries c ON fc.country_id = c.country_id
+    WHERE v.vaccine_description LIKE %s
+"""
+
+
+def target_status(coverage):
+    """Scenario 4 status bands"""
+    if coverage >= TARGET_COVERAGE:
+        return 'Target Achieved'
+    if coverage >= 90:
+        return 'Close to Target'
+    if coverage >= 80:
+        return 'On Track'
+    return 'Needs Urgent Action'
+
+
+class CountryTarget:
+    """Running target state of one country"""
+
+    __slots__ = ('latest_year', 'latest_coverage', 'target_population', 'years_reported',
+                 'years_above_target', 'current_streak', 'longest_streak', 'previous')
+
+    def __init__(self):
+        self.latest_year = None
+        self.latest_coverage = None
+        self.target_population = None
+        self.years_reported = 0
+        self.years_above_target = 0
+        self.current_streak = 0
+        self.longest_streak = 0
+        self.previous = None      # state before latest_year was applied
+
+    def snapshot(self):
+        state = CountryTarget()
+        for name in self.__slots__[:-1]:
+            setattr(state, name, getattr(self, name))
+        return state
+
+    def apply(self, year, coverage, target_population):
+        if year == self.latest_year:
+            # The latest year was reloaded: undo it before applying it again
+            restored = self.previous
+            for name in self.__slots__:
+                setattr(self, name, getattr(restored, name))
+        self.previous = self.snapshot()
+
+        above = coverage >= TARGET_COVERAGE
+        consecutive = self.latest_year == year - 1
+        self.current_streak = (self.current_streak + 1 if consecutive else 1) if above else 0
+        self.longest_streak = max(self.longest_streak, self.current_streak)
+        self.years_reported += 1
+        self.years_above_target += above
+        self.latest_year = year
+        self.latest_coverage = coverage
+        self.target_population = target_population
+
+    def record(self, country):
+        gap = TARGET_COVERAGE - self.latest_coverage
+        return {
+            'country_name': country.get('country_name'),
+            'who_region': country.get('who_region'),
+            'latest_year': self.latest_year,
+            'latest_coverage': round(self.latest_coverage, 2),
+            'gap_to_target': round(gap, 2),
+            'status': target_status(self.latest_coverage),
+            'years_reported': self.years_reported,
+            'years_above_target': self.years_above_target,
+            'current_streak': self.current_streak,
+            'longest_streak': self.longest_streak,
+            'target_population': self.target_population,
+            'additional_vaccinations_needed': (round(self.target_population * max(gap, 0) / 100)
+                                               if self.target_population is not None else None),
+        }
+
+
+class TargetTracker:
+    def __init__(self, execute_query, vaccines=MEASLES_VACCINES):
+        self.execute_query = execute_query
+        self.vaccines = vaccines
+        self._states = {}          # ISO3 code -> CountryTarget
+        self._countries = {}
+        self._watermark = None     # latest year applied
+        self._loaded = False       # an update succeeded (possibly with no rows)
+        self._last_update = None
+        self._replays = 0          # full replays forced by update()
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Forget all state; the next update replays the full history"""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._states.clear()
+        self._watermark = None
+        self._loaded = False
+
+    def _replay_reason(self, countries):
+        """Why the incremental state is stale, or None; may query the latest year"""
+        if self._watermark is None:
+            return None
+        if any(code not in countries for code in self._states):
+            return 'countries removed'
+        rows = self.execute_query(LATEST_YEAR_QUERY, (self.vaccines,))
+        if rows is None:
+            return None
+        latest = rows[0]['latest_year'] if rows else None
+        if latest is None or int(latest) < self._watermark:
+            return 'years removed'
+        return None
+
+    def update(self):
+        """Apply rows from the latest processed year onwards; returns rows read or None"""
+        with self._lock:
+            started = time.perf_counter()
+            countries = self.execute_query(COUNTRY_QUERY)
+            if countries is None:
+                return None
+            countries = {r['country_code']: r for r in countries}
+            replay = self._replay_reason(countries)
+            if replay:
+                self._clear()
+                self._replays += 1
+            since = self._watermark if self._watermark is not None else 0
+            rows = self.execute_query(TRACKER_QUERY, (self.vaccines, since))
+            if rows is None:
+                return None
+            self._countries = countries
+            for row in rows:
+                if row['coverage'] is None:
+                    continue
+                target = row['target_population']
+                self._states.setdefault(row['country_code'], CountryTarget()).apply(
+                    int(row['year']), float(row['coverage']),
+                    int(target) if target is not None else None)
+            if rows:
+                self._watermark = max(int(rows[-1]['year']), since)
+            self._loaded = True
+            self._last_update = {
+                'rows': len(rows),
+                'from_year': since or None,
+                'replayed': replay,
+                'replays': self._replays,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+                'updated_at': datetime.now().isoformat(),
+            }
+            return len(rows)
+
+    def ready(self):
+        """True once loaded; an empty fact_coverage is ready with no countries"""
+        if not self._loaded:
+            self.update()
+        return self._loaded
+
+    def records(self):
+        with self._lock:
+            records = [state.record(self._countries.get(code, {}))
+                       for code, state in self._states.items()]
+        return sorted(records, key=lambda r: r['gap_to_target'], reverse=True)
+
+    def critical_count(self, threshold=CRITICAL_COVERAGE):
+        """Countries whose latest coverage is below threshold"""
+        with self._lock:
+            return sum(1 for state in self._states.values() if state.latest_coverage < threshold)
+
+    def summary(self, records=None):
+        records = self.records() if records is None else records
+        statuses = {}
+        for record in records:
+            statuses[record['status']] = statuses.get(record['status'], 0) + 1
+        return {
+            'target_coverage': TARGET_COVERAGE,
+            'countries': len(records),
+            'latest_year': self._watermark,
+            'by_status': statuses,
+            'below_critical': sum(1 for r in records if r['latest_coverage'] < CRITICAL_COVERAGE),
+            'additional_vaccinations_needed': sum(r['additional_vaccinations_needed'] or 0 for r in records),
+            'last_update': self._last_update,
+        }
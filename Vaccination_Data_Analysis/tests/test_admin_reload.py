@@ -0,0 +1,50 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from synthetic_data import BASE_ROWS, build_synthetic_db
+
+
+@pytest.fixture(scope='module')
+def api(tmp_path_factory):
+    database = str(tmp_path_factory.mktemp('reload') / 'reload.db')
+    build_synthetic_db(database, scale=1.0, backend='sqlite', base_rows=dict.fromkeys(BASE_ROWS, 200))
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('DB_BACKEND', 'sqlite')
+        patch.setenv('DB_PATH', database)
+        # A fresh import bound to this database, dropped again for the other tests
+        patch.delitem(sys.modules, 'flask_api_backend', raising=False)
+        module = importlib.import_module('flask_api_backend')
+        yield module
+        module.scheduler.stop()
+        sys.modules.pop('flask_api_backend', None)
+
+
+def test_reload_is_local_only_without_token(api):
+    client = api.app.test_client()
+    remote = client.post('/api/admin/reload', environ_base={'REMOTE_ADDR': '203.0.113.7'})
+    assert remote.status_code == 403
+    assert client.post('/api/admin/reload').status_code in (200, 202)
+
+
+def test_reload_requires_token_when_set(api, monkeypatch):
+    monkeypatch.setattr(api, 'ADMIN_TOKEN', 's3cret')
+    client = api.app.test_client()
+    assert client.post('/api/admin/reload').status_code == 403
+    response = client.post('/api/admin/reload', headers={'X-Admin-Token': 's3cret'},
+                           environ_base={'REMOTE_ADDR': '203.0.113.7'})
+    assert response.status_code in (200, 202)
+
+
+def test_pending_reload_is_coalesced(api, monkeypatch):
+    monkeypatch.setattr(api.scheduler, 'pending', lambda: True)
+    cleared = []
+    monkeypatch.setattr(api.pool, 'clear', lambda: cleared.append(True))
+    response = api.app.test_client().post('/api/admin/reload')
+    assert response.status_code == 202
+    assert response.get_json()['coalesced'] is True
+    assert not cleared
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from data_profiler import PROFILE_SPEC, DataProfiler
+from db_backends import connect
+from synthetic_data import BASE_ROWS, build_synthetic_db
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'duckdb'])
+def test_profile_every_table(backend, tmp_path):
+    if backend == 'duckdb':
+        pytest.importorskip('duckdb')
+    database = str(tmp_path / f'profile.{backend}')
+    build_synthetic_db(database, scale=1.0, backend=backend, base_rows=dict.fromkeys(BASE_ROWS, 300))
+
+    connection = connect(backend, database)
+    cursor = connection.cursor()
+
+    def execute_query(query, params=None):
+        cursor.execute(query, params or ())
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    profiler = DataProfiler(execute_query)
+    assert profiler.refresh() == list(PROFILE_SPEC)
+    for profile in profiler.report()['details']:
+        assert profile['total_records'] == 300
+        assert 0 <= profile['duplicate_keys'] < 300
+    connection.close()
+
+
+def test_value_revision_rescans_only_that_table(tmp_path):
+    database = str(tmp_path / 'revised.sqlite')
+    build_synthetic_db(database, scale=1.0, backend='sqlite', base_rows=dict.fromkeys(BASE_ROWS, 300))
+
+    connection = connect('sqlite', database)
+    cursor = connection.cursor()
+
+    def execute_query(query, params=None):
+        cursor.execute(query, params or ())
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    profiler = DataProfiler(execute_query)
+    profiler.refresh()
+    assert profiler.refresh() == []
+
+    # Same rows, same ids, revised values
+    cursor.execute("UPDATE fact_cases SET reported_cases = reported_cases + 1")
+    cursor.execute("UPDATE fact_vaccine_introduction SET intro_status = intro_status || ' (revised)'")
+    connection.commit()
+    assert profiler.refresh() == ['fact_cases', 'fact_vaccine_introduction']
+    connection.close()
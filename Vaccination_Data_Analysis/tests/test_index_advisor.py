@@ -0,0 +1,25 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from index_advisor import api_queries, indexes_used, regressions
+
+
+def test_regressions():
+    before = {'fast': 0.010, 'noise': 0.0010, 'slower': 0.0081, 'timeout': 0.5, 'error': 'error: x'}
+    after = {'fast': 0.004, 'noise': 0.0025, 'slower': 0.0568, 'timeout': None, 'error': 0.1}
+    assert regressions(before, after) == {'slower': (0.0081, 0.0568), 'timeout': (0.5, None)}
+
+
+def test_indexes_used():
+    plan = ['SEARCH fc USING COVERING INDEX idx_adv_fact_coverage_8 (year>?)',
+            'fact_cases: type=ref key=idx_adv_fact_cases_10 rows=4 extra=None',
+            'SCAN dc']
+    assert indexes_used(plan) == {'idx_adv_fact_coverage_8', 'idx_adv_fact_cases_10'}
+
+
+def test_background_scans_not_advised():
+    names = {q['name'] for q in api_queries('sqlite')}
+    assert 'api:eda.global_trends' in names
+    assert not any(n.startswith(('api:profile.', 'api:cube.', 'api:sketches.')) for n in names)
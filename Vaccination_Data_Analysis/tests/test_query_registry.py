@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import query_registry
+from db_backends import ConnectionPool, connect
+from synthetic_data import build_synthetic_db
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'duckdb'])
+def test_self_check(backend, tmp_path):
+    """Every registered query runs and matches its declared schema on each local backend"""
+    if backend == 'duckdb':
+        pytest.importorskip('duckdb')
+    database = str(tmp_path / f'registry.{backend}')
+    build_synthetic_db(database, 0.01, backend)
+
+    pool = ConnectionPool(backend, database, size=1)
+    results = query_registry.self_check(pool, repeat=1)
+    pool.clear()
+
+    failed = {r['name']: r['detail'] for r in results if r['status'] == 'failed'}
+    assert not failed
+    assert {r['name'] for r in results if r['status'] == 'ok'} >= {
+        'profile.fact_coverage', 'cube.coverage', 'tracker.measles_coverage', 'sketches.cells',
+        'analytics.forecast.series', 'analytics.introduction.pairs'}
+
+
+def test_module_sql_resolves_to_registered_names():
+    import cube
+    import data_profiler
+    import target_tracker
+
+    assert query_registry.resolve(cube.CUBE_QUERY)[0] == 'cube.coverage'
+    assert query_registry.resolve(target_tracker.TRACKER_QUERY)[0] == 'tracker.measles_coverage'
+    spec = data_profiler.PROFILE_SPEC['fact_cases']
+    assert query_registry.resolve(data_profiler.profile_query('fact_cases', spec))[0] == 'profile.fact_cases'
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'duckdb'])
+def test_index_count_on_local_backends(backend, tmp_path):
+    """sql.stats.indexes resolves to the backend's own catalogue"""
+    if backend == 'duckdb':
+        pytest.importorskip('duckdb')
+    database = str(tmp_path / f'indexes.{backend}')
+    build_synthetic_db(database, 0.01, backend)
+
+    query = query_registry.for_backend('sql.stats.indexes', backend)
+    assert query.name == f'sql.stats.indexes.{backend}'
+    connection = connect(backend, database)
+    cursor = connection.cursor()
+    cursor.execute(query.sql)
+    before = cursor.fetchone()[0]
+    cursor.execute('CREATE INDEX idx_test_year ON fact_cases (year)')
+    cursor.execute(query.sql)
+    assert cursor.fetchone()[0] == before + 1
+    connection.close()
+    assert query_registry.for_backend('sql.stats.indexes', 'mysql').name == 'sql.stats.indexes'
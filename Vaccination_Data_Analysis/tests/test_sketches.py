@@ -0,0 +1,58 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sketches import SketchCell, SketchStore
+from synthetic_data import BASE_ROWS, build_synthetic_db
+
+
+@pytest.fixture(scope='module')
+def empty_coverage_db(tmp_path_factory):
+    """Synthetic warehouse whose fact_coverage table is empty (sketches built)"""
+    database = str(tmp_path_factory.mktemp('sketches') / 'empty_coverage.db')
+    base_rows = dict.fromkeys(BASE_ROWS, 500)
+    base_rows['fact_coverage'] = 0
+    build_synthetic_db(database, scale=1.0, backend='sqlite', base_rows=base_rows)
+    return database
+
+
+def test_distinct_on_empty_cell():
+    assert SketchCell().distinct('country_id') == (0, 0.0)
+
+
+def test_merged_empty_table(empty_coverage_db):
+    from db_backends import connect
+
+    connection = connect('sqlite', empty_coverage_db)
+    cursor = connection.cursor()
+
+    def execute_query(query, params=None):
+        cursor.execute(query, params or ())
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    store = SketchStore(execute_query)
+    assert store.reload()
+    cell = store.merged('fact_coverage')
+    assert cell.rows == 0
+    assert cell.distinct('country_id') == (0, 0.0)
+    assert cell.quantile(0.5) is None
+    assert store.merged('fact_cases').distinct('country_id')[0] > 0
+    connection.close()
+
+
+def test_approx_overview_with_empty_fact_table(empty_coverage_db, monkeypatch):
+    monkeypatch.setenv('DB_BACKEND', 'sqlite')
+    monkeypatch.setenv('DB_PATH', empty_coverage_db)
+    api = importlib.import_module('flask_api_backend')
+
+    response = api.app.test_client().get('/api/cleaning/overview?approx=true')
+    assert response.status_code == 200
+    coverage = response.get_json()['data'][0]
+    assert coverage['dataset'] == 'Coverage'
+    assert coverage['total_records'] == 0
+    assert coverage['countries'] == 0
@@ -12,31 +12,179 @@ Original file is located at
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
+import contextlib
+import io
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set visualization style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+_PLOTTING = None
+
+def _plotting():
+    """matplotlib and seaborn, imported and styled on first use only"""
+    global _PLOTTING
+    if _PLOTTING is None:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        # Set visualization style
+        plt.style.use('seaborn-v0_8-darkgrid')
+        sns.set_palette("husl")
+        _PLOTTING = plt, sns
+    return _PLOTTING
+
+# Text columns with fewer distinct values than this share of rows become categoricals
+CATEGORY_MAX_RATIO = 0.5
+
+def compact_frame(df):
+    """
+    Shrink a DataFrame in place: repeated strings become categoricals and
+    integer columns are downcast to the smallest type that holds them.
+    Floats stay float64 so means and summaries are unchanged.
+    """
+    for column in df.columns:
+        series = df[column]
+        if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            if len(series) and series.nunique(dropna=True) / len(series) < CATEGORY_MAX_RATIO:
+                df[column] = series.astype('category')
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            df[column] = pd.to_numeric(series, downcast='integer')
+    return df
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+class EDADimensions:
+    """
+    Integer ids for ISO3 codes, WHO regions, antigens and diseases shared by
+    all five datasets, built once at load time. Each frame gets country_id
+    (plus antigen_id / disease_id where it has them; -1 = missing), and
+    cross-dataset joins become array lookups on those ids.
+    """
+
+    COUNTRY_COLUMNS = ('code', 'iso_3_code')
+    NAME_COLUMNS = ('name', 'countryname')
+    ANTIGEN_COLUMNS = ('antigen_description', 'description', 'vaccine_description')
+    DISEASE_COLUMNS = ('disease_description',)
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.countries = self._intern(self.COUNTRY_COLUMNS, 'country_id')
+        self.antigens = self._intern(self.ANTIGEN_COLUMNS, 'antigen_id')
+        self.diseases = self._intern(self.DISEASE_COLUMNS, 'disease_id')
+        self.country_names = self._first_per_country(self.NAME_COLUMNS)
+
+        # Region per country: the introduction data first, then the schedule
+        region_labels = self._first_per_country(('who_region',))
+        self.regions = pd.Index(sorted(r for r in set(region_labels) if isinstance(r, str)), name='who_region')
+        self.country_region = self.regions.get_indexer(region_labels).astype(np.int16)
+        self.region_conflicts = self._region_conflicts()
+
+    @staticmethod
+    def _column(df, candidates):
+        return next((c for c in candidates if c in df.columns), None)
+
+    def _intern(self, candidates, id_column):
+        labels = set()
+        for df in self.frames.values():
+            column = self._column(df, candidates)
+            if column is not None:
+                labels.update(df[column].dropna().unique())
+        index = pd.Index(sorted(labels))
+        for df in self.frames.values():
+            column = self._column(df, candidates)
+            if column is not None:
+                # Categorical codes are exactly the positions in index (-1 for missing)
+                df[id_column] = pd.Categorical(df[column], categories=index).codes
+        return index
+
+    def _first_per_country(self, candidates):
+        """First non-null value of a per-country attribute, in dataset order"""
+        values = np.full(len(self.countries), None, dtype=object)
+        for df in self.frames.values():
+            column = self._column(df, candidates)
+            if column is None or 'country_id' not in df.columns:
+                continue
+            pairs = df.loc[(df['country_id'] >= 0) & df[column].notna(), ['country_id', column]]
+            first = pairs.drop_duplicates('country_id')
+            ids = first['country_id'].to_numpy(dtype=np.int64)
+            missing = pd.isna(values[ids])
+            values[ids[missing]] = first[column].astype(object).to_numpy()[missing]
+        return values
+
+    def _region_conflicts(self):
+        conflicts = {}
+        for df in self.frames.values():
+            if 'who_region' not in df.columns or 'country_id' not in df.columns:
+                continue
+            region_ids = self.regions.get_indexer(df['who_region'].astype(object))
+            rows = (df['country_id'].to_numpy() >= 0) & (region_ids >= 0)
+            ids = df['country_id'].to_numpy()[rows]
+            differs = region_ids[rows] != self.country_region[ids]
+            for country_id in np.unique(ids[differs]):
+                conflicts[self.countries[country_id]] = self.regions[self.country_region[country_id]]
+        return conflicts
+
+    def region_ids(self, country_ids):
+        """Region id per country id (-1 when either is unknown)"""
+        country_ids = np.asarray(country_ids)
+        return np.where(country_ids >= 0, self.country_region.take(np.clip(country_ids, 0, None)), -1)
+
+    def region_names(self, country_ids):
+        return pd.Categorical.from_codes(self.region_ids(country_ids), categories=self.regions)
+
+    def matching(self, index, pattern):
+        """Ids of the labels in a dimension index containing pattern (case-insensitive)"""
+        return np.flatnonzero(index.str.contains(pattern, case=False, na=False))
+
+    def report(self):
+        """Dimension sizes plus every unmatched code, in one place"""
+        unmatched = {}
+        for name, df in self.frames.items():
+            if 'country_id' not in df.columns:
+                continue
+            ids = df['country_id'].to_numpy()
+            no_region = np.unique(ids[(ids >= 0) & (self.region_ids(ids) < 0)])
+            unmatched[name] = {
+                'rows_without_code': int((ids < 0).sum()),
+                'codes_without_region': self.countries[no_region].tolist(),
+            }
+        return {
+            'countries': len(self.countries),
+            'regions': len(self.regions),
+            'antigens': len(self.antigens),
+            'diseases': len(self.diseases),
+            'unmatched': unmatched,
+            'region_conflicts': self.region_conflicts,
+        }
 
 class VaccinationEDA:
     """
     Comprehensive EDA for vaccination data analysis
     """
 
-    def __init__(self, data_path='/content/'):
+    def __init__(self, data_path='/content/', compact=True):
         self.data_path = data_path
+        self.compact = compact
         self.coverage_df = None
         self.incidence_df = None
         self.cases_df = None
         self.intro_df = None
         self.schedule_df = None
+        self.loaded_bytes = {}
+        self.dims = None
+
+    def frames(self):
+        return {
+            'Coverage': self.coverage_df,
+            'Incidence': self.incidence_df,
+            'Cases': self.cases_df,
+            'Introduction': self.intro_df,
+            'Schedule': self.schedule_df
+        }
 
     def load_cleaned_data(self):
-        """Load all cleaned datasets"""
+        """Load all cleaned datasets (compacted unless compact=False)"""
         print("Loading cleaned datasets...")
         self.coverage_df = pd.read_excel(f'{self.data_path}/coverage-data.xlsx')
         self.incidence_df = pd.read_excel(f'{self.data_path}/incidence-rate-data.xlsx')
@@ -51,23 +199,91 @@ class VaccinationEDA:
         self.intro_df.columns = self.intro_df.columns.str.lower()
         self.schedule_df.columns = self.schedule_df.columns.str.lower()
 
+        # Schema step: categoricals and downcast integers, converted column by column
+        self.loaded_bytes = {name: frame_bytes(df) for name, df in self.frames().items()}
+        if self.compact:
+            for df in self.frames().values():
+                compact_frame(df)
+
+        # Shared integer dimensions; adds country_id/antigen_id/disease_id columns
+        self.dims = EDADimensions(self.frames())
+
         print("✓ All datasets loaded\n")
 
+    def dimension_report(self):
+        """Shared dimension sizes and the codes no dataset could resolve"""
+        print("\n" + "="*70)
+        print("DIMENSION REGISTRY")
+        print("="*70)
+
+        report = self.dims.report()
+        print(f"\n{report['countries']} countries, {report['regions']} WHO regions, "
+              f"{report['antigens']} antigens, {report['diseases']} diseases")
+        for name, missing in report['unmatched'].items():
+            codes = missing['codes_without_region']
+            print(f"{name:<14} rows without code: {missing['rows_without_code']:>6}   "
+                  f"codes without region: {len(codes):>4} {', '.join(codes[:8])}{' ...' if len(codes) > 8 else ''}")
+        if report['region_conflicts']:
+            print(f"Codes listed under several regions (first kept): {report['region_conflicts']}")
+        return report
+
+    def memory_report(self, verify=True):
+        """
+        Bytes per dataset as loaded vs now. With verify, the raw datasets are
+        loaded again and every analysis is run on both; their printed
+        outputs must be identical.
+        """
+        print("\n" + "="*70)
+        print("MEMORY REPORT")
+        print("="*70)
+
+        report = {}
+        for name, df in self.frames().items():
+            before, after = self.loaded_bytes.get(name, 0), frame_bytes(df)
+            report[name] = {'before': before, 'after': after,
+                            'saved_pct': round(100 * (1 - after / before), 1) if before else 0.0}
+            print(f"{name:<14} {before / 1024**2:9.2f} MB -> {after / 1024**2:9.2f} MB "
+                  f"({report[name]['saved_pct']:.1f}% smaller)")
+        total_before = sum(r['before'] for r in report.values())
+        total_after = sum(r['after'] for r in report.values())
+        print(f"{'Total':<14} {total_before / 1024**2:9.2f} MB -> {total_after / 1024**2:9.2f} MB")
+
+        if verify:
+            raw = VaccinationEDA(self.data_path, compact=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                raw.load_cleaned_data()
+            unchanged = raw.analysis_output() == self.analysis_output()
+            report['outputs_unchanged'] = unchanged
+            print(f"\nAnalysis outputs unchanged: {'✓ yes' if unchanged else '✗ NO'}")
+        return report
+
+    def analysis_output(self):
+        """Printed output of every analysis step, for comparing representations"""
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            for step in self.analysis_steps():
+                step()
+        return buffer.getvalue()
+
+    def analysis_steps(self):
+        return [
+            self.analyze_vaccination_coverage,
+            self.analyze_disease_incidence,
+            self.analyze_vaccination_impact,
+            self.regional_disparities,
+            self.temporal_analysis,
+            self.vaccine_introduction_analysis,
+            self.generate_statistical_summary,
+            self.identify_key_insights,
+        ]
+
     def dataset_overview(self):
         """Generate comprehensive dataset overview"""
         print("="*70)
         print("DATASET OVERVIEW")
         print("="*70)
 
-        datasets = {
-            'Coverage': self.coverage_df,
-            'Incidence': self.incidence_df,
-            'Cases': self.cases_df,
-            'Introduction': self.intro_df,
-            'Schedule': self.schedule_df
-        }
-
-        for name, df in datasets.items():
+        for name, df in self.frames().items():
             print(f"\n{name} Dataset:")
             print(f"Shape: {df.shape}")
             print(f"Memory usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
@@ -109,7 +325,7 @@ class VaccinationEDA:
         print(coverage_by_year.tail(10))
 
         # Top performing countries
-        recent_coverage = df[df['year'] >= 2020].groupby('name')['coverage'].mean()
+        recent_coverage = df[df['year'] >= 2020].groupby('name', observed=True)['coverage'].mean()
         print("\nTop 10 Countries by Vaccination Coverage (2020+):")
         print(recent_coverage.nlargest(10))
 
@@ -118,7 +334,7 @@ class VaccinationEDA:
         print(recent_coverage.nsmallest(10))
 
         # Vaccine-specific coverage
-        vaccine_coverage = df.groupby('antigen_description')['coverage'].agg(['mean', 'count'])
+        vaccine_coverage = df.groupby('antigen_description', observed=True)['coverage'].agg(['mean', 'count'])
         print("\nCoverage by Vaccine Type:")
         print(vaccine_coverage.sort_values('mean', ascending=False).head(10))
 
@@ -140,12 +356,12 @@ class VaccinationEDA:
             return
 
         # Disease trends over time
-        disease_trends = df.groupby(['year', 'disease_description'])['incidence_rate'].mean().unstack()
+        disease_trends = df.groupby(['year', 'disease_description'], observed=True)['incidence_rate'].mean().unstack()
         print("\nDisease Incidence Trends (Recent Years):")
         print(disease_trends.tail())
 
         # High incidence diseases
-        high_incidence = df.groupby('disease_description')['incidence_rate'].agg(['mean', 'max', 'count'])
+        high_incidence = df.groupby('disease_description', observed=True)['incidence_rate'].agg(['mean', 'max', 'count'])
         print("\nDiseases with Highest Average Incidence:")
         print(high_incidence.sort_values('mean', ascending=False).head(10))
 
@@ -155,20 +371,23 @@ class VaccinationEDA:
         print("VACCINATION IMPACT ANALYSIS")
         print("="*70)
 
-        if 'code' not in self.coverage_df.columns or 'year' not in self.coverage_df.columns or \
-           'code' not in self.cases_df.columns or 'year' not in self.cases_df.columns:
+        if 'antigen_id' not in self.coverage_df.columns or 'year' not in self.coverage_df.columns or \
+           'disease_id' not in self.cases_df.columns or 'year' not in self.cases_df.columns:
             print("Skipping Vaccination Impact Analysis: 'code' or 'year' column(s) not found in coverage or cases data.")
             return
 
-        # Merge coverage and cases data
-        coverage_agg = self.coverage_df.groupby(['code', 'year', 'antigen_description'])['coverage'].mean().reset_index()
-        cases_agg = self.cases_df.groupby(['code', 'year', 'disease_description'])['cases'].sum().reset_index()
-
-        # Example: Measles vaccination vs cases
-        measles_vax = coverage_agg[coverage_agg['antigen_description'].str.contains('Measles', case=False, na=False)]
-        measles_cases = cases_agg[cases_agg['disease_description'].str.contains('Measles', case=False, na=False)]
+        # Example: Measles vaccination vs cases, selected by dimension id
+        coverage = self.coverage_df[self.coverage_df['antigen_id'].isin(self.dims.matching(self.dims.antigens, 'Measles'))]
+        cases = self.cases_df[self.cases_df['disease_id'].isin(self.dims.matching(self.dims.diseases, 'Measles'))]
+        coverage_agg = coverage.groupby(['country_id', 'year', 'antigen_id'])['coverage'].mean()
+        cases_agg = cases.groupby(['country_id', 'year'])['cases'].sum()
 
-        merged = pd.merge(measles_vax, measles_cases, on=['code', 'year'], how='inner')
+        # Join: look every (country, year) of the coverage series up in the cases series
+        coverage_agg = coverage_agg[coverage_agg.index.get_level_values('country_id') >= 0]
+        keys = coverage_agg.index.droplevel('antigen_id')
+        matched_cases = cases_agg.reindex(keys).to_numpy()
+        found = keys.isin(cases_agg.index)
+        merged = pd.DataFrame({'coverage': coverage_agg.to_numpy()[found], 'cases': matched_cases[found]})
 
         if len(merged) > 0:
             correlation = merged['coverage'].corr(merged['cases'])
@@ -187,15 +406,10 @@ class VaccinationEDA:
             print("Skipping Regional Disparity Analysis: 'who_region' in intro data or 'code'/'year' in coverage data not found.")
             return
 
-        region_coverage = pd.merge(
-            self.coverage_df[['code', 'year', 'coverage']],
-            self.intro_df[['iso_3_code', 'who_region']].drop_duplicates(),
-            left_on='code',
-            right_on='iso_3_code',
-            how='left'
-        )
-
-        region_stats = region_coverage.groupby('who_region')['coverage'].agg(['mean', 'std', 'min', 'max'])
+        # Region of every coverage row via the shared country -> region ids
+        region = self.dims.region_names(self.coverage_df['country_id'])
+        region_stats = self.coverage_df['coverage'].groupby(region, observed=True).agg(['mean', 'std', 'min', 'max'])
+        region_stats.index.name = 'who_region'
         print("\nVaccination Coverage by WHO Region:")
         print(region_stats.sort_values('mean', ascending=False))
 
@@ -233,13 +447,13 @@ class VaccinationEDA:
             return
 
         # Introduction timeline
-        intro_by_year = df[df['intro'].str.contains('Yes', case=False, na=False)].groupby('year').size()
+        intro_by_year = df[df['intro'].str.contains('Yes', case=False, na=False)].groupby('year', observed=True).size()
         print("\nVaccine Introductions Over Time:")
         print(intro_by_year.tail(10))
 
         # Regional introduction patterns
         if 'who_region' in df.columns:
-            region_intro = df[df['intro'].str.contains('Yes', case=False, na=False)].groupby('who_region').size()
+            region_intro = df[df['intro'].str.contains('Yes', case=False, na=False)].groupby('who_region', observed=True).size()
             print("\nVaccine Introductions by Region:")
             print(region_intro.sort_values(ascending=False))
         else:
@@ -280,7 +494,7 @@ class VaccinationEDA:
         # Low coverage countries
         if 'year' in self.coverage_df.columns and 'name' in self.coverage_df.columns:
             recent_data = self.coverage_df[self.coverage_df['year'] >= 2020]
-            low_coverage = recent_data.groupby('name')['coverage'].mean()
+            low_coverage = recent_data.groupby('name', observed=True)['coverage'].mean()
             low_coverage_countries = low_coverage[low_coverage < 50].index.tolist()
 
             if low_coverage_countries:
@@ -290,7 +504,7 @@ class VaccinationEDA:
 
         # High disease burden
         if 'disease_description' in self.cases_df.columns:
-            high_cases = self.cases_df.groupby('disease_description')['cases'].sum()
+            high_cases = self.cases_df.groupby('disease_description', observed=True)['cases'].sum()
             top_disease = high_cases.idxmax()
             insights.append(f"• {top_disease} has highest case burden - prioritize vaccination efforts")
         else:
@@ -323,30 +537,26 @@ class VaccinationEDA:
 
         self.load_cleaned_data()
         self.dataset_overview()
-        self.analyze_vaccination_coverage()
-        self.analyze_disease_incidence()
-        self.analyze_vaccination_impact()
-        self.regional_disparities()
-        self.temporal_analysis()
-        self.vaccine_introduction_analysis()
-        self.generate_statistical_summary()
-        self.identify_key_insights()
+        self.dimension_report()
+        for step in self.analysis_steps():
+            step()
 
         print("\n" + "="*70)
         print("✓ EDA COMPLETED SUCCESSFULLY")
         print("="*70)
 
-# Usage
-if __name__ == "__main__":
-    eda = VaccinationEDA('/content/')
-    eda.run_complete_eda()
+# ==============================================
+# VISUALIZATIONS
+# ==============================================
+
+def generate_visualizations(eda, output_dir='visualizations'):
+    """Save the EDA charts to output_dir (loads matplotlib/seaborn on first call)"""
+    plt, sns = _plotting()
 
-    # Generate visualizations
     print("\nGenerating visualizations...")
 
     # Create output directory
-    import os
-    os.makedirs('visualizations', exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
 
     # Visualization 1: Coverage trends
     if 'year' in eda.coverage_df.columns and 'coverage' in eda.coverage_df.columns:
@@ -358,7 +568,7 @@ if __name__ == "__main__":
         plt.ylabel('Average Coverage (%)', fontsize=12)
         plt.grid(True, alpha=0.3)
         plt.tight_layout()
-        plt.savefig('visualizations/coverage_trend.png', dpi=300)
+        plt.savefig(f'{output_dir}/coverage_trend.png', dpi=300)
         print("✓ Coverage trend chart saved")
     else:
         print("Skipping Coverage trend chart: 'year' or 'coverage' column not found in coverage data.")
@@ -366,135 +576,161 @@ if __name__ == "__main__":
     # Visualization 2: Top vaccines by coverage
     if 'antigen_description' in eda.coverage_df.columns and 'coverage' in eda.coverage_df.columns:
         plt.figure(figsize=(12, 8))
-        top_vaccines = eda.coverage_df.groupby('antigen_description')['coverage'].mean().nlargest(15)
+        top_vaccines = eda.coverage_df.groupby('antigen_description', observed=True)['coverage'].mean().nlargest(15)
         top_vaccines.plot(kind='barh', color='steelblue')
         plt.title('Top 15 Vaccines by Average Coverage', fontsize=16, fontweight='bold')
         plt.xlabel('Average Coverage (%)', fontsize=12)
         plt.ylabel('Vaccine', fontsize=12)
         plt.tight_layout()
-        plt.savefig('visualizations/top_vaccines.png', dpi=300)
+        plt.savefig(f'{output_dir}/top_vaccines.png', dpi=300)
         print("✓ Top vaccines chart saved")
     else:
         print("Skipping Top vaccines chart: 'antigen_description' or 'coverage' column not found in coverage data.")
 
     print("\n✓ All visualizations attempted.")
 
-"""### **9. Additional Visualizations:**
+    # ### 9. Additional Visualizations:
+    # Regional disparities and disease incidence trends identified in the EDA
+
+    # Visualization 3: Regional Vaccination Coverage Disparities (Heatmap)
+
+    # Re-calculate region_stats as it was a local variable in the EDA class method
+    if 'code' in eda.coverage_df.columns and 'year' in eda.coverage_df.columns and \
+       'iso_3_code' in eda.intro_df.columns and 'who_region' in eda.intro_df.columns and \
+       'coverage' in eda.coverage_df.columns:
+        region_coverage = pd.DataFrame({
+            'year': eda.coverage_df['year'],
+            'coverage': eda.coverage_df['coverage'],
+            'who_region': eda.dims.region_names(eda.coverage_df['country_id']),
+        })
+        # Drop rows whose code has no region (see eda.dimension_report())
+        region_coverage = region_coverage.dropna(subset=['who_region'])
+
+        # Aggregate for heatmap (e.g., mean coverage by region and year)
+        regional_coverage_pivot = region_coverage.pivot_table(index='who_region', columns='year', values='coverage', aggfunc='mean', observed=True)
+
+        plt.figure(figsize=(14, 8))
+        sns.heatmap(regional_coverage_pivot, cmap='viridis', fmt=".1f", linewidths=.5, linecolor='black')
+        plt.title('Average Vaccination Coverage by WHO Region Over Time', fontsize=16, fontweight='bold')
+        plt.xlabel('Year', fontsize=12)
+        plt.ylabel('WHO Region', fontsize=12)
+        plt.tight_layout()
+        plt.savefig(f'{output_dir}/regional_coverage_heatmap.png', dpi=300)
+        print("✓ Regional coverage heatmap saved")
+    else:
+        print("Skipping Regional coverage heatmap: Required columns not found.")
+
+    # Visualization 4: Disease Incidence Trends (Heatmap)
 
-Let's create some additional visualizations to further explore the regional disparities and disease incidence trends identified in the EDA.
-"""
+    # Re-calculate disease_trends as it was a local variable in the EDA class method
+    if 'year' in eda.incidence_df.columns and 'disease_description' in eda.incidence_df.columns and \
+       'incidence_rate' in eda.incidence_df.columns:
+        disease_trends_pivot = eda.incidence_df.groupby(['year', 'disease_description'], observed=True)['incidence_rate'].mean().unstack()
 
-# Visualization 3: Regional Vaccination Coverage Disparities (Heatmap)
-
-# Re-calculate region_stats as it was a local variable in the EDA class method
-if 'code' in eda.coverage_df.columns and 'year' in eda.coverage_df.columns and \
-   'iso_3_code' in eda.intro_df.columns and 'who_region' in eda.intro_df.columns and \
-   'coverage' in eda.coverage_df.columns:
-    region_coverage = pd.merge(
-        eda.coverage_df[['code', 'year', 'coverage']],
-        eda.intro_df[['iso_3_code', 'who_region']].drop_duplicates(),
-        left_on='code',
-        right_on='iso_3_code',
-        how='left'
-    )
-    # Drop rows where 'who_region' is NaN due to merge issues
-    region_coverage = region_coverage.dropna(subset=['who_region'])
-
-    # Aggregate for heatmap (e.g., mean coverage by region and year)
-    regional_coverage_pivot = region_coverage.pivot_table(index='who_region', columns='year', values='coverage', aggfunc='mean')
-
-    plt.figure(figsize=(14, 8))
-    sns.heatmap(regional_coverage_pivot, cmap='viridis', fmt=".1f", linewidths=.5, linecolor='black')
-    plt.title('Average Vaccination Coverage by WHO Region Over Time', fontsize=16, fontweight='bold')
-    plt.xlabel('Year', fontsize=12)
-    plt.ylabel('WHO Region', fontsize=12)
-    plt.tight_layout()
-    plt.savefig('visualizations/regional_coverage_heatmap.png', dpi=300)
-    print("✓ Regional coverage heatmap saved")
-else:
-    print("Skipping Regional coverage heatmap: Required columns not found.")
-
-# Visualization 4: Disease Incidence Trends (Heatmap)
-
-# Re-calculate disease_trends as it was a local variable in the EDA class method
-if 'year' in eda.incidence_df.columns and 'disease_description' in eda.incidence_df.columns and \
-   'incidence_rate' in eda.incidence_df.columns:
-    disease_trends_pivot = eda.incidence_df.groupby(['year', 'disease_description'])['incidence_rate'].mean().unstack()
-
-    plt.figure(figsize=(16, 10))
-    sns.heatmap(disease_trends_pivot.loc[2010:], cmap='YlOrRd', linewidths=.5, linecolor='black') # Focus on more recent years
-    plt.title('Average Disease Incidence Rate by Disease Over Time (2010 Onwards)', fontsize=16, fontweight='bold')
-    plt.xlabel('Disease', fontsize=12)
-    plt.ylabel('Year', fontsize=12)
-    plt.tight_layout()
-    plt.savefig('visualizations/disease_incidence_heatmap.png', dpi=300)
-    print("✓ Disease incidence heatmap saved")
-else:
-    print("Skipping Disease incidence heatmap: Required columns not found.")
-
-# Visualization 5: Top 10 Low-Coverage Countries (Bar Chart)
-
-if 'year' in eda.coverage_df.columns and 'name' in eda.coverage_df.columns and 'coverage' in eda.coverage_df.columns:
-    recent_data = eda.coverage_df[eda.coverage_df['year'] >= 2020]
-    low_coverage = recent_data.groupby('name')['coverage'].mean()
-    bottom_10_countries = low_coverage.nsmallest(10)
-
-    plt.figure(figsize=(12, 7))
-    sns.barplot(x=bottom_10_countries.values, y=bottom_10_countries.index, palette='Reds_d')
-    plt.title('Top 10 Countries with Lowest Average Vaccination Coverage (2020+)', fontsize=16, fontweight='bold')
-    plt.xlabel('Average Coverage (%)', fontsize=12)
-    plt.ylabel('Country/Region', fontsize=12)
-    plt.tight_layout()
-    plt.savefig('visualizations/low_coverage_countries_bar_chart.png', dpi=300)
-    print("✓ Low-coverage countries bar chart saved")
-else:
-    print("Skipping Low-coverage countries bar chart: Required columns not found.")
-
-print("\n--- Column Names for Each DataFrame ---")
-
-if eda.coverage_df is not None:
-    print("\nCoverage DataFrame Columns:")
-    print(eda.coverage_df.columns.tolist())
-
-if eda.incidence_df is not None:
-    print("\nIncidence DataFrame Columns:")
-    print(eda.incidence_df.columns.tolist())
-
-if eda.cases_df is not None:
-    print("\nCases DataFrame Columns:")
-    print(eda.cases_df.columns.tolist())
-
-if eda.intro_df is not None:
-    print("\nIntroduction DataFrame Columns:")
-    print(eda.intro_df.columns.tolist())
-
-if eda.schedule_df is not None:
-    print("\nSchedule DataFrame Columns:")
-    print(eda.schedule_df.columns.tolist())
+        plt.figure(figsize=(16, 10))
+        sns.heatmap(disease_trends_pivot.loc[2010:], cmap='YlOrRd', linewidths=.5, linecolor='black') # Focus on more recent years
+        plt.title('Average Disease Incidence Rate by Disease Over Time (2010 Onwards)', fontsize=16, fontweight='bold')
+        plt.xlabel('Disease', fontsize=12)
+        plt.ylabel('Year', fontsize=12)
+        plt.tight_layout()
+        plt.savefig(f'{output_dir}/disease_incidence_heatmap.png', dpi=300)
+        print("✓ Disease incidence heatmap saved")
+    else:
+        print("Skipping Disease incidence heatmap: Required columns not found.")
 
-import os
+    # Visualization 5: Top 10 Low-Coverage Countries (Bar Chart)
+
+    if 'year' in eda.coverage_df.columns and 'name' in eda.coverage_df.columns and 'coverage' in eda.coverage_df.columns:
+        recent_data = eda.coverage_df[eda.coverage_df['year'] >= 2020]
+        low_coverage = recent_data.groupby('name', observed=True)['coverage'].mean()
+        bottom_10_countries = low_coverage.nsmallest(10)
 
-# Check for 'cleaned_data' directory
-cleaned_data_dir = '/content/cleaned_data'
-print(f"Checking directory: {cleaned_data_dir}")
-if os.path.exists(cleaned_data_dir) and os.path.isdir(cleaned_data_dir):
-    print(f"  '{cleaned_data_dir}' exists.")
-    print(f"  Contents: {os.listdir(cleaned_data_dir)}")
-else:
-    print(f"  '{cleaned_data_dir}' does NOT exist.")
-
-print("\nChecking for expected Excel data files in '/content/':")
-excel_files = [
-    'coverage-data.xlsx',
-    'incidence-rate-data.xlsx',
-    'reported-cases-data.xlsx',
-    'vaccine-introduction-data.xlsx',
-    'vaccine-schedule-data.xlsx'
-]
-
-for file_name in excel_files:
-    file_path = os.path.join('/content/', file_name)
-    if os.path.exists(file_path):
-        print(f"  ✓ '{file_name}' found.")
+        plt.figure(figsize=(12, 7))
+        sns.barplot(x=bottom_10_countries.values, y=bottom_10_countries.index, palette='Reds_d')
+        plt.title('Top 10 Countries with Lowest Average Vaccination Coverage (2020+)', fontsize=16, fontweight='bold')
+        plt.xlabel('Average Coverage (%)', fontsize=12)
+        plt.ylabel('Country/Region', fontsize=12)
+        plt.tight_layout()
+        plt.savefig(f'{output_dir}/low_coverage_countries_bar_chart.png', dpi=300)
+        print("✓ Low-coverage countries bar chart saved")
+    else:
+        print("Skipping Low-coverage countries bar chart: Required columns not found.")
+
+def print_columns(eda):
+    print("\n--- Column Names for Each DataFrame ---")
+
+    if eda.coverage_df is not None:
+        print("\nCoverage DataFrame Columns:")
+        print(eda.coverage_df.columns.tolist())
+
+    if eda.incidence_df is not None:
+        print("\nIncidence DataFrame Columns:")
+        print(eda.incidence_df.columns.tolist())
+
+    if eda.cases_df is not None:
+        print("\nCases DataFrame Columns:")
+        print(eda.cases_df.columns.tolist())
+
+    if eda.intro_df is not None:
+        print("\nIntroduction DataFrame Columns:")
+        print(eda.intro_df.columns.tolist())
+
+    if eda.schedule_df is not None:
+        print("\nSchedule DataFrame Columns:")
+        print(eda.schedule_df.columns.tolist())
+
+def check_data_files(data_path='/content/'):
+    # Check for 'cleaned_data' directory
+    cleaned_data_dir = os.path.join(data_path, 'cleaned_data')
+    print(f"Checking directory: {cleaned_data_dir}")
+    if os.path.exists(cleaned_data_dir) and os.path.isdir(cleaned_data_dir):
+        print(f"  '{cleaned_data_dir}' exists.")
+        print(f"  Contents: {os.listdir(cleaned_data_dir)}")
     else:
-        print(f"  ✗ '{file_name}' NOT found.")
\ No newline at end of file
+        print(f"  '{cleaned_data_dir}' does NOT exist.")
+
+    print(f"\nChecking for expected Excel data files in '{data_path}':")
+    excel_files = [
+        'coverage-data.xlsx',
+        'incidence-rate-data.xlsx',
+        'reported-cases-data.xlsx',
+        'vaccine-introduction-data.xlsx',
+        'vaccine-schedule-data.xlsx'
+    ]
+
+    for file_name in excel_files:
+        file_path = os.path.join(data_path, file_name)
+        if os.path.exists(file_path):
+            print(f"  ✓ '{file_name}' found.")
+        else:
+            print(f"  ✗ '{file_name}' NOT found.")
+
+# Usage:
+#   python vaccine_eda.py [data_path]                  # EDA + charts
+#   python vaccine_eda.py [data_path] --analysis-only  # EDA only, never imports matplotlib
+#   python vaccine_eda.py [data_path] --memory-report  # + bytes per dataset before/after compaction
+#   python vaccine_eda.py [data_path] --verify-compaction  # + reload uncompacted, compare outputs
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Vaccination data EDA')
+    parser.add_argument('data_path', nargs='?', default='/content/')
+    parser.add_argument('--analysis-only', action='store_true',
+                        help='run the analysis without generating charts')
+    parser.add_argument('--output-dir', default='visualizations')
+    parser.add_argument('--memory-report', action='store_true',
+                        help='print memory per dataset before and after compaction')
+    parser.add_argument('--verify-compaction', action='store_true',
+                        help='also reload the raw workbooks and check every analysis output matches '
+                             '(loads and analyzes everything twice)')
+    args = parser.parse_args()
+
+    eda = VaccinationEDA(args.data_path)
+    eda.run_complete_eda()
+    if args.memory_report or args.verify_compaction:
+        eda.memory_report(verify=args.verify_compaction)
+
+    if not args.analysis_only:
+        generate_visualizations(eda, args.output_dir)
+        print_columns(eda)
+        check_data_files(args.data_path)